@@ -0,0 +1,177 @@
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+# Member activity events are stored as one CSV per month, appended to and never rewritten
+ACTIVITY_DIR = 'activity'
+ACTIVITY_COLUMNS = ['streams_given', 'posts_shared', 'playlists_submitted']
+EVENT_COLUMNS = ['at', 'member_id'] + ACTIVITY_COLUMNS
+
+# Sliding windows kept per member; compliance is scored on the 30-day window
+WINDOW_DAYS = (7, 30, 90)
+COMPLIANCE_WINDOW_DAYS = 30
+
+class ActivityLog:
+    """Append-only member activity events with per-member sliding-window counts"""
+
+    def __init__(self, data_dir, windows=WINDOW_DAYS):
+        self.path = Path(data_dir) / ACTIVITY_DIR
+        self.path.mkdir(exist_ok=True)
+        self.windows = tuple(sorted(windows))
+        # One bucket per day of the longest window; day d lives in slot d % ring_days
+        self.ring_days = self.windows[-1]
+        self._lock = threading.Lock()
+
+        # member_id -> row of the arrays below
+        self._rows = {}
+        self._members = []
+        # Daily counts per member (member, day slot, activity column)
+        self._ring = np.zeros((0, self.ring_days, len(ACTIVITY_COLUMNS)), dtype=np.int64)
+        # Running totals per member and window (member, window, activity column)
+        self._sums = np.zeros((0, len(self.windows), len(ACTIVITY_COLUMNS)), dtype=np.int64)
+        # Day ordinal the buckets are aligned to
+        self._today = date.today().toordinal()
+
+        self._load()
+
+    def record(self, member_id, streams_given=0, posts_shared=0, playlists_submitted=0, at=None):
+        """Append one activity event and add it to the member's windows; raises ValueError for negative counts"""
+        counts = [int(streams_given or 0), int(posts_shared or 0), int(playlists_submitted or 0)]
+        if min(counts) < 0:
+            raise ValueError("Activity counts can't be negative")
+        at = at or datetime.now()
+        event = dict(zip(EVENT_COLUMNS, [at.isoformat(timespec='seconds'), member_id] + counts))
+
+        with self._lock:
+            self._advance()
+            self._append(pd.DataFrame([event], columns=EVENT_COLUMNS), at)
+            self._fold([member_id], np.array([min(at.date().toordinal(), self._today)]), np.array([counts]))
+        return event
+
+    def record_many(self, events, at=None):
+        """Append one event per row of a member_id plus activity columns frame; returns the number logged"""
+        counts = events.reindex(columns=ACTIVITY_COLUMNS).apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int64)
+        if (counts < 0).any().any():
+            raise ValueError("Activity counts can't be negative")
+        return self._log(events['member_id'].to_numpy(), counts, at or datetime.now())
+
+    def retract(self, events, at):
+        """Take back activity logged at `at` by appending negated events (undo); returns the number logged"""
+        counts = events.reindex(columns=ACTIVITY_COLUMNS).apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int64)
+        return self._log(events['member_id'].to_numpy(), -counts.clip(lower=0), at)
+
+    def _log(self, member_ids, counts, at):
+        # Rows without any activity aren't events
+        logged = (counts != 0).any(axis=1).to_numpy()
+        if not logged.any():
+            return 0
+        member_ids = member_ids[logged]
+        counts = counts.to_numpy()[logged]
+        batch = pd.DataFrame(counts, columns=ACTIVITY_COLUMNS)
+        batch.insert(0, 'member_id', member_ids)
+        batch.insert(0, 'at', at.isoformat(timespec='seconds'))
+
+        with self._lock:
+            self._advance()
+            self._append(batch, at)
+            self._fold(list(member_ids), np.full(len(batch), min(at.date().toordinal(), self._today)), counts)
+        return len(batch)
+
+    def counts(self, member_id, days=COMPLIANCE_WINDOW_DAYS):
+        """{activity column: count} for one member over the last `days` days, O(1)"""
+        window = self.windows.index(days)
+        with self._lock:
+            self._advance()
+            row = self._rows.get(member_id)
+            values = self._sums[row, window] if row is not None else np.zeros(len(ACTIVITY_COLUMNS), dtype=np.int64)
+            return dict(zip(ACTIVITY_COLUMNS, values.tolist()))
+
+    def window(self, days=COMPLIANCE_WINDOW_DAYS, member_ids=None):
+        """member_id plus activity counts over the last `days` days; with member_ids, one row each (0 if idle)"""
+        window = self.windows.index(days)
+        with self._lock:
+            self._advance()
+            counts = pd.DataFrame(self._sums[:len(self._members), window], columns=ACTIVITY_COLUMNS,
+                                  index=pd.Index(self._members, name='member_id'))
+        if member_ids is not None:
+            counts = counts.reindex(pd.Index(member_ids, name='member_id'), fill_value=0)
+        return counts.reset_index()
+
+    def maxima(self, days=COMPLIANCE_WINDOW_DAYS):
+        """Network-wide highest count of each activity over the last `days` days"""
+        window = self.windows.index(days)
+        with self._lock:
+            self._advance()
+            sums = self._sums[:len(self._members), window]
+            values = sums.max(axis=0) if len(sums) else np.zeros(len(ACTIVITY_COLUMNS), dtype=np.int64)
+            return dict(zip(ACTIVITY_COLUMNS, values.tolist()))
+
+    def _advance(self):
+        """Slide every window forward to today, expiring the buckets that fell out of each"""
+        today = date.today().toordinal()
+        if today <= self._today:
+            return
+        if today - self._today >= self.ring_days:
+            self._ring[:] = 0
+            self._sums[:] = 0
+        else:
+            for day in range(self._today + 1, today + 1):
+                for i, days in enumerate(self.windows):
+                    self._sums[:, i] -= self._ring[:, (day - days) % self.ring_days]
+                # The longest window's expired slot is reused for the new day
+                self._ring[:, day % self.ring_days] = 0
+        self._today = today
+
+    def _fold(self, member_ids, days, counts):
+        """Add events (member, day ordinal, counts) to the buckets and windows; older days are only logged"""
+        age = self._today - days
+        keep = age < self.ring_days
+        if not keep.all():
+            member_ids = [m for m, k in zip(member_ids, keep) if k]
+            days, counts, age = days[keep], counts[keep], age[keep]
+        if not len(days):
+            return
+
+        rows = np.array([self._row(member_id) for member_id in member_ids])
+        np.add.at(self._ring, (rows, days % self.ring_days), counts)
+        for i, window in enumerate(self.windows):
+            inside = age < window
+            np.add.at(self._sums[:, i], rows[inside], counts[inside])
+
+    def _row(self, member_id):
+        row = self._rows.get(member_id)
+        if row is None:
+            row = self._rows[member_id] = len(self._members)
+            self._members.append(member_id)
+            if row == len(self._ring):
+                # Grow by doubling so adding members stays amortized O(1)
+                capacity = max(2 * len(self._ring), 64)
+                self._ring = _grow(self._ring, capacity)
+                self._sums = _grow(self._sums, capacity)
+        return row
+
+    def _append(self, events, at):
+        path = self.path / f'{at:%Y-%m}.csv'
+        events.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+    def _load(self):
+        """Fold in the events of the months that can still fall inside the longest window"""
+        first = (date.today() - timedelta(days=self.ring_days)).strftime('%Y-%m')
+        files = sorted(p for p in self.path.glob('*.csv') if p.stem >= first)
+        if not files:
+            return
+        events = pd.concat([pd.read_csv(p, dtype={'member_id': str}) for p in files], ignore_index=True)
+        at = pd.to_datetime(events['at'], errors='coerce')
+        events = events[at.notna()]
+        days = (at[at.notna()].dt.normalize() - pd.Timestamp('1970-01-01')).dt.days.to_numpy() \
+            + date(1970, 1, 1).toordinal()
+        counts = events[ACTIVITY_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int64)
+        self._fold(events['member_id'].tolist(), np.minimum(days, self._today), counts.to_numpy())
+
+
+def _grow(array, capacity):
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
@@ -0,0 +1,376 @@
+import bisect
+import json
+import logging
+import operator
+import os
+import queue
+import threading
+import uuid
+import pandas as pd
+from collections import deque
+from datetime import datetime, timedelta
+from data_manager import TABLE_KEYS
+
+ALERTS_FILE = 'alerts.json'
+INBOX_SIZE = 200
+
+logger = logging.getLogger(__name__)
+
+# Rules are plain dicts so they can be stored and edited. A threshold rule fires when
+# `column op value` holds for a row; an age rule fires when the date in `column` is
+# more than `older_than_days` in the past. `when` is an optional DataFrame.eval filter.
+DEFAULT_RULES = [
+    {'rule_id': 'low_save_rate', 'label': "Low save rate", 'table': 'tracks',
+     'column': 'save_rate', 'op': '<', 'value': 2.0, 'when': 'streams >= 1000'},
+    {'rule_id': 'low_compliance', 'label': "Low compliance", 'table': 'members',
+     'column': 'compliance_score', 'op': '<', 'value': 40.0},
+    {'rule_id': 'curator_no_response', 'label': "No curator response", 'table': 'curators',
+     'column': 'last_contacted', 'older_than_days': 14, 'when': "submission_status == 'Submitted'"}
+]
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+class AlertEngine:
+    """Threshold and age rules evaluated against the rows each write changes"""
+
+    def __init__(self, data_manager, sinks=None):
+        self.data_manager = data_manager
+        self.sinks = list(sinks or [])
+        self.path = data_manager.data_dir / ALERTS_FILE
+
+        state = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        self.rules = {rule['rule_id']: rule for rule in state.get('rules', DEFAULT_RULES)}
+        self.inbox = deque(state.get('inbox', []), maxlen=INBOX_SIZE)
+        # (rule_id, row key) pairs currently in breach; a rule fires again only after the row recovers
+        self._active = {tuple(pair) for pair in state.get('active', [])}
+        self._changed = False
+        # Set while a scan only records breaches
+        self._silent = False
+        # Callable rules registered in code: rule_id -> (table, predicate, label)
+        self._predicates = {}
+        # Per age rule: sorted [(date, key)] plus key -> date, maintained from changed rows
+        self._age_indexes = {}
+        # Per age rule: the cutoff date of the last due check; older entries were checked then
+        self._due_cutoffs = {}
+        self._save_lock = threading.Lock()
+
+        # The first scan of a workspace records existing breaches without alerting on them
+        self.scan(notify=bool(state))
+        data_manager.add_listener(self._on_change)
+        # State changed by writes is stored along with the tables they changed
+        data_manager.add_save_listener(lambda tables: self._save())
+
+    def register(self, rule_id, table, predicate, label):
+        """Add a rule from code; predicate(rows) returns a boolean mask over a DataFrame of rows"""
+        self._predicates[rule_id] = (table, predicate, label)
+        self._deliver(self._evaluate(rule_id, getattr(self.data_manager, f'{table}_df'), full=True))
+
+    def set_rule(self, rule):
+        """Add or replace a stored rule; rows already in breach of it are recorded without alerting"""
+        with self.data_manager._lock:
+            self.rules[rule['rule_id']] = rule
+            self._set_active({pair for pair in self._active if pair[0] != rule['rule_id']})
+            self._age_indexes.pop(rule['rule_id'], None)
+            self._silent = True
+            try:
+                self._evaluate(rule['rule_id'], getattr(self.data_manager, f"{rule['table']}_df"), full=True)
+                self._due_alerts(datetime.now())
+            finally:
+                self._silent = False
+        self._deliver([])
+
+    def scan(self, notify=True):
+        """Evaluate every rule over its whole table, e.g. after changes made by another process"""
+        with self.data_manager._lock:
+            self._silent = not notify
+            try:
+                alerts = []
+                for rule_id in list(self.rules) + list(self._predicates):
+                    table = self._rule_table(rule_id)
+                    alerts += self._evaluate(rule_id, getattr(self.data_manager, f'{table}_df'), full=True)
+                alerts += self._due_alerts(datetime.now())
+            finally:
+                self._silent = False
+        self._deliver(alerts)
+        return alerts
+
+    def check_due(self, now=None):
+        """Fire age rules whose dates have passed since the last check; returns the new alerts"""
+        with self.data_manager._lock:
+            alerts = self._due_alerts(now or datetime.now())
+        self._deliver(alerts)
+        return alerts
+
+    def close(self):
+        """Wait for sinks to deliver queued alerts"""
+        for sink in self.sinks:
+            sink.close()
+
+    def unread(self):
+        return [alert for alert in self.inbox if not alert['read']]
+
+    def mark_read(self, alert_ids=None):
+        """Mark the given alerts (all by default) as read"""
+        for alert in self.inbox:
+            if not alert['read'] and (alert_ids is None or alert['alert_id'] in alert_ids):
+                alert['read'] = True
+                self._changed = True
+        self._save()
+
+    def _on_change(self, entry):
+        table = entry['table']
+        rule_ids = [rule_id for rule_id in list(self.rules) + list(self._predicates)
+                    if self._rule_table(rule_id) == table]
+        if not rule_ids:
+            return
+
+        key_col = TABLE_KEYS[table]
+        keys = pd.DataFrame(entry['rows'])[key_col]
+        df = getattr(self.data_manager, f'{table}_df')
+        # Only the rows this write touched; deleted rows simply aren't found
+        rows = df[df[key_col].isin(keys)]
+        if entry['op'] == 'delete':
+            rows = df.iloc[0:0]
+
+        alerts = []
+        for rule_id in rule_ids:
+            alerts += self._evaluate(rule_id, rows, keys=keys)
+        # Saved by the save listener once the changed tables are written
+        self._deliver(alerts, save=False)
+
+    def _due_alerts(self, now):
+        """Alerts for dates that passed an age rule's cutoff since the last check"""
+        alerts = []
+        for rule_id, rule in self.rules.items():
+            if 'older_than_days' not in rule:
+                continue
+            entries, _ = self._age_index(rule)
+            # ISO dates compare as strings; only entries between the previous and current cutoff
+            # became overdue since the last check (changed rows are checked by _evaluate)
+            cutoff = (now - timedelta(days=rule['older_than_days'])).strftime('%Y-%m-%d')
+            previous = self._due_cutoffs.get(rule_id)
+            start = bisect.bisect_left(entries, (previous,)) if previous else 0
+            end = bisect.bisect_left(entries, (cutoff,))
+            if previous is None or cutoff > previous:
+                self._due_cutoffs[rule_id] = cutoff
+            alerts += self._fire(rule_id, [key for _, key in entries[start:end]], now)
+        return alerts
+
+    def _evaluate(self, rule_id, rows, keys=None, full=False):
+        """Update breach state for the given rows; keys are the ids to re-check (all rows if full)"""
+        table = self._rule_table(rule_id)
+        key_col = TABLE_KEYS[table]
+        if full:
+            # Breaches of rows that no longer exist recover too
+            keys = set(rows[key_col]) | {key for rule, key in self._active if rule == rule_id}
+        rule = self.rules.get(rule_id)
+
+        if rule and 'older_than_days' in rule:
+            self._update_age_index(rule, rows, keys, full)
+            # Rows that left the index or got a newer date recover; changed rows already past the
+            # cutoff alert now, and the rest surface in check_due as their dates pass it
+            entries, dates = self._age_index(rule)
+            now = datetime.now()
+            cutoff = (now - timedelta(days=rule['older_than_days'])).strftime('%Y-%m-%d')
+            recovered = {key for key in keys if not dates.get(key, cutoff) < cutoff}
+            self._set_active(self._active - {(rule_id, key) for key in recovered})
+            if full:
+                return []
+            return self._fire(rule_id, [key for key in dict.fromkeys(keys) if dates.get(key, cutoff) < cutoff], now)
+
+        matches = self._matches(rule_id, rows)
+        breached = set(rows.loc[matches, key_col])
+        self._set_active(self._active - {(rule_id, key) for key in set(keys) - breached})
+        return self._fire(rule_id, rows.loc[matches, key_col], datetime.now(), rows.loc[matches])
+
+    def _matches(self, rule_id, rows):
+        if rows.empty:
+            return pd.Series(False, index=rows.index)
+        if rule_id in self._predicates:
+            return pd.Series(self._predicates[rule_id][1](rows), index=rows.index).fillna(False).astype(bool)
+
+        rule = self.rules[rule_id]
+        values = pd.to_numeric(rows[rule['column']], errors='coerce')
+        matches = OPERATORS[rule['op']](values, rule['value']).fillna(False)
+        return matches & self._when(rule, rows)
+
+    def _when(self, rule, rows):
+        if not rule.get('when') or rows.empty:
+            return pd.Series(True, index=rows.index)
+        return pd.Series(rows.eval(rule['when']), index=rows.index).fillna(False).astype(bool)
+
+    def _age_index(self, rule):
+        if rule['rule_id'] not in self._age_indexes:
+            df = getattr(self.data_manager, f"{rule['table']}_df")
+            self._age_indexes[rule['rule_id']] = ([], {})
+            self._update_age_index(rule, df, df[TABLE_KEYS[rule['table']]], full=True)
+        return self._age_indexes[rule['rule_id']]
+
+    def _update_age_index(self, rule, rows, keys, full=False):
+        """Keep (date, key) sorted for rows passing the rule's filter; O(log n) per changed row"""
+        if full:
+            rows = rows[self._when(rule, rows)]
+            dates = pd.to_datetime(rows[rule['column']], errors='coerce').dt.strftime('%Y-%m-%d')
+            pairs = sorted(zip(dates[dates.notna()], rows.loc[dates.notna(), TABLE_KEYS[rule['table']]]))
+            self._age_indexes[rule['rule_id']] = (pairs, {key: date for date, key in pairs})
+            # The next due check covers the whole rebuilt index
+            self._due_cutoffs.pop(rule['rule_id'], None)
+            return
+
+        entries, dates = self._age_index(rule)
+        for key in keys:
+            if key in dates:
+                del entries[bisect.bisect_left(entries, (dates.pop(key), key))]
+
+        rows = rows[self._when(rule, rows)]
+        new_dates = pd.to_datetime(rows[rule['column']], errors='coerce').dt.strftime('%Y-%m-%d')
+        for date, key in zip(new_dates, rows[TABLE_KEYS[rule['table']]]):
+            if pd.notna(date):
+                bisect.insort(entries, (date, key))
+                dates[key] = date
+
+    def _fire(self, rule_id, keys, now, rows=None):
+        """Create alerts for keys not already in breach"""
+        table = self._rule_table(rule_id)
+        key_col = TABLE_KEYS[table]
+        new_keys = [key for key in keys if (rule_id, key) not in self._active]
+        if not new_keys:
+            return []
+        self._changed = True
+        if self._silent:
+            self._active.update((rule_id, key) for key in new_keys)
+            return []
+
+        if rows is None:
+            df = getattr(self.data_manager, f'{table}_df')
+            rows = df[df[key_col].isin(new_keys)]
+        rule = self.rules.get(rule_id)
+        names = dict(zip(rows[key_col], rows['name'].astype(str)))
+        values = dict(zip(rows[key_col], rows[rule['column']])) if rule else {}
+
+        alerts = []
+        for key in new_keys:
+            self._active.add((rule_id, key))
+            alert = {
+                'alert_id': uuid.uuid4().hex[:12],
+                'rule_id': rule_id,
+                'table': table,
+                'key': key,
+                'name': names.get(key, key),
+                'message': self._describe(rule_id, values.get(key)),
+                'created_at': now.isoformat(timespec='seconds'),
+                'read': False
+            }
+            self.inbox.append(alert)
+            alerts.append(alert)
+        return alerts
+
+    def _describe(self, rule_id, value):
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            return self._predicates[rule_id][2]
+        if 'older_than_days' in rule:
+            return f"{rule['label']}: {rule['column']} {value} is over {rule['older_than_days']} days ago"
+        value = pd.to_numeric(value, errors='coerce')
+        return f"{rule['label']}: {rule['column']} {value:.1f} {rule['op']} {rule['value']}"
+
+    def _set_active(self, active):
+        if active != self._active:
+            self._active = active
+            self._changed = True
+
+    def _rule_table(self, rule_id):
+        if rule_id in self.rules:
+            return self.rules[rule_id]['table']
+        return self._predicates[rule_id][0]
+
+    def _deliver(self, alerts, save=True):
+        if save:
+            self._save()
+        if not alerts:
+            return
+        for sink in self.sinks:
+            try:
+                sink.send(alerts)
+            except Exception:
+                # A broken sink must never fail the write that raised the alert
+                logger.exception("Alert sink %r failed", sink)
+
+    def _save(self):
+        """Write the rules, breach state and inbox if they changed since the last save"""
+        # Also called from the write-behind flush thread, hence the locks
+        with self._save_lock:
+            with self.data_manager._lock:
+                if not self._changed and self.path.exists():
+                    return
+                self._changed = False
+                state = {
+                    'rules': list(self.rules.values()),
+                    'active': sorted([list(pair) for pair in self._active]),
+                    'inbox': [dict(alert) for alert in self.inbox]
+                }
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+
+
+class FileSink:
+    """Append alerts to a JSON Lines file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alerts):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + '\n')
+
+    def close(self):
+        pass
+
+
+class WebhookSink:
+    """POST alerts as JSON to a URL from a background thread, so writes never wait on the network"""
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='streamr-alert-webhook', daemon=True)
+        self._thread.start()
+
+    def send(self, alerts):
+        self._queue.put(alerts)
+
+    def close(self):
+        self._queue.join()
+
+    def _run(self):
+        import requests
+        while True:
+            alerts = self._queue.get()
+            try:
+                requests.post(self.url, json={'alerts': alerts}, timeout=self.timeout).raise_for_status()
+            except Exception:
+                logger.exception("Alert webhook %s failed", self.url)
+            finally:
+                self._queue.task_done()
+
+
+def default_sinks():
+    """Sinks configured by STREAMR_ALERT_FILE and STREAMR_ALERT_WEBHOOK"""
+    sinks = []
+    if os.getenv('STREAMR_ALERT_FILE'):
+        sinks.append(FileSink(os.getenv('STREAMR_ALERT_FILE')))
+    if os.getenv('STREAMR_ALERT_WEBHOOK'):
+        sinks.append(WebhookSink(os.getenv('STREAMR_ALERT_WEBHOOK')))
+    return sinks
@@ -1,12 +1,40 @@
+import functools
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from curator_dedupe import playlist_keys
+from cohorts import CohortEngine
+from query_engine import QueryEngine
+
+def cached_per_version(method):
+    """Reuse a result until the data version (or the calendar day) changes"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        stamp = (self.data_manager.version, datetime.now().date())
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        result = method(self, *args, **kwargs)
+        self._cache[key] = (stamp, result)
+        return result
+    return wrapper
 
 class AnalyticsManager:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, max_points=2000):
         self.data_manager = data_manager
+        # Upper bound on points sent to the browser per chart
+        self.max_points = max_points
+        # (method, args) -> ((data version, day), result)
+        self._cache = {}
+        # Release-week cohorts kept up to date incrementally from the stats history
+        self.cohorts = CohortEngine(data_manager)
+        # Ad-hoc SQL over the tables, scanned in place by DuckDB
+        self.sql = QueryEngine(data_manager)
         
+    @cached_per_version
     def generate_stream_trend(self, days=30):
         """Generate streaming trend chart for the last N days"""
         tracks_df = self.data_manager.tracks_df.copy()
@@ -18,6 +46,8 @@ class AnalyticsManager:
         
         if recent_tracks.empty:
             return None
+        
+        recent_tracks = self.downsample_line(recent_tracks.sort_values('release_date'), 'release_date', 'streams')
             
         fig = px.line(recent_tracks, 
                       x='release_date', 
@@ -26,14 +56,14 @@ class AnalyticsManager:
                       labels={'release_date': 'Date', 'streams': 'Total Streams'})
         return fig
     
+    @cached_per_version
     def generate_save_rate_chart(self):
         """Generate save rate comparison chart"""
-        tracks_df = self.data_manager.tracks_df.copy()
+        # save_rate is maintained on write; the sort index is shared with the track list
+        tracks_df = self.data_manager.sorted_tracks('save_rate')
         
         if tracks_df.empty:
             return None
-            
-        tracks_df['save_rate'] = (tracks_df['saves'] / tracks_df['streams'] * 100).fillna(0)
         
         fig = px.bar(tracks_df,
                      x='name',
@@ -42,6 +72,7 @@ class AnalyticsManager:
                      labels={'name': 'Track Name', 'save_rate': 'Save Rate (%)'})
         return fig
     
+    @cached_per_version
     def generate_playlist_impact(self):
         """Generate playlist impact visualization"""
         tracks_df = self.data_manager.tracks_df.copy()
@@ -49,6 +80,21 @@ class AnalyticsManager:
         if tracks_df.empty:
             return None
             
+        if len(tracks_df) > self.max_points:
+            # Plot aggregated grid cells instead of individual tracks
+            binned = self.downsample_scatter(tracks_df, 'playlist_adds', 'streams', 'saves')
+            fig = px.scatter(binned,
+                            x='playlist_adds',
+                            y='streams',
+                            size='saves',
+                            hover_data=['tracks'],
+                            title='Playlist Impact Analysis',
+                            labels={'playlist_adds': 'Playlist Adds (bin average)',
+                                   'streams': 'Total Streams (bin average)',
+                                   'saves': 'Total Saves',
+                                   'tracks': 'Tracks'})
+            return fig
+            
         fig = px.scatter(tracks_df,
                         x='playlist_adds',
                         y='streams',
@@ -60,12 +106,17 @@ class AnalyticsManager:
                                'saves': 'Total Saves'})
         return fig
     
-    def generate_member_performance(self):
-        """Generate member performance comparison"""
-        members_df = self.data_manager.members_df.copy()
+    @cached_per_version
+    def generate_member_performance(self, days=30):
+        """Generate member performance comparison over the last N days"""
+        members = self.data_manager.members_df
         
-        if members_df.empty:
+        if members.empty:
             return None
+        
+        # Windowed counts come from the activity log's counters, not the lifetime totals
+        members_df = self.data_manager.activity.window(days, members['member_id'])
+        members_df['name'] = members['name'].to_numpy()
             
         fig = go.Figure()
         
@@ -82,12 +133,13 @@ class AnalyticsManager:
                             x=members_df['name'],
                             y=members_df['playlists_submitted']))
         
-        fig.update_layout(title='Member Performance Comparison',
+        fig.update_layout(title=f'Member Performance Comparison (Last {days} Days)',
                          barmode='group',
                          xaxis_title='Member Name',
                          yaxis_title='Count')
         return fig
     
+    @cached_per_version
     def calculate_growth_metrics(self):
         """Calculate key growth metrics"""
         tracks_df = self.data_manager.tracks_df.copy()
@@ -127,8 +179,109 @@ class AnalyticsManager:
         
         return metrics
     
+    @cached_per_version
+    def calculate_curator_metrics(self):
+        """Calculate curator status counts and reach"""
+        curators_df = self.data_manager.curators_df
+        accepted = curators_df[curators_df['submission_status'] == 'Accepted']
+        
+        # Count each playlist's followers once even if it was entered more than once
+        keys = playlist_keys(curators_df['playlist_url'])
+        unique_reach = curators_df[keys.isna() | ~keys.duplicated()]
+        
+        return {
+            'status_counts': curators_df['submission_status'].value_counts(),
+            'total_followers': unique_reach['followers'].sum(),
+            'accepted_followers': accepted['followers'].sum(),
+            'acceptance_rate': (len(accepted) / len(curators_df) * 100) if len(curators_df) > 0 else 0
+        }
+    
+    @cached_per_version
+    def generate_cohort_chart(self, weeks=26):
+        """Generate average streams at each milestone for recent release-week cohorts"""
+        cohorts = self.cohorts.get_cohorts()
+        
+        if cohorts is None or cohorts.empty:
+            return None
+        
+        recent = cohorts.tail(weeks).reset_index()
+        recent = recent.melt(id_vars=['release_week', 'tracks'],
+                             value_vars=self.cohorts.columns,
+                             var_name='milestone',
+                             value_name='streams')
+        recent['milestone'] = recent['milestone'].str.replace('day_', 'Day ')
+        
+        fig = px.line(recent,
+                      x='release_week',
+                      y='streams',
+                      color='milestone',
+                      markers=True,
+                      hover_data=['tracks'],
+                      title='Average Streams After Release by Release Week',
+                      labels={'release_week': 'Release Week',
+                             'streams': 'Average Streams',
+                             'milestone': 'Milestone',
+                             'tracks': 'Tracks'})
+        return fig
+    
     def _calculate_growth_percentage(self, current, previous):
         """Calculate growth percentage between two values"""
         if previous == 0:
             return 100 if current > 0 else 0
-        return ((current - previous) / previous) * 100
\ No newline at end of file
+        return ((current - previous) / previous) * 100
+    
+    def downsample_line(self, df, x, y, max_points=None):
+        """Reduce a line series to at most max_points rows with Largest-Triangle-Three-Buckets"""
+        max_points = max_points or self.max_points
+        if len(df) <= max_points:
+            return df
+        
+        x_values = df[x].to_numpy()
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            x_values = x_values.astype('datetime64[ns]').astype(np.int64)
+        x_values = x_values.astype(float)
+        y_values = df[y].to_numpy(dtype=float)
+        
+        return df.iloc[_lttb_indices(x_values, y_values, max_points)]
+    
+    def downsample_scatter(self, df, x, y, size, max_points=None):
+        """Aggregate a scatter into a grid of at most max_points occupied cells"""
+        max_points = max_points or self.max_points
+        bins = max(int(np.sqrt(max_points)), 1)
+        
+        x_codes = pd.cut(df[x], bins, labels=False, include_lowest=True)
+        y_codes = pd.cut(df[y], bins, labels=False, include_lowest=True)
+        
+        binned = df.groupby([x_codes, y_codes]).agg(
+            **{x: (x, 'mean'), y: (y, 'mean'), size: (size, 'sum'), 'tracks': (x, 'size')}
+        )
+        return binned.reset_index(drop=True)
+
+
+def _lttb_indices(x, y, n_out):
+    """Row positions kept by LTTB; each bucket is scored in one vectorized step"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+    
+    # Average of the following bucket via prefix sums; the last bucket looks at the final point
+    x_sum = np.concatenate([[0.0], np.cumsum(x)])
+    y_sum = np.concatenate([[0.0], np.cumsum(y)])
+    counts = ends - starts
+    next_x = np.append((x_sum[ends[1:]] - x_sum[starts[1:]]) / counts[1:], x[-1])
+    next_y = np.append((y_sum[ends[1:]] - y_sum[starts[1:]]) / counts[1:], y[-1])
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = starts[i], ends[i]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) -
+                      (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
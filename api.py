@@ -0,0 +1,238 @@
+import hashlib
+import json
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+from workspace_manager import DEFAULT_WORKSPACE, WORKSPACE_FILE, ROLLUP_FILE
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Seconds between checks of a workspace's table files for writes by the app or CLI
+RELOAD_CHECK_SECONDS = 1.0
+# Response bodies kept per ETag
+CACHE_SIZE = 256
+
+# Tables served as paginated lists, with a single-row route per id
+TABLE_RESOURCES = ['tracks', 'members', 'curators']
+
+class StoreApi:
+    """Read-only JSON views of each workspace's tables and summaries, with ETags from the table files on disk"""
+
+    def __init__(self, workspaces):
+        self.workspaces = workspaces
+        self._lock = threading.Lock()
+        # workspace -> {'data_manager', 'stamp', 'checked'}
+        self._open = {}
+        # ETag -> response body, least recently used first
+        self._cache = OrderedDict()
+
+    def handle(self, target, if_none_match=None):
+        """Answer one GET request; returns (status, headers, body bytes)"""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            if parts == ['workspaces']:
+                # Stamped by the files the list is built from, so an unchanged list isn't rebuilt
+                etag = _etag(self._workspaces_stamp(), url.path, sorted(query.items()))
+                return self._respond(etag, if_none_match,
+                                     lambda: self._json(self._workspace_list(), query.get('fields')))
+
+            # Paths without a /workspaces/<slug> prefix read the default workspace
+            workspace = DEFAULT_WORKSPACE
+            if parts[:1] == ['workspaces'] and len(parts) > 2:
+                workspace, parts = parts[1], parts[2:]
+            state = self._workspace(workspace)
+
+            # The table files' stamp names the data being served and survives server restarts,
+            # so an unchanged ETag needs no recomputation
+            etag = _etag(workspace, state['stamp'], url.path, sorted(query.items()))
+            return self._respond(etag, if_none_match, lambda: self._render(state['data_manager'], parts, query))
+        except LookupError as e:
+            return _error(404, str(e))
+        except ValueError as e:
+            return _error(400, str(e))
+
+    def _render(self, data_manager, parts, query):
+        fields = query.get('fields')
+        if len(parts) in (1, 2) and parts[0] in TABLE_RESOURCES:
+            getter = getattr(data_manager, f'get_{parts[0][:-1]}_stats')
+            with data_manager._lock:
+                if len(parts) == 2:
+                    row = getter(parts[1])
+                    if row.empty:
+                        raise LookupError(f"No {parts[0][:-1]} with id '{parts[1]}'")
+                    return self._json(_records(_select(row, fields))[0])
+                return self._page(getter(), parts[0], query)
+
+        if parts == ['metrics']:
+            with data_manager._lock:
+                return self._json(data_manager.get_performance_metrics(), fields)
+
+        if parts == ['summary']:
+            from services import TrackService, MemberService, CuratorService
+            with data_manager._lock:
+                summary = {
+                    'tracks': TrackService(data_manager).get_performance_summary(),
+                    'members': MemberService(data_manager).get_performance_summary(),
+                    'curators': CuratorService(data_manager).get_summary()
+                }
+            return self._json(summary, fields)
+
+        raise LookupError(f"No resource at '/{'/'.join(parts)}'")
+
+    def _page(self, df, resource, query):
+        """One page of rows plus total and the next page's query"""
+        limit = _int_param(query, 'limit', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        offset = _int_param(query, 'offset', 0, 0, None)
+        page = _select(df.iloc[offset:offset + limit], query.get('fields'))
+
+        following = None
+        if offset + limit < len(df):
+            following = f'{resource}?' + urlencode({**query, 'offset': offset + limit, 'limit': limit})
+        envelope = json.dumps({'total': len(df), 'offset': offset, 'limit': limit, 'next': following})
+        # Rows are encoded by pandas in one call and spliced in rather than round-tripped through dicts
+        records = page.to_json(orient='records', date_format='iso')
+        return (envelope[:-1] + ', "data": ' + records + '}').encode('utf-8')
+
+    def _respond(self, etag, if_none_match, render):
+        headers = [('ETag', etag), ('Cache-Control', 'no-cache')]
+        if if_none_match and (if_none_match.strip() == '*' or etag in [t.strip() for t in if_none_match.split(',')]):
+            return 304, headers, b''
+
+        with self._lock:
+            body = self._cache.get(etag)
+            if body is not None:
+                self._cache.move_to_end(etag)
+        if body is None:
+            body = render()
+            with self._lock:
+                self._cache[etag] = body
+                while len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return 200, headers + [('Content-Type', 'application/json')], body
+
+    def _workspace(self, workspace):
+        """The workspace's tables opened read-only, reopened when another process has rewritten them"""
+        if workspace not in self.workspaces.list_workspaces():
+            raise LookupError(f"Unknown workspace '{workspace}'")
+
+        with self._lock:
+            state = self._open.get(workspace)
+            if state is not None and time.monotonic() - state['checked'] < RELOAD_CHECK_SECONDS:
+                return state
+            stamp = _stamp(self.workspaces.get_data_dir(workspace))
+            if state is None or state['stamp'] != stamp:
+                state = {'data_manager': self.workspaces.open(workspace, read_only=True), 'stamp': stamp}
+                self._open[workspace] = state
+            state['checked'] = time.monotonic()
+            return state
+
+    def _workspaces_stamp(self):
+        """Stamp of each workspace's name, roll-up and table files"""
+        stamp = []
+        for workspace in self.workspaces.list_workspaces():
+            data_dir = self.workspaces.get_data_dir(workspace)
+            stamp.append((workspace, _file_stamp(data_dir / WORKSPACE_FILE), _file_stamp(data_dir / ROLLUP_FILE),
+                          _stamp(data_dir)))
+        return tuple(stamp)
+
+    def _workspace_list(self):
+        return _records(self.workspaces.load_rollups(read_only=True))
+
+    def _json(self, value, fields=None):
+        if fields and isinstance(value, dict):
+            value = {key: value[key] for key in _field_list(fields, value)}
+        return json.dumps(_plain(value)).encode('utf-8')
+
+
+def serve(workspaces, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve the API until interrupted"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.api = StoreApi(workspaces)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, headers, body = self.server.api.handle(self.path, self.headers.get('If-None-Match'))
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _stamp(data_dir):
+    """Modification time and size of each served table file"""
+    return tuple(_file_stamp(data_dir / f'{table}.csv') for table in TABLE_RESOURCES)
+
+
+def _file_stamp(path):
+    """(mtime_ns, size) of a file, None if it doesn't exist"""
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _etag(*parts):
+    return '"' + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def _select(df, fields):
+    return df[_field_list(fields, df.columns)] if fields else df
+
+
+def _field_list(fields, available):
+    """Requested fields in request order; raises ValueError for unknown ones"""
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _int_param(query, name, default, minimum, maximum):
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f"'{name}' must be between {minimum} and {maximum}" if maximum is not None
+                         else f"'{name}' must be at least {minimum}")
+    return value
+
+
+def _records(df):
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+def _plain(value):
+    """JSON-safe copy: numpy scalars as Python numbers, NaN as null, datetimes as ISO strings"""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _error(status, message):
+    return status, [('Content-Type', 'application/json')], json.dumps({'error': message}).encode('utf-8')
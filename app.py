@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 from pathlib import Path
@@ -5,12 +6,13 @@ from datetime import datetime
 
 # Import custom modules
 from spotify_auth import SpotifyAuthManager
-from data_manager import DataManager
+from workspace_manager import WorkspaceManager
 from track_manager import TrackManager
 from member_manager import MemberManager
 from curator_manager import CuratorManager
 from analytics import AnalyticsManager
 from dashboard import Dashboard
+from alerts import AlertEngine, default_sinks
 
 # Configure Streamlit page settings
 st.set_page_config(
@@ -20,9 +22,70 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Sidebar navigation
+st.sidebar.title("StreamR 🎵")
+
+# Workspace switcher: each artist's data lives in its own partition
+if 'workspace_manager' not in st.session_state:
+    st.session_state.workspace_manager = WorkspaceManager()
+
+workspaces = st.session_state.workspace_manager
+
+# Set STREAMR_WRITE_BEHIND=1 to persist edits in background group commits
+WRITE_BEHIND = os.getenv('STREAMR_WRITE_BEHIND') == '1'
+
+@st.cache_resource
+def open_write_behind(workspace):
+    """The process's one write-behind DataManager (and alert engine) per workspace, shared by all sessions"""
+    # A data directory's journal has a single writer; a second one would replay and unlink the live journal
+    data_manager = WorkspaceManager().open(workspace, write_behind=True)
+    return data_manager, AlertEngine(data_manager, default_sinks())
+
+def create_workspace():
+    try:
+        st.session_state.workspace = workspaces.create_workspace(st.session_state.new_workspace_name)
+        st.session_state.new_workspace_name = ''
+    except ValueError as e:
+        st.session_state.workspace_error = str(e)
+
+workspace = st.sidebar.selectbox(
+    "Workspace",
+    workspaces.list_workspaces(),
+    format_func=workspaces.get_name,
+    key='workspace'
+)
+
+with st.sidebar.expander("New Workspace"):
+    st.text_input("Artist Name", key='new_workspace_name')
+    st.button("Create Workspace", on_click=create_workspace)
+    if st.session_state.get('workspace_error'):
+        st.error(st.session_state.pop('workspace_error'))
+
+# Switching workspaces drops the managers bound to the previous partition
+if st.session_state.get('loaded_workspace') != workspace:
+    if 'data_manager' in st.session_state and not WRITE_BEHIND:
+        st.session_state.data_manager.close()
+    for key in ['data_manager', 'track_manager', 'member_manager', 'curator_manager',
+                'analytics_manager', 'dashboard', 'alert_engine']:
+        st.session_state.pop(key, None)
+    st.session_state.loaded_workspace = workspace
+
 # Initialize managers
 if 'data_manager' not in st.session_state:
-    st.session_state.data_manager = DataManager()
+    if WRITE_BEHIND:
+        st.session_state.data_manager, st.session_state.alert_engine = open_write_behind(workspace)
+    else:
+        st.session_state.data_manager = workspaces.open(workspace)
+
+# Alert sinks outlive workspace switches; the engine is per workspace
+if 'alert_sinks' not in st.session_state:
+    st.session_state.alert_sinks = default_sinks()
+
+if 'alert_engine' not in st.session_state:
+    st.session_state.alert_engine = AlertEngine(
+        st.session_state.data_manager,
+        st.session_state.alert_sinks
+    )
 
 if 'spotify_auth' not in st.session_state:
     st.session_state.spotify_auth = SpotifyAuthManager()
@@ -41,7 +104,8 @@ if 'member_manager' not in st.session_state:
 
 if 'curator_manager' not in st.session_state:
     st.session_state.curator_manager = CuratorManager(
-        st.session_state.data_manager
+        st.session_state.data_manager,
+        st.session_state.spotify_auth
     )
 
 if 'analytics_manager' not in st.session_state:
@@ -55,9 +119,6 @@ if 'dashboard' not in st.session_state:
         st.session_state.analytics_manager
     )
 
-# Sidebar navigation
-st.sidebar.title("StreamR 🎵")
-
 # Spotify Authentication Status
 if 'spotify_token' not in st.session_state:
     st.session_state.spotify_token = None
@@ -79,7 +140,7 @@ else:
 # Navigation
 page = st.sidebar.selectbox(
     "Navigation",
-    ["Track Drop Manager", "Member Hub", "Curator Push", "Performance Dashboard"]
+    ["Track Drop Manager", "Member Hub", "Curator Push", "Performance Dashboard", "Label Overview", "SQL Explorer", "Change History"]
 )
 
 # Main content area
@@ -92,10 +153,18 @@ if page == "Track Drop Manager":
     with st.expander("Add New Track", expanded=True):
         st.session_state.track_manager.render_track_form()
     
+    # Bulk import section
+    with st.expander("Import Tracks from CSV"):
+        st.session_state.track_manager.render_import_form()
+    
     # Track list
     st.subheader("Your Tracks")
     st.session_state.track_manager.render_track_list()
     
+    # Audio feature similarity
+    with st.expander("Sound-Alike Search"):
+        st.session_state.track_manager.render_similarity_section()
+    
 elif page == "Member Hub":
     st.header("Member Management")
     
@@ -103,6 +172,14 @@ elif page == "Member Hub":
     with st.expander("Add New Member", expanded=True):
         st.session_state.member_manager.render_member_form()
     
+    # Bulk import section
+    with st.expander("Import Members from CSV"):
+        st.session_state.member_manager.render_import_form()
+    
+    # Validate and enrich member Spotify IDs
+    with st.expander("Verify Spotify Profiles"):
+        st.session_state.member_manager.render_profile_section()
+    
     # Member list
     st.subheader("Network Members")
     st.session_state.member_manager.render_member_list()
@@ -114,10 +191,22 @@ elif page == "Curator Push":
     with st.expander("Add New Curator", expanded=True):
         st.session_state.curator_manager.render_curator_form()
     
+    # Follow-ups due today, within the daily contact limit
+    with st.expander("Follow-ups Due Today"):
+        st.session_state.curator_manager.render_follow_ups()
+    
     # Curator list
     st.subheader("Curator Database")
     st.session_state.curator_manager.render_curator_list()
     
+    # Duplicate detection
+    with st.expander("Find Duplicate Curators"):
+        st.session_state.curator_manager.render_dedupe_section()
+    
+    # Ranked curator suggestions
+    with st.expander("Outreach Queue"):
+        st.session_state.curator_manager.render_outreach_queue()
+    
 elif page == "Performance Dashboard":
     # Overview metrics
     st.session_state.dashboard.render_overview_metrics()
@@ -126,6 +215,10 @@ elif page == "Performance Dashboard":
     st.subheader("Performance Analytics")
     st.session_state.dashboard.render_performance_charts()
     
+    # Release cohorts
+    st.subheader("Release Cohorts")
+    st.session_state.dashboard.render_cohort_analysis()
+    
     # Member performance
     st.subheader("Member Performance")
     st.session_state.dashboard.render_member_performance()
@@ -137,6 +230,48 @@ elif page == "Performance Dashboard":
     # Export section
     st.session_state.dashboard.render_export_section()
 
+elif page == "Label Overview":
+    # Totals across every workspace, read from precomputed roll-ups
+    st.session_state.dashboard.render_label_overview(workspaces)
+
+elif page == "SQL Explorer":
+    # Read-only SQL over this workspace's tables
+    st.session_state.dashboard.render_sql_explorer()
+
+elif page == "Change History":
+    # Every edit is versioned: undo the last one or view a table at an earlier time
+    st.session_state.dashboard.render_version_history()
+
+# Alert inbox, rendered after the page so alerts raised by this run's edits are included
+alert_engine = st.session_state.alert_engine
+alert_engine.check_due()
+unread = alert_engine.unread()
+
+with st.sidebar.expander(f"🔔 Alerts ({len(unread)})"):
+    if not unread:
+        st.caption("No new alerts")
+    for alert in reversed(unread[-20:]):
+        st.markdown(f"**{alert['name']}**  \n{alert['message']}  \n*{alert['created_at']}*")
+    if len(unread) > 20:
+        st.caption(f"and {len(unread) - 20} more")
+    if unread:
+        st.button("Mark All Read", on_click=alert_engine.mark_read)
+
+with st.sidebar.expander("Alert Rules"):
+    rules = alert_engine.rules
+    with st.form("alert_rules_form"):
+        save_rate = st.number_input("Save rate below (%)", min_value=0.0,
+                                    value=float(rules['low_save_rate']['value']))
+        compliance = st.number_input("Compliance score below", min_value=0.0,
+                                     value=float(rules['low_compliance']['value']))
+        no_response_days = st.number_input("Curator submitted, no response after (days)", min_value=1,
+                                           value=int(rules['curator_no_response']['older_than_days']))
+        if st.form_submit_button("Save Rules"):
+            alert_engine.set_rule({**rules['low_save_rate'], 'value': save_rate})
+            alert_engine.set_rule({**rules['low_compliance'], 'value': compliance})
+            alert_engine.set_rule({**rules['curator_no_response'], 'older_than_days': int(no_response_days)})
+            st.rerun()
+
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown("""
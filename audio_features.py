@@ -0,0 +1,204 @@
+import numpy as np
+
+# Spotify audio feature fields stored per track, in matrix column order
+FEATURE_COLUMNS = [
+    'danceability', 'energy', 'key', 'loudness', 'mode', 'speechiness',
+    'acousticness', 'instrumentalness', 'liveness', 'valence', 'tempo'
+]
+
+class AudioFeatureStore:
+    """Audio features for many tracks kept as one float32 matrix, persisted next to the tables"""
+
+    def __init__(self, data_dir, filename='audio_features.npz'):
+        self.path = data_dir / filename
+        self.ids = np.array([], dtype=object)
+        self.matrix = np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+        self._positions = {}
+        self._mtime = None
+        self.load()
+
+    def load(self):
+        if self.path.exists():
+            self._mtime = self.path.stat().st_mtime_ns
+            try:
+                # ids are stored as fixed-width unicode, so nothing is unpickled from the data file
+                with np.load(self.path, allow_pickle=False) as data:
+                    self.ids = data['ids'].astype(object)
+                    self.matrix = data['matrix'].astype(np.float32)
+            except ValueError:
+                # Files from before that stored ids as a pickled object array; features are refetched
+                self.ids = np.array([], dtype=object)
+                self.matrix = np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float32)
+        self._positions = {spotify_id: i for i, spotify_id in enumerate(self.ids)}
+
+    def refresh(self):
+        """Reload if another process or manager saved newer features"""
+        mtime = self.path.stat().st_mtime_ns if self.path.exists() else None
+        if mtime != self._mtime:
+            self.load()
+
+    def save(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp.npz')
+        np.savez(tmp_path, ids=np.asarray(self.ids, dtype=str), matrix=self.matrix)
+        tmp_path.replace(self.path)
+        self._mtime = self.path.stat().st_mtime_ns
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, spotify_id):
+        return spotify_id in self._positions
+
+    def get(self, spotify_ids):
+        """Return the feature rows for the given ids (missing ids are skipped)"""
+        positions = [self._positions[i] for i in spotify_ids if i in self._positions]
+        return self.ids[positions], self.matrix[positions]
+
+    def upsert(self, spotify_ids, matrix):
+        """Insert or replace feature rows"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        new_ids, new_rows = [], []
+        for spotify_id, row in zip(spotify_ids, matrix):
+            position = self._positions.get(spotify_id)
+            if position is None:
+                self._positions[spotify_id] = len(self.ids) + len(new_ids)
+                new_ids.append(spotify_id)
+                new_rows.append(row)
+            else:
+                self.matrix[position] = row
+
+        if new_ids:
+            self.ids = np.concatenate([self.ids, np.array(new_ids, dtype=object)])
+            self.matrix = np.vstack([self.matrix, np.array(new_rows, dtype=np.float32)])
+
+    def fetch_missing(self, spotify_auth, spotify_ids, sp_client=None):
+        """Fetch features for ids not stored yet, 100 per API call, and persist them"""
+        missing = [i for i in dict.fromkeys(spotify_ids) if i and i not in self._positions]
+        if not missing:
+            return 0
+
+        features = spotify_auth.get_tracks_audio_features(missing, sp_client)
+        found = [f for f in features if f]
+        if found:
+            matrix = np.array([[f.get(col) or 0.0 for col in FEATURE_COLUMNS] for f in found], dtype=np.float32)
+            self.upsert([f['id'] for f in found], matrix)
+            self.save()
+        return len(found)
+
+
+class AudioFeatureIndex:
+    """k-nearest-neighbour search over standardized audio feature vectors"""
+
+    def __init__(self, ids, matrix, metric='cosine', partitions=None, seed=0):
+        if metric not in ('cosine', 'euclidean'):
+            raise ValueError(f"Unknown metric '{metric}'")
+        self.ids = np.asarray(ids, dtype=object)
+        self.metric = metric
+
+        # Standardize each feature so tempo and loudness don't dominate
+        matrix = np.asarray(matrix, dtype=np.float32)
+        self.mean = matrix.mean(axis=0) if len(matrix) else np.zeros(matrix.shape[1], dtype=np.float32)
+        self.std = matrix.std(axis=0) if len(matrix) else np.ones(matrix.shape[1], dtype=np.float32)
+        self.std[self.std == 0] = 1.0
+        self.vectors = self._prepare(matrix)
+        self.sq_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+        # Optional inverted-file partitioning for large reference sets
+        self.centroids = None
+        if partitions and len(self.vectors) > partitions:
+            self._build_partitions(partitions, seed)
+
+    @classmethod
+    def from_store(cls, store, **kwargs):
+        return cls(store.ids, store.matrix, **kwargs)
+
+    def query(self, vectors, k=10, nprobe=4):
+        """Return (ids, scores) arrays of shape (n_queries, k); higher scores are closer"""
+        queries = self._prepare(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        return self._search(queries, k, nprobe)
+
+    def similar_to(self, spotify_id, k=10, nprobe=4):
+        """Tracks in the index that sound most like an indexed track"""
+        position = np.flatnonzero(self.ids == spotify_id)
+        if len(position) == 0:
+            return [], []
+        ids, scores = self._search(self.vectors[position[:1]], k + 1, nprobe)
+        keep = ids[0] != spotify_id
+        return list(ids[0][keep][:k]), list(scores[0][keep][:k])
+
+    def _search(self, queries, k, nprobe):
+        k = min(k, len(self.ids))
+        if self.centroids is not None:
+            return self._query_partitions(queries, k, nprobe)
+
+        scores = self._scores(queries, self.vectors, self.sq_norms)
+        top = top_k(scores, k)
+        return self.ids[top], np.take_along_axis(scores, top, axis=1)
+
+    def _prepare(self, matrix):
+        standardized = (matrix - self.mean) / self.std
+        if self.metric == 'cosine':
+            norms = np.linalg.norm(standardized, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            return standardized / norms
+        return standardized
+
+    def _scores(self, queries, vectors, sq_norms):
+        """Similarity matrix via one BLAS matrix product"""
+        dots = queries @ vectors.T
+        if self.metric == 'cosine':
+            return dots
+        # Negative squared euclidean distance so that larger is closer
+        return 2 * dots - sq_norms[None, :] - np.einsum('ij,ij->i', queries, queries)[:, None]
+
+    def _build_partitions(self, partitions, seed, iterations=10, sample_per_partition=64):
+        """Lloyd's k-means on a sample of the vectors, then assign every row to its nearest centroid"""
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(self.vectors), partitions * sample_per_partition)
+        sample = self.vectors[rng.choice(len(self.vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, partitions, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = self._nearest_centroid(sample, centroids)
+            counts = np.bincount(assignment, minlength=partitions)
+            sums = np.stack([np.bincount(assignment, sample[:, j], minlength=partitions)
+                             for j in range(sample.shape[1])], axis=1)
+            centroids = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+
+        self.centroids = centroids.astype(np.float32)
+        assignment = self._nearest_centroid(self.vectors, self.centroids)
+        self.partition_rows = np.argsort(assignment, kind='stable')
+        self.partition_offsets = np.searchsorted(assignment[self.partition_rows], np.arange(partitions + 1))
+
+    def _centroid_scores(self, vectors, centroids):
+        # Squared distance up to a per-row constant, negated so larger is closer
+        return 2 * vectors @ centroids.T - np.einsum('ij,ij->i', centroids, centroids)[None, :]
+
+    def _nearest_centroid(self, vectors, centroids):
+        return np.argmax(self._centroid_scores(vectors, centroids), axis=1)
+
+    def _query_partitions(self, queries, k, nprobe):
+        probes = top_k(self._centroid_scores(queries, self.centroids), min(nprobe, len(self.centroids)))
+        result_ids = np.empty((len(queries), k), dtype=object)
+        result_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        for q, partitions in enumerate(probes):
+            rows = np.concatenate([
+                self.partition_rows[self.partition_offsets[p]:self.partition_offsets[p + 1]]
+                for p in partitions
+            ])
+            scores = self._scores(queries[q:q + 1], self.vectors[rows], self.sq_norms[rows])
+            top = top_k(scores, min(k, len(rows)))[0]
+            result_ids[q, :len(top)] = self.ids[rows[top]]
+            result_scores[q, :len(top)] = scores[0, top]
+        return result_ids, result_scores
+
+
+def top_k(scores, k):
+    """Column positions of the k largest scores per row, best first"""
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,118 @@
+import io
+import time
+import numpy as np
+import pandas as pd
+from data_manager import DataManager
+
+# Throughput checks for the bulk code paths, run by `python cli.py bench`
+
+def make_tracks_csv(rows, seed=0):
+    """A Spotify for Artists style export with one row per track"""
+    rng = np.random.default_rng(seed)
+    release = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 600, rows), unit='D')
+    streams = rng.integers(0, 1_000_000, rows)
+    return pd.DataFrame({
+        'Spotify URI': [f'spotify:track:{i:022d}' for i in range(rows)],
+        'Track': [f'Track {i}' for i in range(rows)],
+        'Artist': 'Bench Artist',
+        'Release Date': release.strftime('%Y-%m-%d'),
+        'Streams': streams,
+        'Saves': (streams * rng.uniform(0, 0.2, rows)).astype(int),
+        'Playlist Adds': rng.integers(0, 500, rows)
+    }).to_csv(index=False)
+
+
+def make_curators(rows, seed=0):
+    """Curators where roughly one in ten is a near-duplicate of another"""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, max(rows - rows // 10, 1), rows)
+    return pd.DataFrame({
+        'curator_id': [f'curator_{i}' for i in range(rows)],
+        'name': [f'Chill Vibes {b}' + ('!' if i % 10 == 0 else '') for i, b in enumerate(base)],
+        'email': [f'curator{i}@example.com' for i in range(rows)],
+        'playlist_url': [f'https://open.spotify.com/playlist/{i:022d}' for i in range(rows)],
+        'followers': rng.integers(0, 100_000, rows)
+    })
+
+
+def make_spotify_refs(rows, seed=0):
+    """Spotify references as they arrive in imports: URLs with query strings, URIs, bare IDs and junk"""
+    rng = np.random.default_rng(seed)
+    formats = [
+        'https://open.spotify.com/track/{}?si=abc123',
+        'https://open.spotify.com/playlist/{}',
+        'spotify:track:{}',
+        '{}',
+        'not a link {}'
+    ]
+    return pd.Series([formats[f].format(f'{i:022d}') for i, f in enumerate(rng.integers(0, len(formats), rows))])
+
+
+def bench_validation(data_manager, rows):
+    from utils import parse_spotify_refs, parse_spotify_ref, validate_emails, validate_email
+    refs = make_spotify_refs(rows)
+    emails = pd.Series([f'curator{i}@example.com' if i % 7 else f'curator{i}' for i in range(rows)])
+
+    start = time.perf_counter()
+    parsed = parse_spotify_refs(refs)
+    validate_emails(emails)
+    vectorized = time.perf_counter() - start
+
+    # The per-value functions on a tenth of the rows, for comparison
+    sample = max(rows // 10, 1)
+    start = time.perf_counter()
+    [parse_spotify_ref(ref) for ref in refs[:sample]]
+    [validate_email(email) for email in emails[:sample]]
+    per_value = (time.perf_counter() - start) * rows / sample
+
+    return (f"{parsed['spotify_id'].notna().sum():,} valid refs, {2 * rows / vectorized:,.0f} values/s "
+            f"({per_value / vectorized:.1f}x per-value calls)")
+
+
+def bench_ingest(data_manager, rows):
+    from ingest_manager import IngestManager
+    source = io.StringIO(make_tracks_csv(rows))
+    result = IngestManager(data_manager).ingest_tracks(source)
+    return f"{result['inserted']:,} tracks"
+
+
+def bench_snapshot(data_manager, rows):
+    data_manager.record_track_history(data_manager.tracks_df, save=False)
+    return f"{len(data_manager.history_df):,} history rows"
+
+
+def bench_cohorts(data_manager, rows):
+    from cohorts import CohortEngine
+    cohorts = CohortEngine(data_manager).get_cohorts()
+    return f"{len(cohorts):,} release weeks"
+
+
+def bench_export(data_manager, rows):
+    from export_manager import ExportManager
+    path = ExportManager(data_manager).get_export('tracks', 'CSV (gzip)')
+    return f"{path.stat().st_size / 1e6:.1f} MB"
+
+
+def bench_dedupe(data_manager, rows):
+    from curator_dedupe import find_duplicates
+    duplicates = find_duplicates(make_curators(max(rows // 10, 2)))
+    return f"{len(duplicates):,} curators in duplicate groups"
+
+
+# (name, function(data_manager, rows) -> detail), run in order on one data directory
+BENCHMARKS = [
+    ('ingest tracks', bench_ingest),
+    ('snapshot history', bench_snapshot),
+    ('cohorts', bench_cohorts),
+    ('export tracks csv.gz', bench_export),
+    ('dedupe curators (rows/10)', bench_dedupe),
+    ('validate spotify refs + emails', bench_validation)
+]
+
+def run_all(data_dir, rows):
+    """Yield (name, seconds, detail) for each benchmark"""
+    data_manager = DataManager(data_dir)
+    for name, benchmark in BENCHMARKS:
+        start = time.perf_counter()
+        detail = benchmark(data_manager, rows)
+        yield name, time.perf_counter() - start, detail
@@ -0,0 +1,272 @@
+"""StreamR command line for nightly and batch jobs.
+
+    python cli.py import tracks export.csv
+    python cli.py --all-workspaces --workers 4 refresh
+    python cli.py recompute compliance
+    python cli.py export tracks --format parquet --output tracks.parquet
+    python cli.py --all-workspaces --workers 8 report --output-dir reports
+    python cli.py --all-workspaces alerts
+    python cli.py undo
+    python cli.py query "SELECT artist, SUM(streams) FROM tracks GROUP BY artist" --limit 20
+    python cli.py bench --rows 100000
+    python cli.py serve --port 8600
+
+Heavy modules are imported inside the commands so that --help and argument
+errors return immediately, and each command loads only what it uses: DuckDB
+for query, the process pool for sharded jobs. pandas itself (about half a
+second) is the floor for any command that opens the tables. Nothing here
+imports streamlit or plotly.
+"""
+import argparse
+import sys
+import time
+
+EXPORT_FORMAT_NAMES = {
+    'csv': 'CSV (gzip)',
+    'parquet': 'Parquet',
+    'jsonl': 'JSON Lines'
+}
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'bench':
+        return run_bench(args)
+
+    if args.command == 'serve':
+        return run_server(args)
+
+    from workspace_manager import WorkspaceManager
+    workspaces = WorkspaceManager(args.data_dir)
+    if args.all_workspaces:
+        if args.command == 'import':
+            parser.error("import targets a single --workspace")
+        targets = workspaces.list_workspaces()
+    else:
+        targets = [args.workspace]
+        if args.workspace not in workspaces.list_workspaces():
+            parser.error(f"unknown workspace '{args.workspace}'")
+
+    # One worker process per workspace; results are printed in workspace order.
+    # Reports shard each workspace across the workers instead.
+    failed = False
+    if len(targets) > 1 and args.workers > 1 and args.command != 'report':
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(run_job, [args] * len(targets), targets))
+    else:
+        results = [run_job(args, workspace) for workspace in targets]
+
+    for workspace, (ok, message) in zip(targets, results):
+        print(f"[{workspace}] {message}")
+        failed |= not ok
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='streamr', description="Headless StreamR batch jobs")
+    parser.add_argument('--data-dir', default='data', help="data directory (default: data)")
+    parser.add_argument('--workspace', default='default', help="workspace slug (default: default)")
+    parser.add_argument('--all-workspaces', action='store_true', help="run the command for every workspace")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes: one workspace each with --all-workspaces, "
+                             "or one table shard each for report and recompute")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="upsert tracks or members from a CSV file")
+    import_parser.add_argument('table', choices=['tracks', 'members'])
+    import_parser.add_argument('path')
+    import_parser.add_argument('--chunk-size', type=int, default=50_000)
+
+    refresh_parser = commands.add_parser('refresh', help="snapshot today's track stats and refresh roll-ups")
+    refresh_parser.add_argument('--spotify', action='store_true',
+                                help="also fetch missing audio features, playlist sound profiles and member profiles")
+
+    recompute_parser = commands.add_parser('recompute', help="recompute derived scores and summaries")
+    recompute_parser.add_argument('target', choices=['compliance', 'rollups', 'all'])
+
+    export_parser = commands.add_parser('export', help="write a table export file")
+    export_parser.add_argument('table', choices=['tracks', 'members', 'curators', 'history'])
+    export_parser.add_argument('--format', choices=list(EXPORT_FORMAT_NAMES), default='csv')
+    export_parser.add_argument('--columns', help="comma-separated column names")
+    export_parser.add_argument('--start', help="first date (YYYY-MM-DD)")
+    export_parser.add_argument('--end', help="last date (YYYY-MM-DD)")
+    export_parser.add_argument('--output', help="destination file; {workspace} is replaced per workspace")
+
+    report_parser = commands.add_parser('report', help="write the nightly report set using parallel workers")
+    report_parser.add_argument('--output-dir', default='reports',
+                               help="reports go to <output-dir>/<workspace>/ (default: reports)")
+
+    query_parser = commands.add_parser('query', help="run a read-only SQL query over the tables")
+    query_parser.add_argument('sql')
+    query_parser.add_argument('--limit', type=int, default=1000, help="maximum rows to print (default: 1000)")
+    query_parser.add_argument('--csv', action='store_true', help="print CSV instead of a table")
+
+    commands.add_parser('undo', help="revert the latest change to the tables")
+
+    commands.add_parser('alerts', help="evaluate alert rules and deliver new alerts to the configured sinks")
+
+    serve_parser = commands.add_parser('serve', help="serve a read-only JSON API over every workspace")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8600)
+
+    bench_parser = commands.add_parser('bench', help="time the bulk code paths on synthetic data")
+    bench_parser.add_argument('--rows', type=int, default=100_000)
+    return parser
+
+
+def run_job(args, workspace):
+    """Run one command against one workspace; returns (ok, message)"""
+    try:
+        from workspace_manager import WorkspaceManager
+        workspaces = WorkspaceManager(args.data_dir)
+        data_manager = workspaces.open(workspace)
+        start = time.perf_counter()
+        message = COMMANDS[args.command](args, workspace, workspaces, data_manager)
+        return True, f"{message} ({time.perf_counter() - start:.2f}s)"
+    except Exception as e:
+        return False, f"Error: {str(e)}"
+
+
+def import_command(args, workspace, workspaces, data_manager):
+    from ingest_manager import IngestManager
+    ingest = IngestManager(data_manager, chunk_size=args.chunk_size)
+    if args.table == 'tracks':
+        result = ingest.ingest_tracks(args.path)
+    else:
+        result = ingest.ingest_members(args.path)
+    return (f"Imported {result['inserted']} new and updated {result['updated']} {args.table} "
+            f"({result['rejected']} invalid rows skipped)")
+
+
+def refresh_command(args, workspace, workspaces, data_manager):
+    from services import TrackService, MemberService, CuratorService
+    tracks = TrackService(data_manager)
+    messages = [f"Snapshotted {tracks.snapshot_stats()} tracks"]
+
+    if args.spotify:
+        from spotify_auth import SpotifyAuthManager
+        spotify_auth = SpotifyAuthManager()
+        sp_client = spotify_auth.get_spotify_client()
+        tracks.spotify_auth = spotify_auth
+        messages.append(f"fetched audio features for {tracks.refresh_audio_features(sp_client)} tracks")
+        profiled = CuratorService(data_manager, spotify_auth).build_profiles(sp_client)
+        messages.append(f"built {profiled} playlist sound profiles")
+        resolved = MemberService(data_manager, spotify_auth).resolve_profiles()
+        messages.append(f"verified {resolved['members']} member profiles ({resolved['fetched']} fetched)")
+
+    workspaces.write_rollup(workspace, data_manager)
+    return ', '.join(messages)
+
+
+def recompute_command(args, workspace, workspaces, data_manager):
+    from services import MemberService
+    messages = []
+    if args.target in ('compliance', 'all'):
+        if sharded(args):
+            with job_runner(args) as runner:
+                rescored = MemberService(data_manager).recompute_compliance(runner)
+        else:
+            # One process scores the table in place, without the shard pool or its imports
+            rescored = MemberService(data_manager).recompute_compliance()
+        messages.append(f"Rescored {rescored} members")
+    if args.target in ('rollups', 'all'):
+        workspaces.write_rollup(workspace, data_manager)
+        messages.append("refreshed roll-up")
+    return ', '.join(messages)
+
+
+def export_command(args, workspace, workspaces, data_manager):
+    import shutil
+    from export_manager import ExportManager
+    columns = args.columns.split(',') if args.columns else None
+    path = ExportManager(data_manager).get_export(
+        args.table, EXPORT_FORMAT_NAMES[args.format], columns, args.start, args.end
+    )
+    if args.output:
+        output = args.output.replace('{workspace}', workspace)
+        shutil.move(path, output)
+        path = output
+    return f"Wrote {path}"
+
+
+def report_command(args, workspace, workspaces, data_manager):
+    import os
+    from reports import run_nightly
+    with job_runner(args) as runner:
+        paths = run_nightly(runner, data_manager, os.path.join(args.output_dir, workspace))
+    return f"Wrote {len(paths)} reports to {os.path.join(args.output_dir, workspace)}"
+
+
+def alerts_command(args, workspace, workspaces, data_manager):
+    from alerts import AlertEngine, default_sinks
+    # Opening the engine scans for breaches caused by writes made without it
+    engine = AlertEngine(data_manager, default_sinks())
+    engine.check_due()
+    engine.close()
+    return f"{len(engine.unread())} unread alerts"
+
+
+def undo_command(args, workspace, workspaces, data_manager):
+    commit = data_manager.undo()
+    if commit is None:
+        return "Nothing to undo"
+    return f"Reverted commit {commit['commit']} ({commit['op']} of {commit['rows']} {commit['table']} rows)"
+
+
+def query_command(args, workspace, workspaces, data_manager):
+    from query_engine import QueryEngine
+    result = QueryEngine(data_manager).query(args.sql, args.limit)
+    data = result['data']
+    output = data.to_csv(index=False) if args.csv else data.to_string(index=False)
+    note = f" (first {args.limit})" if result['truncated'] else ""
+    return f"{len(data)} rows{note}\n{output}"
+
+
+def sharded(args):
+    """Whether the job's tables are split across --workers (not when workspaces already run in parallel)"""
+    return args.workers > 1 and (args.command == 'report' or not args.all_workspaces)
+
+
+def job_runner(args):
+    """Shard pool for one job; single-process unless the job is sharded"""
+    from parallel import ParallelRunner
+    return ParallelRunner(max_workers=args.workers if sharded(args) else 1)
+
+
+COMMANDS = {
+    'import': import_command,
+    'refresh': refresh_command,
+    'recompute': recompute_command,
+    'export': export_command,
+    'report': report_command,
+    'alerts': alerts_command,
+    'query': query_command,
+    'undo': undo_command
+}
+
+
+def run_bench(args):
+    """Time ingest, history, cohorts, export and dedupe on generated data in a scratch directory"""
+    import tempfile
+    import bench
+    with tempfile.TemporaryDirectory() as data_dir:
+        for name, seconds, detail in bench.run_all(data_dir, args.rows):
+            print(f"{name:<28} {seconds:8.3f}s  {detail}")
+    return 0
+
+
+def run_server(args):
+    """Serve the JSON API until interrupted; each workspace reloads when its tables are rewritten"""
+    import api
+    from workspace_manager import WorkspaceManager
+    print(f"Serving http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        api.serve(WorkspaceManager(args.data_dir), args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
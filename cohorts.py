@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+# Days after release at which cumulative streams are compared
+MILESTONE_DAYS = (7, 28, 90)
+
+class CohortEngine:
+    """Streams at fixed days after release per track, grouped into release-week cohorts"""
+
+    def __init__(self, data_manager, milestones=MILESTONE_DAYS):
+        self.data_manager = data_manager
+        self.milestones = tuple(milestones)
+        self.columns = [f'day_{days}' for days in self.milestones]
+
+        # Per-track milestone values and per-week aggregates, updated in place as history arrives
+        self._tracks = None
+        self._cohorts = None
+        self._release_dates = None
+        self._version = None
+        # recorded_at of the newest history row already folded in
+        self._seen_at = None
+        self._rewrites = 0
+
+    def get_track_milestones(self):
+        """One row per track: release_date, release_week and streams at each milestone (NaN until reached)"""
+        self._sync()
+        return self._tracks
+
+    def get_cohorts(self):
+        """One row per release week: track count and average streams at each milestone"""
+        self._sync()
+        return self._cohorts
+
+    def _sync(self):
+        """Fold in history recorded since the last call, recomputing only the affected tracks and weeks"""
+        if self._version == self.data_manager.version:
+            return
+
+        if self._rewrites != self.data_manager.history_rewrites:
+            # Snapshots were removed or rewritten in place (undo), which recorded_at can't reveal
+            self._tracks = self._cohorts = self._seen_at = None
+            self._rewrites = self.data_manager.history_rewrites
+
+        with self.data_manager._lock:
+            version = self.data_manager.version
+            tracks = self.data_manager.tracks_df[['track_id', 'release_date']]
+            history = self.data_manager.history_df[['track_id', 'date', 'streams', 'recorded_at']]
+
+        releases = pd.Series(pd.to_datetime(tracks['release_date'], errors='coerce').to_numpy(),
+                             index=tracks['track_id'].to_numpy())
+        releases = releases[~releases.index.duplicated(keep='last')]
+        recorded_at = pd.to_numeric(history['recorded_at'], errors='coerce')
+
+        if self._tracks is None:
+            changed = releases.index
+        else:
+            # Tracks with new snapshots, plus tracks added, removed or re-dated since the last sync
+            fresh = recorded_at >= self._seen_at if self._seen_at is not None else recorded_at.notna()
+            previous = self._release_dates.reindex(releases.index)
+            moved = releases.index[~((previous == releases) | (previous.isna() & releases.isna()))]
+            removed = self._release_dates.index.difference(releases.index)
+            changed = pd.Index(history.loc[fresh, 'track_id'].unique()).union(moved).union(removed)
+
+        if len(changed):
+            affected = history[history['track_id'].isin(changed)]
+            values = self._milestone_values(releases[releases.index.isin(changed)], affected)
+            if self._tracks is None:
+                stale_weeks = pd.Index([])
+                kept = values.iloc[0:0]
+            else:
+                stale_weeks = pd.Index(self._tracks.loc[self._tracks.index.isin(changed), 'release_week'].dropna())
+                kept = self._tracks[~self._tracks.index.isin(changed)]
+            self._tracks = pd.concat([kept, values]) if len(kept) else values
+            self._update_cohorts(stale_weeks.union(pd.Index(values['release_week'].dropna())))
+
+        self._release_dates = releases
+        if recorded_at.notna().any():
+            self._seen_at = recorded_at.max()
+        self._version = version
+
+    def _milestone_values(self, releases, history):
+        """Cumulative streams at each milestone, interpolated between the snapshots around it"""
+        result = pd.DataFrame({'release_date': releases}, index=releases.index)
+        result.index.name = 'track_id'
+        result['release_week'] = result['release_date'].dt.to_period('W').dt.start_time
+        for col in self.columns:
+            result[col] = np.nan
+
+        snapshots = pd.DataFrame({
+            'track_id': history['track_id'],
+            'date': pd.to_datetime(history['date'], errors='coerce'),
+            'streams': pd.to_numeric(history['streams'], errors='coerce')
+        }).dropna()
+        snapshots['age'] = (snapshots['date'] - snapshots['track_id'].map(releases)).dt.days.astype(float)
+        snapshots = snapshots.dropna(subset=['age']).sort_values('age')
+        if snapshots.empty:
+            return result
+
+        # Every (track, milestone) pair looked up in one backward and one forward as-of join
+        targets = pd.DataFrame({
+            'track_id': np.repeat(snapshots['track_id'].unique(), len(self.milestones)),
+            'milestone': np.tile(self.milestones, snapshots['track_id'].nunique())
+        })
+        targets['age'] = targets['milestone'].astype(float)
+        targets = targets.sort_values('age', ignore_index=True)
+        points = snapshots[['track_id', 'age', 'streams']].assign(point_age=snapshots['age'])
+        before = pd.merge_asof(targets, points, on='age', by='track_id', direction='backward')
+        after = pd.merge_asof(targets, points, on='age', by='track_id', direction='forward')
+
+        span = (after['point_age'] - before['point_age']).to_numpy()
+        weight = np.divide(targets['age'].to_numpy() - before['point_age'].to_numpy(), span,
+                           out=np.zeros(len(span)), where=span > 0)
+        targets['streams'] = before['streams'] + (after['streams'] - before['streams']) * weight
+
+        values = targets.pivot(index='track_id', columns='milestone', values='streams')
+        values.columns = [f'day_{days}' for days in values.columns]
+        result.update(values)
+        return result
+
+    def _update_cohorts(self, weeks):
+        """Recompute the aggregates of the given release weeks only"""
+        members = self._tracks[self._tracks['release_week'].isin(weeks)]
+        grouped = members.groupby('release_week')
+        updated = grouped[self.columns].mean()
+        updated.insert(0, 'tracks', grouped.size())
+
+        if self._cohorts is None:
+            self._cohorts = updated.sort_index()
+        else:
+            self._cohorts = pd.concat([self._cohorts.drop(weeks, errors='ignore'), updated]).sort_index()
@@ -0,0 +1,224 @@
+import re
+import numpy as np
+import pandas as pd
+from utils import parse_spotify_ref, extract_spotify_ids, validate_email, validate_emails
+
+# Words that don't distinguish one playlist name from another
+NAME_STOPWORDS = {'the', 'playlist', 'playlists', 'official', 'by', 'a', 'and', 'of'}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+
+def email_key(email):
+    """Normalized email used for duplicate checks; placeholders like 'n/a' aren't keys"""
+    if not isinstance(email, str) or not validate_email(email.strip()):
+        return None
+    return email.strip().lower()
+
+def email_keys(emails):
+    """Vectorized email_key over a Series"""
+    keys = emails.astype('string').str.strip().str.lower()
+    return keys.where(validate_emails(keys))
+
+def playlist_key(playlist_url):
+    """Spotify playlist ID used for duplicate checks"""
+    return parse_spotify_ref(playlist_url, kinds=('playlist',), allow_bare=False)[1]
+
+def playlist_keys(playlist_urls):
+    """Vectorized playlist_key over a Series"""
+    return extract_spotify_ids(playlist_urls, kinds=('playlist',), allow_bare=False)
+
+def normalize_name(name):
+    """Lowercase a curator name and drop punctuation and filler words"""
+    if not isinstance(name, str):
+        return ''
+    words = _NON_ALNUM.sub(' ', name.lower()).split()
+    return ' '.join(w for w in words if w not in NAME_STOPWORDS)
+
+
+class CuratorKeyIndex:
+    """Hash indexes from playlist ID and email to curator_id"""
+
+    def __init__(self, curators_df=None):
+        self.by_playlist = {}
+        self.by_email = {}
+        if curators_df is not None:
+            # Keys for the whole table in one vectorized pass each; reversed so the first curator with a key wins
+            ids = curators_df['curator_id'].to_numpy()
+            for index, keys in ((self.by_playlist, playlist_keys(curators_df['playlist_url'])),
+                                (self.by_email, email_keys(curators_df['email']))):
+                keys = keys.fillna('').to_numpy(dtype=object)
+                present = keys != ''
+                index.update(zip(keys[present][::-1], ids[present][::-1]))
+
+    def add(self, curator_id, email, playlist_url):
+        key = playlist_key(playlist_url)
+        if key:
+            self.by_playlist.setdefault(key, curator_id)
+        key = email_key(email)
+        if key:
+            self.by_email.setdefault(key, curator_id)
+
+    def find(self, email=None, playlist_url=None):
+        """Return the curator_id already using this playlist or email, if any"""
+        key = playlist_key(playlist_url)
+        if key and key in self.by_playlist:
+            return self.by_playlist[key]
+        key = email_key(email)
+        if key and key in self.by_email:
+            return self.by_email[key]
+        return None
+
+
+def find_duplicates(curators_df, threshold=0.8, max_block_size=100):
+    """Group curators sharing a playlist or email, or with near-identical names
+
+    key_group links rows sharing a playlist or email; match is 'key' when the whole cluster is
+    linked that way and 'name' when name similarity joined any part of it.
+    """
+    columns = ['cluster', 'match', 'key_group', 'curator_id', 'name', 'email', 'playlist_url', 'followers']
+    if len(curators_df) < 2:
+        return pd.DataFrame(columns=columns)
+
+    curators = curators_df.reset_index(drop=True)
+    n = len(curators)
+    parent = np.arange(n)
+
+    # Exact matches on normalized keys
+    for keys in (playlist_keys(curators['playlist_url']), email_keys(curators['email'])):
+        _union_keys(parent, keys)
+    key_roots = np.array([_find(parent, i) for i in range(n)])
+
+    # Names only suggest a match: the same name, or near-identical through a trigram inverted index
+    _union_keys(parent, curators['name'].map(normalize_name))
+    pairs = _similar_name_pairs(curators['name'], threshold, max_block_size)
+    _union_pairs(parent, pairs[:, 0], pairs[:, 1])
+
+    roots = np.array([_find(parent, i) for i in range(n)])
+    sizes = np.bincount(roots, minlength=n)
+    duplicated = sizes[roots] > 1
+    if not duplicated.any():
+        return pd.DataFrame(columns=columns)
+
+    result = curators.loc[duplicated, columns[3:]].copy()
+    result.insert(0, 'key_group', pd.factorize(key_roots[duplicated])[0])
+    result.insert(0, 'cluster', pd.factorize(roots[duplicated])[0])
+    key_linked = result.groupby('cluster')['key_group'].transform('nunique') == 1
+    result.insert(1, 'match', np.where(key_linked, 'key', 'name'))
+    return result.sort_values(['cluster', 'followers'], ascending=[True, False]).reset_index(drop=True)
+
+
+def _union_keys(parent, keys):
+    """Union every row with the first row sharing its (non-empty) key"""
+    keyed = pd.DataFrame({'key': keys, 'row': np.arange(len(parent))}).dropna()
+    keyed = keyed[keyed['key'] != '']
+    first = keyed.groupby('key')['row'].transform('first')
+    _union_pairs(parent, first.to_numpy(), keyed['row'].to_numpy())
+
+
+def _similar_name_pairs(names, threshold, max_block_size, bands=8, rows_per_band=4, seed=0):
+    """Row pairs whose name trigram sets have Jaccard similarity >= threshold"""
+    gram_sets = [set(_trigrams(normalize_name(name))) for name in names]
+    sizes = np.array([len(grams) for grams in gram_sets])
+    exploded = pd.Series(gram_sets).explode().dropna()
+    if exploded.empty:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # MinHash signatures: per row, the minimum of each random hash over its trigram ids
+    gram_ids = pd.factorize(exploded)[0].astype(np.uint64)
+    row_starts = np.flatnonzero(np.r_[True, np.diff(exploded.index.to_numpy()) != 0])
+    rows = exploded.index.to_numpy()[row_starts]
+    rng = np.random.default_rng(seed)
+    prime = np.uint64((1 << 61) - 1)
+    num_hashes = bands * rows_per_band
+    a = rng.integers(1, 1 << 31, num_hashes, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, num_hashes, dtype=np.uint64)
+    signatures = np.empty((len(rows), num_hashes), dtype=np.uint64)
+    for h in range(num_hashes):
+        signatures[:, h] = np.minimum.reduceat((a[h] * gram_ids + b[h]) % prime, row_starts)
+
+    # LSH blocking: rows whose signatures agree on a whole band land in the same bucket
+    blocks = []
+    for band in range(bands):
+        band_values = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        keys = pd.util.hash_pandas_object(pd.DataFrame(band_values), index=False).to_numpy()
+        blocks.append(pd.DataFrame({'key': keys, 'band': band, 'row': np.arange(len(rows))}))
+    blocks = pd.concat(blocks, ignore_index=True)
+    block_size = blocks.groupby(['band', 'key'])['row'].transform('size')
+    # Oversized buckets come from very generic names and are skipped to bound the work;
+    # exact name matches are still caught by the normalized-name key above
+    blocks = blocks[(block_size > 1) & (block_size <= max_block_size)]
+    if blocks.empty:
+        return np.empty((0, 2), dtype=np.int64)
+
+    candidates = blocks.merge(blocks, on=['band', 'key'], suffixes=('_a', '_b'))
+    candidates = candidates.loc[candidates['row_a'] < candidates['row_b'], ['row_a', 'row_b']]
+    candidates = candidates.drop_duplicates().to_numpy(dtype=np.int64)
+
+    # Cheap vectorized filters: estimated Jaccard from signatures, then set-size bounds
+    estimate = (signatures[candidates[:, 0]] == signatures[candidates[:, 1]]).mean(axis=1)
+    candidates = candidates[estimate >= threshold - 0.1]
+    candidates = rows[candidates]
+    size_a, size_b = sizes[candidates[:, 0]], sizes[candidates[:, 1]]
+    candidates = candidates[np.minimum(size_a, size_b) >= threshold * np.maximum(size_a, size_b)]
+
+    # Exact Jaccard on the few survivors
+    keep = [
+        len(gram_sets[a] & gram_sets[b]) >= threshold * len(gram_sets[a] | gram_sets[b])
+        for a, b in candidates
+    ]
+    return candidates[np.array(keep, dtype=bool)] if len(candidates) else candidates
+
+
+def _trigrams(name):
+    padded = f' {name} '
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)}) if name else []
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union_pairs(parent, left, right):
+    for a, b in zip(left, right):
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def merge_duplicates(data_manager, duplicates, confirmed=()):
+    """Merge curators sharing a playlist or email, plus the name-matched clusters in confirmed
+
+    The curator with the most followers in each group is kept, its missing email and playlist
+    are filled from the others, and the rest are deleted. Returns the number removed.
+    """
+    confirmed = set(confirmed)
+    # Name similarity alone is never enough: unconfirmed clusters only merge within their key groups
+    groups = np.where(duplicates['cluster'].isin(confirmed),
+                      'c' + duplicates['cluster'].astype(str),
+                      'k' + duplicates['cluster'].astype(str) + '_' + duplicates['key_group'].astype(str))
+    updates, removed = [], []
+    for _, group in duplicates.groupby(groups, sort=False):
+        if len(group) < 2:
+            continue
+        survivor = group.iloc[0]
+        others = group.iloc[1:]
+
+        update_data = {}
+        for col in ('email', 'playlist_url'):
+            if not isinstance(survivor[col], str) or not survivor[col]:
+                values = others[col].dropna()
+                values = values[values != '']
+                if not values.empty:
+                    update_data[col] = values.iloc[0]
+        if update_data:
+            updates.append({'curator_id': survivor['curator_id'], **update_data})
+        removed.extend(others['curator_id'])
+
+    if updates:
+        data_manager.update_curators(pd.DataFrame(updates), save=False)
+    if removed:
+        data_manager.delete_curators(removed)
+    return len(removed)
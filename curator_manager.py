@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from utils import generate_id, validate_email, validate_spotify_url, format_number
+from utils import format_number
+from services import CuratorService, CURATOR_STATUSES
+from outreach import OutreachScheduler
 
 class CuratorManager:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, spotify_auth=None):
         self.data_manager = data_manager
+        self.spotify_auth = spotify_auth
+        self.service = CuratorService(data_manager, spotify_auth)
+        self.scheduler = OutreachScheduler(data_manager)
     
     def render_curator_form(self):
         """Render form for adding new curator"""
@@ -25,31 +30,12 @@ class CuratorManager:
             submitted = st.form_submit_button("Add Curator")
             
             if submitted:
-                if not name:
-                    st.error("Please enter a curator name")
-                    return
-                
-                if email and not validate_email(email):
-                    st.error("Please enter a valid email address")
-                    return
-                
-                if playlist_url and not validate_spotify_url(playlist_url):
-                    st.error("Please enter a valid Spotify playlist URL")
-                    return
-                
-                curator_data = {
-                    'curator_id': generate_id('curator_'),
-                    'name': name,
-                    'email': email,
-                    'playlist_url': playlist_url,
-                    'followers': followers,
-                    'submission_status': 'Not Submitted',
-                    'last_contacted': None,
-                    'notes': notes
-                }
-                
-                self.data_manager.add_curator(curator_data)
-                st.success("Curator added successfully!")
+                try:
+                    # Validates the fields and rejects playlists or emails already in the database
+                    self.service.add_curator(name, email, playlist_url, followers, notes)
+                    st.success("Curator added successfully!")
+                except ValueError as e:
+                    st.error(str(e))
     
     def render_curator_list(self):
         """Render list of curators with status"""
@@ -72,7 +58,7 @@ class CuratorManager:
         with col2:
             status_filter = st.multiselect(
                 "Filter by Status",
-                ["Not Submitted", "Submitted", "Accepted", "Rejected", "No Response"],
+                CURATOR_STATUSES,
                 default=[]
             )
         
@@ -90,77 +76,170 @@ class CuratorManager:
         curators = curators.sort_values(by=sort_by, ascending=False)
         
         # Display curators in an expandable format
-        for _, curator in curators.iterrows():
-            with st.expander(f"{curator['name']} ({format_number(curator['followers'])} followers)"):
+        # Each row is a fragment, so submitting its form only reruns that row
+        for curator_id in curators['curator_id']:
+            self._render_curator_row(curator_id)
+    
+    @st.fragment
+    def _render_curator_row(self, curator_id):
+        """Render a single curator with its update form"""
+        curators = self.data_manager.get_curator_stats(curator_id)
+        if curators.empty:
+            return
+        curator = curators.iloc[0]
+        
+        with st.expander(f"{curator['name']} ({format_number(curator['followers'])} followers)"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("**Contact:**", curator['email'] if curator['email'] else "N/A")
+                st.write("**Playlist:**", f"[Link]({curator['playlist_url']})" if curator['playlist_url'] else "N/A")
+            
+            with col2:
+                st.write("**Status:**", curator['submission_status'])
+                st.write("**Last Contacted:**", curator['last_contacted'] if curator['last_contacted'] else "Never")
+            
+            if curator['notes']:
+                st.write("**Notes:**", curator['notes'])
+            
+            # Update form
+            with st.form(f"update_curator_{curator['curator_id']}"):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.write("**Contact:**", curator['email'] if curator['email'] else "N/A")
-                    st.write("**Playlist:**", f"[Link]({curator['playlist_url']})" if curator['playlist_url'] else "N/A")
+                    new_status = st.selectbox(
+                        "Update Status",
+                        CURATOR_STATUSES,
+                        index=CURATOR_STATUSES.index(curator['submission_status'])
+                    )
+                    
+                    new_followers = st.number_input(
+                        "Update Follower Count",
+                        min_value=0,
+                        value=int(curator['followers'])
+                    )
                 
                 with col2:
-                    st.write("**Status:**", curator['submission_status'])
-                    st.write("**Last Contacted:**", curator['last_contacted'] if curator['last_contacted'] else "Never")
-                
-                if curator['notes']:
-                    st.write("**Notes:**", curator['notes'])
+                    mark_contacted = st.checkbox("Mark as Contacted Today")
+                    new_notes = st.text_area("Update Notes", curator['notes'] if curator['notes'] else "")
                 
-                # Update form
-                with st.form(f"update_curator_{curator['curator_id']}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        new_status = st.selectbox(
-                            "Update Status",
-                            ["Not Submitted", "Submitted", "Accepted", "Rejected", "No Response"],
-                            index=["Not Submitted", "Submitted", "Accepted", "Rejected", "No Response"].index(curator['submission_status'])
-                        )
-                        
-                        new_followers = st.number_input(
-                            "Update Follower Count",
-                            min_value=0,
-                            value=int(curator['followers'])
-                        )
-                    
-                    with col2:
-                        mark_contacted = st.checkbox("Mark as Contacted Today")
-                        new_notes = st.text_area("Update Notes", curator['notes'] if curator['notes'] else "")
-                    
-                    if st.form_submit_button("Update Curator"):
-                        update_data = {
-                            'submission_status': new_status,
-                            'followers': new_followers,
-                            'notes': new_notes
-                        }
-                        
-                        if mark_contacted:
-                            update_data['last_contacted'] = datetime.now().strftime('%Y-%m-%d')
-                        
-                        self.data_manager.update_curator(curator['curator_id'], update_data)
-                        st.success("Curator updated successfully!")
-                        st.rerun()
+                if st.form_submit_button("Update Curator"):
+                    self.service.update_curator(curator['curator_id'], new_status, new_followers,
+                                                new_notes, mark_contacted)
+                    st.success("Curator updated successfully!")
+                    # Status and contact dates also drive the list filters, follow-ups and outreach queue
+                    st.rerun()
+    
+    def render_outreach_queue(self):
+        """Render ranked curator suggestions for a track"""
+        tracks = self.data_manager.get_track_stats()
+        
+        if tracks.empty or self.data_manager.curators_df.empty:
+            st.info("Add tracks and curators to build an outreach queue.")
+            return
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            names = dict(zip(tracks['track_id'], tracks['name']))
+            track_id = st.selectbox("Track to pitch", list(names), format_func=lambda i: names[i])
+        
+        with col2:
+            top_n = st.number_input("Curators to show", min_value=1, max_value=200, value=20)
+        
+        if self.spotify_auth and st.button("Refresh Playlist Sound Profiles"):
+            try:
+                profiled = self.service.build_profiles()
+                st.success(f"Built sound profiles for {profiled} playlists")
+            except Exception as e:
+                st.error(f"Error building profiles: {str(e)}")
+        
+        queue = self.service.rank([track_id], k=int(top_n))
+        st.dataframe(
+            queue[['rank', 'name', 'score', 'has_sound_profile']],
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    def render_follow_ups(self):
+        """Render today's follow-up list with contact and snooze actions"""
+        due = self.scheduler.due_today()
+        st.caption(f"{self.scheduler.remaining_today()} of {self.scheduler.max_per_day} contacts left today")
+        
+        if not due:
+            st.success("No follow-ups due today")
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        for curator_id, due_date in due:
+            curators = self.data_manager.get_curator_stats(curator_id)
+            if curators.empty:
+                continue
+            curator = curators.iloc[0]
+            
+            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+            with col1:
+                st.write(f"**{curator['name']}** ({curator['submission_status']})")
+            with col2:
+                st.write(f"Due {due_date}" + (" (overdue)" if due_date < today else ""))
+            with col3:
+                if st.button("Contacted", key=f"follow_up_contacted_{curator_id}"):
+                    self.service.update_curator(curator_id, curator['submission_status'], curator['followers'],
+                                                curator['notes'], mark_contacted=True)
+                    st.rerun()
+            with col4:
+                if st.button("Snooze 3d", key=f"follow_up_snooze_{curator_id}"):
+                    self.scheduler.snooze(curator_id, 3)
+                    st.rerun()
+        
+        with st.form("follow_up_settings_form"):
+            st.write("**Follow-up Settings**")
+            max_per_day = st.number_input("Max contacts per day", min_value=1,
+                                          value=int(self.scheduler.max_per_day))
+            intervals = {}
+            cols = st.columns(len(CURATOR_STATUSES))
+            for col, status in zip(cols, CURATOR_STATUSES):
+                with col:
+                    days = self.scheduler.intervals.get(status)
+                    # 0 turns follow-ups off for a status
+                    intervals[status] = st.number_input(f"{status} (days)", min_value=0,
+                                                        value=int(days) if days is not None else 0)
+            if st.form_submit_button("Save Settings"):
+                self.scheduler.configure(max_per_day, {s: (d or None) for s, d in intervals.items()})
+                st.rerun()
+    
+    def render_dedupe_section(self):
+        """Render batch duplicate detection and merge"""
+        threshold = st.slider("Name similarity threshold", 0.5, 1.0, 0.8, 0.05)
+        # Results are only valid for the data they were computed from
+        data_key = (str(self.data_manager.data_dir), self.data_manager.version)
+        
+        if st.button("Find Duplicates"):
+            st.session_state.curator_duplicates = (data_key, self.service.find_duplicates(threshold))
+        
+        found = st.session_state.get('curator_duplicates')
+        if found is None or found[0] != data_key:
+            st.session_state.curator_duplicates = None
+            return
+        duplicates = found[1]
+        
+        if duplicates.empty:
+            st.success("No duplicate curators found")
+            return
+        
+        key_groups = duplicates.groupby(['cluster', 'key_group'])['curator_id'].transform('size')
+        name_clusters = sorted(duplicates.loc[duplicates['match'] == 'name', 'cluster'].unique())
+        st.write(f"Found {duplicates['cluster'].nunique()} groups of likely duplicates. "
+                 f"{int((key_groups > 1).sum())} curators share a playlist or email and merge automatically; "
+                 f"{len(name_clusters)} groups match only by name and merge once confirmed. "
+                 "The curator with the most followers in each group is kept.")
+        st.dataframe(duplicates, hide_index=True, use_container_width=True)
+        
+        confirmed = st.multiselect("Confirm name-matched groups to merge", name_clusters)
+        if st.button("Merge Duplicates"):
+            removed = self.service.merge_duplicates(duplicates, confirmed)
+            st.session_state.curator_duplicates = None
+            st.success(f"Removed {removed} duplicate curators")
     
     def get_curator_summary(self):
         """Get summary of curator outreach"""
-        curators = self.data_manager.get_curator_stats()
-        
-        if curators.empty:
-            return {
-                'total_curators': 0,
-                'total_followers': 0,
-                'submission_stats': {
-                    'Not Submitted': 0,
-                    'Submitted': 0,
-                    'Accepted': 0,
-                    'Rejected': 0,
-                    'No Response': 0
-                }
-            }
-        
-        submission_stats = curators['submission_status'].value_counts().to_dict()
-        
-        return {
-            'total_curators': len(curators),
-            'total_followers': curators['followers'].sum(),
-            'submission_stats': submission_stats
-        }
\ No newline at end of file
+        return self.service.get_summary()
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from audio_features import AudioFeatureStore, FEATURE_COLUMNS, top_k
+from utils import extract_spotify_id
+
+# Likelihood of a good outcome implied by a curator's latest submission status
+STATUS_SCORES = {
+    'Accepted': 1.0,
+    'Submitted': 0.5,
+    'Not Submitted': 0.5,
+    'No Response': 0.2,
+    'Rejected': 0.0
+}
+
+DEFAULT_WEIGHTS = {
+    'sound': 0.4,
+    'reach': 0.25,
+    'history': 0.2,
+    'recency': 0.15
+}
+
+class CuratorMatcher:
+    def __init__(self, data_manager, weights=None, cooldown_days=30, block_tracks=1024, block_curators=8192):
+        self.data_manager = data_manager
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        # Curators contacted within this many days are ranked down, not excluded
+        self.cooldown_days = cooldown_days
+        self.block_tracks = block_tracks
+        self.block_curators = block_curators
+        self.track_features = AudioFeatureStore(data_manager.data_dir)
+        self.curator_profiles = AudioFeatureStore(data_manager.data_dir, 'curator_profiles.npz')
+        # Kept apart from the catalog's features, which the track similarity index is built from
+        self.playlist_track_features = AudioFeatureStore(data_manager.data_dir, 'playlist_track_features.npz')
+
+    def build_profiles(self, spotify_auth, sp_client=None):
+        """Store each curator's playlist sound as the mean audio features of its tracks"""
+        curators = self.data_manager.curators_df.dropna(subset=['playlist_url'])
+        if not sp_client:
+            sp_client = spotify_auth.get_spotify_client()
+
+        ids, profiles = [], []
+        for curator_id, playlist_url in zip(curators['curator_id'], curators['playlist_url']):
+            playlist_id = extract_spotify_id(playlist_url)
+            if not playlist_id:
+                continue
+            track_ids = spotify_auth.get_playlist_track_ids(playlist_id, sp_client)
+            self.playlist_track_features.fetch_missing(spotify_auth, track_ids, sp_client)
+            _, matrix = self.playlist_track_features.get(track_ids)
+            if len(matrix):
+                ids.append(curator_id)
+                profiles.append(matrix.mean(axis=0))
+
+        if ids:
+            self.curator_profiles.upsert(ids, np.vstack(profiles))
+            self.curator_profiles.save()
+        return len(ids)
+
+    def rank(self, track_ids=None, k=20, exclude_statuses=('Rejected',)):
+        """Ranked outreach queue: the top k curators for each track, best first"""
+        tracks = self.data_manager.tracks_df
+        if track_ids is not None:
+            tracks = tracks[tracks['track_id'].isin(track_ids)]
+
+        # Blocking: curators that can't be pitched never enter the score matrix
+        curators = self.data_manager.curators_df
+        curators = curators[~curators['submission_status'].isin(exclude_statuses)]
+        if tracks.empty or curators.empty:
+            return pd.DataFrame(columns=['track_id', 'rank', 'curator_id', 'name', 'score'])
+
+        self.track_features.refresh()
+        self.curator_profiles.refresh()
+        static = self._static_scores(curators)
+        track_vectors, track_mask = self._vectors(self.track_features, tracks['spotify_id'])
+        curator_vectors, curator_mask = self._vectors(self.curator_profiles, curators['curator_id'])
+
+        # Only curators with a profile can earn the sound component
+        curator_vectors *= self.weights['sound'] * curator_mask[:, None]
+        k = min(k, len(curators))
+
+        top_positions = np.empty((len(tracks), k), dtype=np.int64)
+        top_scores = np.empty((len(tracks), k), dtype=np.float32)
+        for t_start in range(0, len(tracks), self.block_tracks):
+            t_end = t_start + self.block_tracks
+            positions, scores = self._rank_block(track_vectors[t_start:t_end], static, curator_vectors, k)
+            top_positions[t_start:t_end] = positions
+            top_scores[t_start:t_end] = scores
+
+        result = pd.DataFrame({
+            'track_id': np.repeat(tracks['track_id'].to_numpy(), k),
+            'rank': np.tile(np.arange(1, k + 1), len(tracks)),
+            'curator_id': curators['curator_id'].to_numpy()[top_positions.ravel()],
+            'name': curators['name'].to_numpy()[top_positions.ravel()],
+            'score': top_scores.ravel()
+        })
+        result['has_sound_profile'] = np.repeat(track_mask, k) & curator_mask[top_positions.ravel()]
+        return result
+
+    def _rank_block(self, track_vectors, static, curator_vectors, k):
+        """Top k curators for a block of tracks, merging one curator block at a time"""
+        best_positions = np.empty((len(track_vectors), 0), dtype=np.int64)
+        best_scores = np.empty((len(track_vectors), 0), dtype=np.float32)
+
+        for c_start in range(0, len(static), self.block_curators):
+            c_end = c_start + self.block_curators
+            scores = track_vectors @ curator_vectors[c_start:c_end].T + static[None, c_start:c_end]
+
+            candidates = np.hstack([best_scores, scores])
+            positions = np.hstack([best_positions, np.broadcast_to(
+                np.arange(c_start, min(c_end, len(static))), scores.shape)])
+            top = top_k(candidates, min(k, candidates.shape[1]))
+            best_scores = np.take_along_axis(candidates, top, axis=1)
+            best_positions = np.take_along_axis(positions, top, axis=1)
+
+        return best_positions, best_scores
+
+    def _static_scores(self, curators):
+        """Per-curator part of the score that doesn't depend on the track"""
+        followers = pd.to_numeric(curators['followers'], errors='coerce').fillna(0).clip(lower=0)
+        reach = np.log1p(followers.to_numpy(dtype=float))
+        reach = reach / reach.max() if reach.max() > 0 else reach
+
+        history = curators['submission_status'].map(STATUS_SCORES).fillna(0.5).to_numpy()
+
+        contacted = pd.to_datetime(curators['last_contacted'], errors='coerce')
+        days_since = (pd.Timestamp(datetime.now()) - contacted).dt.days.to_numpy(dtype=float)
+        recency = np.where(np.isnan(days_since), 1.0, np.clip(days_since / self.cooldown_days, 0, 1))
+
+        return (self.weights['reach'] * reach +
+                self.weights['history'] * history +
+                self.weights['recency'] * recency).astype(np.float32)
+
+    def _vectors(self, store, ids):
+        """Standardized, unit-length feature rows aligned to ids; zero rows where missing"""
+        vectors = np.zeros((len(ids), len(FEATURE_COLUMNS)), dtype=np.float32)
+        mask = np.zeros(len(ids), dtype=bool)
+        if len(self.track_features) == 0 or len(store) == 0:
+            return vectors, mask
+
+        positions = pd.Series(range(len(store.ids)), index=store.ids)
+        positions = positions[~positions.index.duplicated()].reindex(pd.Index(ids))
+        mask = positions.notna().to_numpy()
+        rows = store.matrix[positions[mask].astype(int).to_numpy()]
+
+        # Standardize with catalog statistics so tracks and playlist profiles share one space
+        mean = self.track_features.matrix.mean(axis=0)
+        std = self.track_features.matrix.std(axis=0)
+        std[std == 0] = 1.0
+        rows = (rows - mean) / std
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors[mask] = rows / norms
+        return vectors, mask
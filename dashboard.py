@@ -1,13 +1,23 @@
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from utils import format_number, format_percentage, get_growth_indicator
+from export_manager import ExportManager, EXPORT_FORMATS, DATE_COLUMNS
+from metrics import safe_ratio
+from activity import WINDOW_DAYS, COMPLIANCE_WINDOW_DAYS
+from datetime import datetime
+
+# st.download_button holds the whole file in server memory, so larger exports are left on disk
+MAX_DOWNLOAD_BYTES = 100 * 1024 * 1024
 
 class Dashboard:
     def __init__(self, data_manager, analytics_manager):
         self.data_manager = data_manager
         self.analytics = analytics_manager
+        self.exporter = ExportManager(data_manager)
     
+    @st.fragment
     def render_overview_metrics(self):
         """Render overview metrics section"""
         metrics = self.analytics.calculate_growth_metrics()
@@ -50,6 +60,7 @@ class Dashboard:
                 delta_color="normal"
             )
     
+    @st.fragment
     def render_performance_charts(self):
         """Render performance visualization section"""
         # Stream trend chart
@@ -70,19 +81,42 @@ class Dashboard:
             if playlist_impact:
                 st.plotly_chart(playlist_impact, use_container_width=True)
     
+    @st.fragment
+    def render_cohort_analysis(self):
+        """Render release-week cohort section"""
+        cohort_chart = self.analytics.generate_cohort_chart()
+        if not cohort_chart:
+            st.info("Cohorts appear once tracks have stats snapshots after their release date.")
+            return
+        
+        st.plotly_chart(cohort_chart, use_container_width=True)
+        
+        with st.expander("Cohort Table"):
+            cohorts = self.analytics.cohorts.get_cohorts()
+            st.dataframe(
+                cohorts.sort_index(ascending=False).round(0),
+                use_container_width=True
+            )
+    
+    @st.fragment
     def render_member_performance(self):
         """Render member performance section"""
-        member_chart = self.analytics.generate_member_performance()
+        days = st.radio("Activity window", WINDOW_DAYS, index=WINDOW_DAYS.index(COMPLIANCE_WINDOW_DAYS),
+                        format_func=lambda d: f"{d} days", horizontal=True, key='member-window')
+        member_chart = self.analytics.generate_member_performance(days)
         if member_chart:
             st.plotly_chart(member_chart, use_container_width=True)
     
+    @st.fragment
     def render_curator_stats(self):
         """Render curator statistics section"""
         curator_summary = self.data_manager.curators_df
         
         if not curator_summary.empty:
+            metrics = self.analytics.calculate_curator_metrics()
+            
             # Create pie chart for submission status
-            status_counts = curator_summary['submission_status'].value_counts()
+            status_counts = metrics['status_counts']
             
             fig = go.Figure(data=[go.Pie(
                 labels=status_counts.index,
@@ -98,31 +132,27 @@ class Dashboard:
             st.plotly_chart(fig, use_container_width=True)
             
             # Display curator reach metrics
-            total_followers = curator_summary['followers'].sum()
-            accepted_followers = curator_summary[curator_summary['submission_status'] == 'Accepted']['followers'].sum()
-            
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 st.metric(
                     "Total Curator Reach",
-                    format_number(total_followers)
+                    format_number(metrics['total_followers'])
                 )
             
             with col2:
                 st.metric(
                     "Accepted Playlist Reach",
-                    format_number(accepted_followers)
+                    format_number(metrics['accepted_followers'])
                 )
             
             with col3:
-                acceptance_rate = (len(curator_summary[curator_summary['submission_status'] == 'Accepted']) / 
-                                 len(curator_summary) * 100)
                 st.metric(
                     "Acceptance Rate",
-                    f"{acceptance_rate:.1f}%"
+                    f"{metrics['acceptance_rate']:.1f}%"
                 )
     
+    @st.fragment
     def render_export_section(self):
         """Render data export section"""
         st.subheader("Export Data")
@@ -130,34 +160,167 @@ class Dashboard:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if st.button("Export Track Data"):
-                csv = self.data_manager.tracks_df.to_csv(index=False)
-                st.download_button(
-                    "Download Track Data",
-                    csv,
-                    "track_data.csv",
-                    "text/csv",
-                    key='download-track-csv'
-                )
+            table = st.selectbox(
+                "Table",
+                ["tracks", "members", "curators"],
+                format_func=str.capitalize,
+                key='export-table'
+            )
         
         with col2:
-            if st.button("Export Member Data"):
-                csv = self.data_manager.members_df.to_csv(index=False)
+            fmt = st.selectbox("Format", list(EXPORT_FORMATS), key='export-format')
+        
+        with col3:
+            date_range = st.date_input(
+                f"{DATE_COLUMNS[table].replace('_', ' ').capitalize()} range (optional)",
+                value=[],
+                key=f'export-dates-{table}'
+            )
+        
+        all_columns = list(self.exporter.get_table(table).columns)
+        columns = st.multiselect(
+            "Columns",
+            all_columns,
+            default=all_columns,
+            key=f'export-columns-{table}'
+        )
+        
+        start_date = date_range[0] if len(date_range) > 0 else None
+        end_date = date_range[1] if len(date_range) > 1 else start_date
+        
+        if st.button("Prepare Export"):
+            # Files are written chunk by chunk and reused until the data changes
+            path = self.exporter.get_export(table, fmt, columns, start_date, end_date)
+            extension, mime = EXPORT_FORMATS[fmt]
+            
+            size = path.stat().st_size
+            if size > MAX_DOWNLOAD_BYTES:
+                st.info(f"The export is {size / 1024 / 1024:,.0f} MB, too large to download through the browser. "
+                        f"It was written to `{path.resolve()}`; `python cli.py export {table} --output <file>` "
+                        "writes it from the command line.")
+                return
+            
+            # st.download_button reads the whole file into memory, so only writing the file is chunked
+            with open(path, 'rb') as f:
                 st.download_button(
-                    "Download Member Data",
-                    csv,
-                    "member_data.csv",
-                    "text/csv",
-                    key='download-member-csv'
+                    f"Download {table.capitalize()} Data",
+                    f,
+                    f"{table}_data.{extension}",
+                    mime,
+                    key=f'download-{table}-export'
                 )
+    
+    def render_label_overview(self, workspace_manager):
+        """Render label-wide totals from the per-workspace roll-ups"""
+        rollups = workspace_manager.load_rollups()
+        
+        if rollups.empty:
+            st.info("No workspaces yet.")
+            return
+        
+        total_streams = rollups['streams'].sum()
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Artists", len(rollups))
+        
+        with col2:
+            st.metric("Total Streams", format_number(total_streams))
         
         with col3:
-            if st.button("Export Curator Data"):
-                csv = self.data_manager.curators_df.to_csv(index=False)
-                st.download_button(
-                    "Download Curator Data",
-                    csv,
-                    "curator_data.csv",
-                    "text/csv",
-                    key='download-curator-csv'
-                )
\ No newline at end of file
+            st.metric(
+                "Label Save Rate",
+                f"{safe_ratio(rollups['saves'].sum(), total_streams, 100):.1f}%"
+            )
+        
+        with col4:
+            st.metric("Curators", format_number(rollups['curators'].sum()))
+        
+        fig = px.bar(rollups.sort_values('streams', ascending=False),
+                     x='name',
+                     y='streams',
+                     title='Streams by Artist',
+                     labels={'name': 'Artist', 'streams': 'Total Streams'})
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(
+            rollups.drop(columns=['workspace']).set_index('name'),
+            use_container_width=True
+        )
+    
+    def render_version_history(self):
+        """Render recent commits with undo, and any table as it was at an earlier time"""
+        commits = self.data_manager.versions.commits
+        
+        if not commits:
+            st.info("No changes recorded yet.")
+            return
+        
+        log = pd.DataFrame(commits[-50:][::-1])
+        log['at'] = pd.to_datetime(log['at'], unit='s').dt.tz_localize('UTC').dt.tz_convert(
+            datetime.now().astimezone().tzinfo).dt.strftime('%Y-%m-%d %H:%M:%S')
+        st.dataframe(log[['commit', 'at', 'table', 'op', 'rows']], hide_index=True, use_container_width=True)
+        
+        if st.button("Undo Last Change"):
+            try:
+                commit = self.data_manager.undo()
+                st.success(f"Reverted commit {commit['commit']} ({commit['op']} on {commit['table']})")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error undoing change: {str(e)}")
+        
+        st.subheader("Time Travel")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            table = st.selectbox("Table", ["tracks", "members", "curators", "history"],
+                                 format_func=str.capitalize, key='as-of-table')
+        
+        with col2:
+            day = st.date_input("As of date", key='as-of-date')
+        
+        with col3:
+            moment = st.time_input("As of time", key='as-of-time')
+        
+        snapshot = self.data_manager.as_of(table, at=datetime.combine(day, moment))
+        st.caption(f"{len(snapshot)} rows")
+        st.dataframe(snapshot.head(1000), hide_index=True, use_container_width=True)
+    
+    def render_sql_explorer(self):
+        """Render ad-hoc SQL queries over the workspace tables"""
+        engine = self.analytics.sql
+        
+        with st.expander("Tables"):
+            for table, columns in engine.tables().items():
+                st.write(f"**{table}**: " + ", ".join(f"{name} ({sql_type.lower()})" for name, sql_type in columns))
+        
+        sql = st.text_area(
+            "Query",
+            "SELECT name, streams, save_rate, stream_velocity\nFROM tracks\nORDER BY streams DESC",
+            height=160,
+            key='sql-query'
+        )
+        limit = st.number_input("Row limit", min_value=1, max_value=100_000, value=1000, step=100,
+                                key='sql-limit')
+        
+        if st.button("Run Query"):
+            st.session_state.sql_last_query = sql
+        
+        # The last query stays on screen across reruns; results are cached until the data changes
+        if not st.session_state.get('sql_last_query'):
+            return
+        try:
+            result = engine.query(st.session_state.sql_last_query, int(limit))
+        except Exception as e:
+            st.error(f"Error running query: {str(e)}")
+            return
+        
+        data = result['data']
+        source = "cached" if result['cached'] else f"{result['seconds'] * 1000:.0f} ms"
+        st.caption(f"{len(data)} rows ({source})")
+        if result['truncated']:
+            st.warning(f"Showing the first {len(data)} rows; raise the row limit or aggregate to see more.")
+        st.dataframe(data, hide_index=True, use_container_width=True)
+        st.download_button("Download CSV", data.to_csv(index=False), "query_results.csv", "text/csv",
+                           key='sql-download')
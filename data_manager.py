@@ -1,17 +1,62 @@
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from write_behind import WriteBehindWriter
+from curator_dedupe import CuratorKeyIndex
+from versions import VersionStore, ABSENT_COLUMN
+from activity import ActivityLog, ACTIVITY_COLUMNS
+from history_store import HistoryStore
+from metrics import TRACK_METRIC_COLUMNS, track_metrics, safe_ratio
+
+# Table name -> primary key column
+TABLE_KEYS = {
+    'tracks': 'track_id',
+    'members': 'member_id',
+    'curators': 'curator_id',
+    'history': 'snapshot_id'
+}
+
+# Track counters captured in the daily stats history
+HISTORY_COLUMNS = ['streams', 'saves', 'playlist_adds']
+
 
 class DataManager:
-    def __init__(self, data_dir='data'):
+    def __init__(self, data_dir='data', write_behind=False, flush_interval=2.0, max_pending=100, read_only=False):
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(exist_ok=True)
+        # Read-only instances load only the track, member and curator tables and never write to disk
+        self.read_only = read_only
+        if not read_only:
+            self.data_dir.mkdir(exist_ok=True)
+        
+        # Bumped on every mutation so derived views can be cached per data version
+        self.version = 0
+        self._row_indexes = {}
+        self._sort_indexes = {}
+        self._curator_keys = None
+        self._history_positions = None
+        # Bumped when history rows are removed or rewritten in place (undo), for incremental readers
+        self.history_rewrites = 0
+        # Tables changed since they were last written, and the changed history months
+        self._dirty = set()
+        self._history_store = HistoryStore(self.data_dir)
+        # Callbacks run after every committed mutation, and after changed tables are written
+        self._listeners = []
+        self._save_listeners = []
+        # Held while mutating so the background writer sees consistent tables
+        self._lock = threading.RLock()
         
         # Initialize DataFrames
         self.tracks_df = self._load_or_create_df('tracks.csv', [
-            'track_id', 'name', 'artist', 'release_date', 'streams',
+            'track_id', 'spotify_id', 'name', 'artist', 'release_date', 'streams',
             'saves', 'playlist_adds', 'created_at', 'updated_at'
-        ])
+        ] + TRACK_METRIC_COLUMNS)
+        # Also fills files saved before the derived columns existed, and brings stream velocity
+        # (streams per day since release) up to today
+        self._refresh_track_metrics()
         
         self.members_df = self._load_or_create_df('members.csv', [
             'member_id', 'name', 'spotify_id', 'streams_given',
@@ -24,75 +69,527 @@ class DataManager:
             'submission_status', 'last_contacted', 'created_at', 'updated_at'
         ])
         
+        # One stats snapshot per track and day, keyed "<track_id>:<date>"
+        history_columns = [
+            'snapshot_id', 'track_id', 'date', 'streams', 'saves',
+            'playlist_adds', 'recorded_at'
+        ]
+        self.history_df = pd.DataFrame(columns=history_columns) if read_only else self._history_store.load(history_columns)
+        
+        # Before-images of every commit, for as_of reads and undo (opening the store prunes old ones)
+        self.versions = None if read_only else VersionStore(self.data_dir)
+        # Set while a commit belongs to the same change as the one before it
+        self._joined = False
+        
+        # Member activity events, with 7/30/90-day counts per member
+        self.activity = None if read_only else ActivityLog(self.data_dir)
+        
+        # Optional write-behind mode: mutations are journaled and flushed in the background
+        self._writer = None
+        if write_behind:
+            self._writer = WriteBehindWriter(self, flush_interval, max_pending)
+        
     def _load_or_create_df(self, filename, columns):
         file_path = self.data_dir / filename
         if file_path.exists():
             return pd.read_csv(file_path)
         return pd.DataFrame(columns=columns)
     
+    def _touch(self):
+        """Mark the in-memory data as changed"""
+        self.version += 1
+    
+    def _commit(self, entry, save=True, before=None):
+        """Record a mutation and persist it, synchronously or through the write-behind queue"""
+        if self.read_only:
+            raise RuntimeError(f"Can't change '{entry['table']}': the data was opened read-only")
+        self._touch()
+        if before is not None:
+            # With write-behind, the before-image is written by the background flush
+            self.versions.record(entry['table'], entry['op'], TABLE_KEYS[entry['table']], *before,
+                                 joined=self._joined, deferred=self._writer is not None)
+        self._dirty.add(entry['table'])
+        if self._writer:
+            self._writer.append(entry)
+        # Listeners run before the save, so state they derive from the change is saved with it
+        for listener in self._listeners:
+            listener(entry)
+        if not self._writer and save:
+            self.save_all()
+    
+    def add_listener(self, callback):
+        """Call callback(entry) after each committed mutation"""
+        self._listeners.append(callback)
+    
+    def add_save_listener(self, callback):
+        """Call callback(table names) after changed tables are written, on the writing thread"""
+        self._save_listeners.append(callback)
+    
     def save_all(self):
-        """Save all DataFrames to CSV files"""
-        self.tracks_df.to_csv(self.data_dir / 'tracks.csv', index=False)
-        self.members_df.to_csv(self.data_dir / 'members.csv', index=False)
-        self.curators_df.to_csv(self.data_dir / 'curators.csv', index=False)
+        """Save changed DataFrames to CSV files"""
+        if self._writer:
+            # Tables are written by the background writer; just ask for an early flush
+            self._writer.request_flush()
+            return
+        with self._lock:
+            self.write_tables(self._dirty_tables())
+            self._clear_dirty()
+    
+    def flush(self):
+        """Block until every pending mutation is durably written (call on shutdown)"""
+        if self._writer:
+            self._writer.flush()
+    
+    def close(self):
+        """Flush and stop the background writer before this instance is discarded"""
+        if self._writer:
+            self._writer.close()
+    
+    def snapshot_tables(self):
+        """Copy changed tables so they can be written without holding the lock"""
+        with self._lock:
+            tables = {table: df.copy() for table, df in self._dirty_tables().items()}
+            self._clear_dirty()
+            return tables
+    
+    def mark_dirty(self, tables):
+        """Queue tables for the next write again, e.g. after a failed flush"""
+        with self._lock:
+            self._dirty.update(tables)
+            if 'history' in tables:
+                self._history_store.dirty_months.update(tables['history'].attrs['months'])
+    
+    def _clear_dirty(self):
+        if 'history' in self._dirty:
+            self._history_store.dirty_months.clear()
+        self._dirty.clear()
+    
+    def _dirty_tables(self):
+        """Changed tables to write; only the changed months of the stats history"""
+        tables = {table: getattr(self, f'{table}_df') for table in self._dirty}
+        if 'history' in tables:
+            tables['history'] = self._history_store.dirty_rows(tables['history'])
+        return tables
+    
+    def write_tables(self, tables):
+        """Atomically replace the CSV files with the given tables"""
+        for table, df in tables.items():
+            if table == 'history':
+                self._history_store.write(df, self._write_csv)
+            else:
+                self._write_csv(df, self.data_dir / f'{table}.csv')
+        if tables:
+            for listener in self._save_listeners:
+                listener(set(tables))
+    
+    def _write_csv(self, df, path):
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', newline='') as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
     
     # Track management methods
     def add_track(self, track_data):
         track_data['created_at'] = datetime.now()
         track_data['updated_at'] = datetime.now()
-        self.tracks_df = pd.concat([self.tracks_df, pd.DataFrame([track_data])], ignore_index=True)
-        self.save_all()
+        with self._lock:
+            before = self._before('tracks', [track_data['track_id']])
+            self._append_rows('tracks', pd.DataFrame([track_data]))
+            self._refresh_track_metrics([track_data['track_id']])
+            self._commit({'op': 'add', 'table': 'tracks', 'rows': [track_data]}, save=False, before=before)
+            self._snapshot_track(track_data['track_id'])
         
     def update_track(self, track_id, update_data):
         update_data['updated_at'] = datetime.now()
-        self.tracks_df.loc[self.tracks_df['track_id'] == track_id, update_data.keys()] = update_data.values()
-        self.save_all()
+        with self._lock:
+            before = self._before('tracks', [track_id])
+            self._update_row('tracks', track_id, update_data)
+            self._refresh_track_metrics([track_id])
+            self._commit({'op': 'update', 'table': 'tracks', 'rows': [{'track_id': track_id, **update_data}]},
+                         save=not set(HISTORY_COLUMNS) & update_data.keys(), before=before)
+            if set(HISTORY_COLUMNS) & update_data.keys():
+                self._snapshot_track(track_id)
+    
+    def refresh_track_metrics(self, save=True):
+        """Recompute the derived columns of every track; stream velocity changes with the date, not only on writes"""
+        with self._lock:
+            self._refresh_track_metrics()
+            self._touch()
+            if self.read_only:
+                return
+            self._dirty.add('tracks')
+            if save:
+                self.save_all()
+    
+    def _refresh_track_metrics(self, track_ids=None):
+        """Recompute the derived metric columns for the given tracks (all tracks by default)"""
+        df = self.tracks_df
+        rows = df.index if track_ids is None else df.index[df['track_id'].isin(track_ids)]
+        if len(rows) == 0:
+            return
+        derived = track_metrics(df.loc[rows])
+        for col in TRACK_METRIC_COLUMNS:
+            df.loc[rows, col] = derived[col].to_numpy()
+    
+    def _snapshot_track(self, track_id):
+        """Record today's counters for one track in the stats history"""
+        track = self.tracks_df.loc[self.tracks_df['track_id'] == track_id, ['track_id'] + HISTORY_COLUMNS]
+        # Part of the same change as the track write, so one undo reverts both
+        self._joined = True
+        try:
+            self.record_track_history(track)
+        finally:
+            self._joined = False
+    
+    def record_track_history(self, rows, save=True):
+        """Upsert stats snapshots; rows need track_id and may carry a date (defaults to today)"""
+        stats = [col for col in HISTORY_COLUMNS if col in rows.columns]
+        if rows.empty or not stats:
+            return
+        history = rows[['track_id'] + stats].copy()
+        today = datetime.now().strftime('%Y-%m-%d')
+        if 'date' in rows.columns:
+            history['date'] = pd.to_datetime(rows['date'], errors='coerce').dt.strftime('%Y-%m-%d').fillna(today)
+        else:
+            history['date'] = today
+        history['snapshot_id'] = history['track_id'].astype(str) + ':' + history['date']
+        history['recorded_at'] = time.time()
+        history = history.drop_duplicates('snapshot_id', keep='last')
+        with self._lock:
+            self._history_store.mark_dates(history['date'])
+            index = self._history_index()
+            positions = pd.Series([index.get(s) for s in history['snapshot_id']], index=history.index, dtype=float)
+            existing = positions.notna()
+            before = (history['snapshot_id'], self.history_df.iloc[positions[existing].astype(int).to_numpy()].copy())
+            if existing.any():
+                self._apply_updates('history', history[existing], positions[existing])
+            if (~existing).any():
+                added = history.loc[~existing, 'snapshot_id']
+                index.update(zip(added, range(len(self.history_df), len(self.history_df) + len(added))))
+                self._append_rows('history', history[~existing])
+            # Journaled as an add, which replay turns into updates for known snapshots
+            self._commit({'op': 'add', 'table': 'history', 'rows': history}, save, before)
+    
+    def _history_index(self):
+        """snapshot_id -> row position, built once and extended as snapshots are appended"""
+        if self._history_positions is None:
+            self._history_positions = dict(zip(self.history_df['snapshot_id'], range(len(self.history_df))))
+        return self._history_positions
     
     # Member management methods
     def add_member(self, member_data):
         member_data['created_at'] = datetime.now()
         member_data['updated_at'] = datetime.now()
-        self.members_df = pd.concat([self.members_df, pd.DataFrame([member_data])], ignore_index=True)
-        self.save_all()
+        with self._lock:
+            before = self._before('members', [member_data['member_id']])
+            self._append_rows('members', pd.DataFrame([member_data]))
+            self._commit({'op': 'add', 'table': 'members', 'rows': [member_data]}, before=before)
         
     def update_member(self, member_id, update_data):
         update_data['updated_at'] = datetime.now()
-        self.members_df.loc[self.members_df['member_id'] == member_id, update_data.keys()] = update_data.values()
-        self.save_all()
+        with self._lock:
+            before = self._before('members', [member_id])
+            self._update_row('members', member_id, update_data)
+            self._commit({'op': 'update', 'table': 'members', 'rows': [{'member_id': member_id, **update_data}]},
+                         before=before)
     
     # Curator management methods
     def add_curator(self, curator_data):
         curator_data['created_at'] = datetime.now()
         curator_data['updated_at'] = datetime.now()
-        self.curators_df = pd.concat([self.curators_df, pd.DataFrame([curator_data])], ignore_index=True)
-        self.save_all()
+        with self._lock:
+            before = self._before('curators', [curator_data['curator_id']])
+            self._append_rows('curators', pd.DataFrame([curator_data]))
+            self._commit({'op': 'add', 'table': 'curators', 'rows': [curator_data]}, before=before)
+            if self._curator_keys is not None:
+                self._curator_keys[1].add(curator_data['curator_id'], curator_data.get('email'), curator_data.get('playlist_url'))
+                self._curator_keys = (self.version, self._curator_keys[1])
         
     def update_curator(self, curator_id, update_data):
         update_data['updated_at'] = datetime.now()
-        self.curators_df.loc[self.curators_df['curator_id'] == curator_id, update_data.keys()] = update_data.values()
-        self.save_all()
+        with self._lock:
+            before = self._before('curators', [curator_id])
+            self._update_row('curators', curator_id, update_data)
+            self._commit({'op': 'update', 'table': 'curators', 'rows': [{'curator_id': curator_id, **update_data}]},
+                         before=before)
+            if self._curator_keys is not None and not ({'email', 'playlist_url'} & update_data.keys()):
+                self._curator_keys = (self.version, self._curator_keys[1])
+    
+    def delete_curators(self, curator_ids):
+        with self._lock:
+            keep = ~self.curators_df['curator_id'].isin(curator_ids)
+            before = (curator_ids, self.curators_df[~keep].copy())
+            self.curators_df = self.curators_df[keep].reset_index(drop=True)
+            self._commit({'op': 'delete', 'table': 'curators', 'rows': [{'curator_id': i} for i in curator_ids]},
+                         before=before)
+    
+    def find_duplicate_curator(self, email=None, playlist_url=None):
+        """Return the id of an existing curator with the same playlist or email"""
+        with self._lock:
+            # Adds keep the index current; any other change rebuilds it once
+            if self._curator_keys is None or self._curator_keys[0] != self.version:
+                self._curator_keys = (self.version, CuratorKeyIndex(self.curators_df))
+            return self._curator_keys[1].find(email, playlist_url)
+    
+    # Batch methods
+    def add_tracks(self, tracks, save=True):
+        self._bulk_add('tracks', tracks, save)
+    
+    def update_tracks(self, updates, save=True):
+        self._bulk_update('tracks', updates, save)
+    
+    def add_members(self, members, save=True):
+        self._bulk_add('members', members, save)
+    
+    def update_members(self, updates, save=True):
+        self._bulk_update('members', updates, save)
+    
+    def update_curators(self, updates, save=True):
+        self._bulk_update('curators', updates, save)
+    
+    def _bulk_add(self, table, rows, save):
+        """Append a DataFrame of new rows in a single concat"""
+        if rows.empty:
+            return
+        rows = rows.copy()
+        now = datetime.now()
+        rows['created_at'] = now
+        rows['updated_at'] = now
+        with self._lock:
+            before = self._before(table, rows[TABLE_KEYS[table]])
+            self._append_rows(table, rows)
+            if table == 'tracks':
+                self._refresh_track_metrics(rows['track_id'])
+            self._commit({'op': 'add', 'table': table, 'rows': rows}, save, before)
+    
+    def _bulk_update(self, table, updates, save):
+        """Apply a DataFrame of updates keyed by the table's id; missing values leave stored ones untouched"""
+        if updates.empty:
+            return
+        key_col = TABLE_KEYS[table]
+        updates = updates.drop_duplicates(key_col, keep='last')
+        updates = updates.assign(updated_at=pd.Series(datetime.now(), index=updates.index, dtype=object))
+        with self._lock:
+            before = self._before(table, updates[key_col])
+            self._apply_updates(table, updates)
+            if table == 'tracks':
+                self._refresh_track_metrics(updates['track_id'])
+            self._commit({'op': 'update', 'table': table, 'rows': updates}, save, before)
+    
+    def _before(self, table, keys):
+        """(ids, current rows for those ids), captured ahead of a mutation for the version log"""
+        df = getattr(self, f'{table}_df')
+        return keys, df[df[TABLE_KEYS[table]].isin(keys)].copy()
+    
+    def _append_rows(self, table, rows):
+        attr = f'{table}_df'
+        setattr(self, attr, _concat_rows(getattr(self, attr), rows))
+    
+    def _apply_updates(self, table, updates, positions=None):
+        """Write update values column by column at the matched (or given) row positions"""
+        df = getattr(self, f'{table}_df')
+        key_col = TABLE_KEYS[table]
+        updates = updates.set_index(key_col)
+        
+        if positions is None:
+            positions = self._positions(df, key_col, updates.index)
+        found = positions.notna().to_numpy()
+        rows = positions[found].astype(int).to_numpy()
+        
+        for col in updates.columns:
+            if col not in df.columns:
+                df[col] = None
+            values = updates[col].to_numpy()[found]
+            notnull = pd.notna(values)
+            _set_values(df, rows[notnull], col, values[notnull])
+    
+    def _update_row(self, table, key, update_data):
+        """Set the given columns of the row(s) with this id"""
+        df = getattr(self, f'{table}_df')
+        rows = np.flatnonzero(df[TABLE_KEYS[table]].to_numpy() == key)
+        for col, value in update_data.items():
+            if col not in df.columns:
+                df[col] = None
+            _set_values(df, rows, col, np.array([value] * len(rows), dtype=object))
+    
+    def _positions(self, df, key_col, keys):
+        """Row position of each key (NaN where missing) through a hash lookup"""
+        positions = pd.Series(range(len(df)), index=df[key_col].to_numpy())
+        positions = positions[~positions.index.duplicated(keep='last')]
+        return positions.reindex(keys)
+    
+    def replay(self, entry):
+        """Re-apply a journaled mutation; adds of ids that already exist become updates"""
+        table = entry['table']
+        rows = pd.DataFrame(entry['rows'])
+        if rows.empty:
+            return
+        with self._lock:
+            self._dirty.add(table)
+            if table == 'history':
+                self._history_positions = None
+                self._history_store.mark_snapshots(rows['snapshot_id'])
+            if entry['op'] == 'delete':
+                df = getattr(self, f'{table}_df')
+                setattr(self, f'{table}_df', df[~df[TABLE_KEYS[table]].isin(rows[TABLE_KEYS[table]])].reset_index(drop=True))
+                self._touch()
+                return
+            if entry['op'] == 'add':
+                existing = rows[TABLE_KEYS[table]].isin(getattr(self, f'{table}_df')[TABLE_KEYS[table]])
+                self._append_rows(table, rows[~existing])
+                rows = rows[existing]
+            if not rows.empty:
+                self._apply_updates(table, rows)
+            if table == 'tracks':
+                self._refresh_track_metrics(pd.DataFrame(entry['rows'])['track_id'])
+            self._touch()
+    
+    # Versioning methods
+    def as_of(self, table, commit=None, at=None):
+        """A table as it was after a commit number, or at a datetime / epoch timestamp"""
+        # Only rows changed since then are read from the log; reads older than the retained
+        # log return the oldest state it can reconstruct
+        key_col = TABLE_KEYS[table]
+        with self._lock:
+            if at is not None:
+                commit = self.versions.commit_at(at)
+            df = getattr(self, f'{table}_df')
+            changes = self.versions.changes_since(table, key_col, commit or 0)
+        if changes is None:
+            return df.copy()
+        restored = changes[~changes[ABSENT_COLUMN]].drop(columns=ABSENT_COLUMN)
+        kept = df[~df[key_col].isin(changes[key_col])]
+        return _concat_rows(kept, restored)
+    
+    def undo(self):
+        """Revert the latest change; returns its log record, or None when there is nothing to undo"""
+        with self._lock:
+            if not self.versions.commits:
+                return None
+            # A change can span several commits (a stats update and its history snapshot)
+            while True:
+                commit, image = self.versions.pop()
+                if commit['table'] == 'members' and self.activity is not None:
+                    self._retract_activity(image, datetime.fromtimestamp(commit['at']))
+                self._revert(commit['table'], image)
+                if not commit.get('joined') or not self.versions.commits:
+                    return commit
+    
+    def _retract_activity(self, image, at):
+        """Take back the activity events logged with a members change that is being undone"""
+        # Only increases of the lifetime totals are logged as events, so those are what's retracted
+        def totals(df):
+            return df.set_index('member_id').reindex(columns=ACTIVITY_COLUMNS).apply(pd.to_numeric, errors='coerce').fillna(0)
+        current = totals(self.members_df[self.members_df['member_id'].isin(image['member_id'])])
+        before = totals(image)
+        before[image[ABSENT_COLUMN].to_numpy()] = 0
+        added = (current - before.reindex(current.index, fill_value=0)).clip(lower=0)
+        self.activity.retract(added.reset_index(), at)
+    
+    def _revert(self, table, image):
+        """Put a commit's before-image back: restore changed or deleted rows, drop added ones"""
+        key_col = TABLE_KEYS[table]
+        restored = image[~image[ABSENT_COLUMN]].drop(columns=ABSENT_COLUMN)
+        removed = image.loc[image[ABSENT_COLUMN], key_col]
+        
+        # Rows that still exist get their old values back in place; deleted rows are re-appended
+        df = getattr(self, f'{table}_df')
+        positions = self._positions(df, key_col, restored[key_col])
+        present = positions.notna().to_numpy()
+        rows = positions[present].astype(int).to_numpy()
+        for col in restored.columns:
+            if col not in df.columns:
+                df[col] = None
+            _set_values(df, rows, col, restored[col].to_numpy()[present])
+        if len(removed):
+            df = df[~df[key_col].isin(removed)].reset_index(drop=True)
+        setattr(self, f'{table}_df', df)
+        if (~present).any():
+            self._append_rows(table, restored[~present])
+        
+        if table == 'curators':
+            self._curator_keys = None
+        if table == 'history':
+            self._history_positions = None
+            self.history_rewrites += 1
+            self._history_store.mark_snapshots(image['snapshot_id'])
+        
+        # Journaled as a delete plus an upsert so write-behind replay reproduces the undo
+        if len(removed):
+            self._commit({'op': 'delete', 'table': table, 'rows': [{key_col: k} for k in removed]},
+                         save=restored.empty)
+        if not restored.empty:
+            self._commit({'op': 'add', 'table': table, 'rows': restored})
     
     # Analytics methods
     def get_track_stats(self, track_id=None):
         if track_id:
-            return self.tracks_df[self.tracks_df['track_id'] == track_id]
+            return self._get_row(self.tracks_df, 'track_id', track_id)
         return self.tracks_df
     
     def get_member_stats(self, member_id=None):
         if member_id:
-            return self.members_df[self.members_df['member_id'] == member_id]
+            return self._get_row(self.members_df, 'member_id', member_id)
         return self.members_df
     
     def get_curator_stats(self, curator_id=None):
         if curator_id:
-            return self.curators_df[self.curators_df['curator_id'] == curator_id]
+            return self._get_row(self.curators_df, 'curator_id', curator_id)
         return self.curators_df
     
+    def sorted_tracks(self, by, ascending=False):
+        """Tracks ordered by a column through a sort index cached per data version"""
+        cached = self._sort_indexes.get((by, ascending))
+        if cached is None or cached[0] != self.version or cached[1] is not self.tracks_df:
+            order = self.tracks_df[by].reset_index(drop=True).sort_values(
+                ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+            cached = (self.version, self.tracks_df, order)
+            self._sort_indexes[(by, ascending)] = cached
+        return self.tracks_df.iloc[cached[2]]
+    
+    def _get_row(self, df, key_col, key):
+        """Look up a row by id through a hash index rebuilt once per data version"""
+        cached = self._row_indexes.get(key_col)
+        if cached is None or cached[0] != self.version or cached[1] is not df:
+            positions = pd.Series(range(len(df)), index=df[key_col].to_numpy())
+            positions = positions[~positions.index.duplicated(keep='last')]
+            cached = (self.version, df, positions.to_dict())
+            self._row_indexes[key_col] = cached
+        
+        position = cached[2].get(key)
+        if position is None:
+            return df.iloc[0:0]
+        return df.iloc[[position]]
+    
     def get_performance_metrics(self):
         metrics = {
             'total_streams': self.tracks_df['streams'].sum(),
             'total_saves': self.tracks_df['saves'].sum(),
             'total_playlist_adds': self.tracks_df['playlist_adds'].sum(),
-            'save_rate': (self.tracks_df['saves'].sum() / self.tracks_df['streams'].sum() * 100) if self.tracks_df['streams'].sum() > 0 else 0
+            'save_rate': safe_ratio(self.tracks_df['saves'].sum(), self.tracks_df['streams'].sum(), 100)
         }
-        return metrics
\ No newline at end of file
+        return metrics
+
+
+def _concat_rows(df, rows):
+    """df with rows appended; an empty df only contributes its column order, as pandas used to treat it"""
+    if df.empty:
+        return rows.reindex(columns=df.columns.union(rows.columns, sort=False)).reset_index(drop=True)
+    return pd.concat([df, rows], ignore_index=True)
+
+
+def _set_values(df, rows, col, values):
+    """df.iloc[rows, col] = values, first widening the column's dtype if the values don't fit it"""
+    if values.dtype == object:
+        values = pd.Series(values).infer_objects().to_numpy()
+    current = df[col].dtype
+    if values.dtype != current:
+        try:
+            target = np.result_type(current, values.dtype)
+        except TypeError:
+            target = object
+        if target != current:
+            df[col] = df[col].astype(target)
+    df.iloc[rows, df.columns.get_loc(col)] = values
@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import uuid
+import pandas as pd
+from pathlib import Path
+from history_store import HistoryStore
+
+# Export formats: label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'JSON Lines': ('jsonl', 'application/x-ndjson')
+}
+
+# Identifies unsaved in-memory data of this process in export file names
+_PROCESS_TOKEN = uuid.uuid4().hex
+
+# Column used for date-range selection on each table
+DATE_COLUMNS = {
+    'tracks': 'release_date',
+    'members': 'created_at',
+    'curators': 'created_at',
+    'history': 'date'
+}
+
+class ExportManager:
+    def __init__(self, data_manager, cache_dir=None, chunk_size=50_000):
+        self.data_manager = data_manager
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_manager.data_dir / 'exports'
+        self.chunk_size = chunk_size
+
+    def get_table(self, table):
+        """Return the live DataFrame for a table name"""
+        return getattr(self.data_manager, f'{table}_df')
+
+    def get_export(self, table, fmt, columns=None, start_date=None, end_date=None):
+        """Return the path of an export file, generating it only if the data changed"""
+        extension, _ = EXPORT_FORMATS[fmt]
+        columns = list(columns) if columns else list(self.get_table(table).columns)
+
+        # Files are named by selection and data version, so an existing file is the cached export
+        selection = _digest(fmt, columns, str(start_date), str(end_date))
+        version = self._data_version(table)
+        path = self.cache_dir / f"{table}_{selection}_{version}.{extension}"
+        if path.exists():
+            return path
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_stale(table, version)
+        tmp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex[:8]}.tmp')
+        chunks = self.iter_chunks(table, columns, start_date, end_date)
+
+        if fmt == 'CSV (gzip)':
+            self._write_csv_gzip(chunks, tmp_path)
+        elif fmt == 'Parquet':
+            self._write_parquet(chunks, tmp_path)
+        else:
+            self._write_jsonl(chunks, tmp_path)
+
+        tmp_path.replace(path)
+        return path
+
+    def _data_version(self, table):
+        """Tag for the table's current data: its files' stamps once saved, else this process's version"""
+        with self.data_manager._lock:
+            if table in self.data_manager._dirty:
+                return _digest(_PROCESS_TOKEN, id(self.data_manager), self.data_manager.version)
+        data_dir = self.data_manager.data_dir
+        if table == 'history':
+            paths = HistoryStore(data_dir).files()
+        else:
+            paths = [data_dir / f'{table}.csv']
+        stamps = [(p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in paths if p.exists()]
+        return _digest(str(data_dir.resolve()), stamps)
+
+    def _remove_stale(self, table, version):
+        """Delete the table's exports made for any other data version, by this or earlier runs"""
+        for path in self.cache_dir.glob(f'{table}_*'):
+            if path.name.endswith('.tmp'):
+                continue
+            if path.name.split('.', 1)[0].split('_')[-1] != version:
+                path.unlink(missing_ok=True)
+
+    def iter_chunks(self, table, columns, start_date=None, end_date=None):
+        """Yield row slices of a table so no full serialized copy is ever held"""
+        df = self.get_table(table)
+
+        mask = None
+        date_col = DATE_COLUMNS.get(table)
+        if date_col in df.columns and (start_date or end_date):
+            dates = pd.to_datetime(df[date_col], errors='coerce')
+            mask = dates.notna()
+            if start_date:
+                mask &= dates >= pd.Timestamp(start_date)
+            if end_date:
+                # Inclusive of the whole end day
+                mask &= dates < pd.Timestamp(end_date) + pd.Timedelta(days=1)
+
+        for start in range(0, len(df), self.chunk_size):
+            chunk = df.iloc[start:start + self.chunk_size]
+            if mask is not None:
+                chunk = chunk[mask.iloc[start:start + self.chunk_size].to_numpy()]
+            yield chunk[columns]
+
+    def _write_csv_gzip(self, chunks, path):
+        with gzip.open(path, 'wt', newline='') as f:
+            header = True
+            for chunk in chunks:
+                chunk.to_csv(f, index=False, header=header)
+                header = False
+
+    def _write_jsonl(self, chunks, path):
+        with open(path, 'w') as f:
+            for chunk in chunks:
+                if not chunk.empty:
+                    lines = chunk.to_json(orient='records', lines=True, date_format='iso')
+                    f.write(lines if lines.endswith('\n') else lines + '\n')
+
+    def _write_parquet(self, chunks, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                # Mixed object columns (e.g. timestamps loaded from CSV) are written as strings
+                chunk = chunk.astype({col: 'string' for col in chunk.columns if chunk[col].dtype == object})
+                batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema)
+                writer.write_table(batch.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            # Empty selection still produces a readable file
+            pq.write_table(pa.table({}), path)
+
+
+def _digest(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:12]
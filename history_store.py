@@ -0,0 +1,59 @@
+import pandas as pd
+from pathlib import Path
+
+# The stats history is stored as one CSV per month so a save only rewrites the months it touched
+HISTORY_DIR = 'history'
+# Single-file layout from before partitioning; split into months on its next write
+LEGACY_FILE = 'history.csv'
+
+class HistoryStore:
+    """Month partitions (history/YYYY-MM.csv) of the daily stats history and the months changed since the last write"""
+
+    def __init__(self, data_dir):
+        self.path = Path(data_dir) / HISTORY_DIR
+        self.legacy_path = Path(data_dir) / LEGACY_FILE
+        self.dirty_months = set()
+
+    def files(self):
+        """Every file the history is currently stored in"""
+        return sorted(self.path.glob('*.csv')) + ([self.legacy_path] if self.legacy_path.exists() else [])
+
+    def load(self, columns):
+        partitions = sorted(self.path.glob('*.csv'))
+        if partitions:
+            return pd.concat([pd.read_csv(path) for path in partitions], ignore_index=True)
+        if not self.legacy_path.exists():
+            return pd.DataFrame(columns=columns)
+        history = pd.read_csv(self.legacy_path)
+        self.dirty_months.update(history['date'].dropna().astype(str).str[:7])
+        return history
+
+    def mark_dates(self, dates):
+        """Mark the months of ISO dates as changed"""
+        self.dirty_months.update(dates.astype(str).str[:7])
+
+    def mark_snapshots(self, snapshot_ids):
+        """Mark the months of "<track_id>:<date>" snapshot ids as changed"""
+        self.mark_dates(snapshot_ids.astype(str).str.rsplit(':', n=1).str[-1])
+
+    def dirty_rows(self, history):
+        """Rows of the changed months, tagged with those months for write"""
+        dates = history['date'].astype(str)
+        in_months = pd.Series(False, index=dates.index)
+        for month in self.dirty_months:
+            # ISO dates sort as strings: every day of the month lies in [month, month + '~')
+            in_months |= (dates >= month) & (dates < month + '~')
+        rows = history[in_months]
+        rows.attrs['months'] = sorted(self.dirty_months)
+        return rows
+
+    def write(self, rows, write_csv):
+        """Replace the partitions of the months in rows.attrs['months'] through write_csv(df, path)"""
+        self.path.mkdir(exist_ok=True)
+        months = rows['date'].astype(str).str[:7]
+        for month, month_rows in rows.groupby(months):
+            write_csv(month_rows, self.path / f'{month}.csv')
+        # Months whose last snapshots were removed
+        for month in set(rows.attrs.get('months', [])) - set(months):
+            (self.path / f'{month}.csv').unlink(missing_ok=True)
+        self.legacy_path.unlink(missing_ok=True)
@@ -0,0 +1,225 @@
+import os
+import uuid
+import pandas as pd
+from utils import extract_spotify_ids, extract_spotify_user_ids
+from activity import ACTIVITY_COLUMNS
+
+# Accepted source column names (normalized to lowercase snake_case) for each schema column
+TRACK_COLUMN_ALIASES = {
+    'spotify_id': ['spotify_id', 'spotify_track_id', 'track_uri', 'spotify_uri', 'uri', 'track_url', 'url'],
+    'name': ['name', 'song', 'track', 'track_name', 'title'],
+    'artist': ['artist', 'artist_name'],
+    'release_date': ['release_date', 'released'],
+    'streams': ['streams', 'total_streams'],
+    'saves': ['saves', 'total_saves'],
+    'playlist_adds': ['playlist_adds', 'playlists', 'playlist_additions'],
+    # Optional: the day the counters were read, for daily timeline exports
+    'date': ['date', 'day', 'stats_date']
+}
+
+MEMBER_COLUMN_ALIASES = {
+    'member_id': ['member_id', 'id'],
+    'spotify_id': ['spotify_id', 'spotify_profile_id', 'spotify_user_id', 'user_id'],
+    'name': ['name', 'member', 'member_name', 'display_name'],
+    'streams_given': ['streams_given', 'streams'],
+    'posts_shared': ['posts_shared', 'posts'],
+    'playlists_submitted': ['playlists_submitted', 'playlist_submissions']
+}
+
+TRACK_NUMERIC_COLUMNS = ['streams', 'saves', 'playlist_adds']
+MEMBER_NUMERIC_COLUMNS = ['streams_given', 'posts_shared', 'playlists_submitted']
+
+class IngestManager:
+    def __init__(self, data_manager, chunk_size=50_000):
+        self.data_manager = data_manager
+        self.chunk_size = chunk_size
+
+    def ingest_tracks(self, source, progress=None):
+        """Upsert tracks from a Spotify for Artists CSV export, matched on spotify_id"""
+        tracks = self.data_manager.tracks_df
+        index = self._build_index(tracks, 'spotify_id', 'track_id')
+        track_ids = set(tracks['track_id'].dropna().astype(str))
+        result = self._new_result()
+
+        for chunk in self._read_chunks(source, TRACK_COLUMN_ALIASES, result, progress):
+            chunk = self._validate(chunk, 'spotify_id', TRACK_NUMERIC_COLUMNS, result)
+            # URLs (query strings included), spotify:track: URIs and bare IDs reduce to the ID; anything else is rejected
+            spotify_ids = extract_spotify_ids(chunk['spotify_id'], kinds=('track',))
+            result['rejected'] += int(spotify_ids.isna().sum())
+            chunk = chunk[spotify_ids.notna()].assign(spotify_id=spotify_ids.dropna().astype(object))
+            if 'date' in chunk.columns:
+                # Timeline exports hold one row per track and day; the latest day sets the track counters
+                history = chunk.iloc[pd.to_datetime(chunk['date'], errors='coerce').argsort(kind='stable')]
+                chunk = history.drop(columns='date')
+            else:
+                history = chunk
+            chunk = chunk.drop_duplicates('spotify_id', keep='last')
+            present = ['track_id'] + list(chunk.columns)
+
+            # object dtype even when no track matched, so new ids can be written into it
+            chunk['track_id'] = chunk['spotify_id'].map(index).astype(object)
+            new = chunk['track_id'].isna()
+
+            chunk.loc[new, 'track_id'] = self._new_ids('track_', new.sum(), track_ids)
+            track_ids.update(chunk.loc[new, 'track_id'])
+            self._fill_defaults(chunk, new, TRACK_NUMERIC_COLUMNS)
+            index.update(zip(chunk.loc[new, 'spotify_id'], chunk.loc[new, 'track_id']))
+
+            self.data_manager.update_tracks(chunk.loc[~new, present], save=False)
+            self.data_manager.add_tracks(chunk[new], save=False)
+            self.data_manager.record_track_history(
+                history.assign(track_id=history['spotify_id'].map(index)), save=False
+            )
+            result['updated'] += int((~new).sum())
+            result['inserted'] += int(new.sum())
+
+        self.data_manager.save_all()
+        return result
+
+    def ingest_members(self, source, progress=None):
+        """Upsert members from an activity dump, matched on member_id then spotify_id"""
+        members = self.data_manager.members_df
+        member_ids = self._build_index(members, 'member_id', 'member_id')
+        spotify_ids = self._build_index(members, 'spotify_id', 'member_id')
+        result = self._new_result()
+
+        for chunk in self._read_chunks(source, MEMBER_COLUMN_ALIASES, result, progress):
+            present = list(dict.fromkeys(['member_id'] + list(chunk.columns)))
+            if 'member_id' not in chunk.columns:
+                chunk['member_id'] = None
+            if 'spotify_id' not in chunk.columns:
+                chunk['spotify_id'] = None
+            # Profile URLs and spotify:user: URIs are matched and stored as the bare ID
+            user_ids = extract_spotify_user_ids(chunk['spotify_id'])
+            chunk['spotify_id'] = user_ids.astype(object).where(user_ids.notna(), chunk['spotify_id'])
+
+            # A row is keyed by member_id when present, otherwise by spotify_id
+            has_key = chunk['member_id'].notna() | chunk['spotify_id'].notna()
+            result['rejected'] += int((~has_key).sum())
+            chunk = self._validate(chunk[has_key].copy(), None, MEMBER_NUMERIC_COLUMNS, result)
+            if chunk.empty:
+                continue
+
+            matched = chunk['member_id'].map(member_ids)
+            matched = matched.fillna(chunk['spotify_id'].map(spotify_ids))
+            new = matched.isna()
+            chunk['member_id'] = matched.where(~new, chunk['member_id']).astype(object)
+
+            missing_id = new & chunk['member_id'].isna()
+            chunk.loc[missing_id, 'member_id'] = self._new_ids('member_', missing_id.sum(), member_ids)
+            chunk = chunk.drop_duplicates('member_id', keep='last')
+            new = new.loc[chunk.index]
+
+            self._fill_defaults(chunk, new, MEMBER_NUMERIC_COLUMNS)
+            if 'compliance_score' not in chunk.columns:
+                chunk.loc[new, 'compliance_score'] = 100
+
+            self._record_activity(chunk)
+
+            member_ids.update(zip(chunk.loc[new, 'member_id'], chunk.loc[new, 'member_id']))
+            spotify_ids.update((s, m) for s, m in zip(chunk.loc[new, 'spotify_id'], chunk.loc[new, 'member_id']) if pd.notna(s))
+
+            self.data_manager.update_members(chunk.loc[~new, present], save=False)
+            self.data_manager.add_members(chunk[new], save=False)
+            result['updated'] += int((~new).sum())
+            result['inserted'] += int(new.sum())
+
+        self.data_manager.save_all()
+        return result
+
+    def _record_activity(self, chunk):
+        """Log each member's counter increases over the stored totals as an activity event"""
+        members = self.data_manager.members_df
+        previous = members.drop_duplicates('member_id', keep='last').set_index('member_id')[ACTIVITY_COLUMNS]
+        previous = previous.reindex(chunk['member_id']).apply(pd.to_numeric, errors='coerce').fillna(0)
+        # Counters missing from the file leave the stored totals, so they add nothing
+        totals = chunk[ACTIVITY_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        added = (totals.to_numpy(dtype=float) - previous.to_numpy(dtype=float))
+        added = pd.DataFrame(added, columns=ACTIVITY_COLUMNS).fillna(0).clip(lower=0)
+        self.data_manager.activity.record_many(added.assign(member_id=chunk['member_id'].to_numpy()))
+
+    def _read_chunks(self, source, aliases, result, progress):
+        """Yield column-mapped chunks from a path or file-like object"""
+        close = False
+        if isinstance(source, (str, os.PathLike)):
+            source = open(source, 'rb')
+            close = True
+
+        total_bytes = self._source_size(source)
+
+        try:
+            reader = pd.read_csv(source, chunksize=self.chunk_size, dtype=str, skipinitialspace=True)
+            for raw in reader:
+                result['rows_read'] += len(raw)
+                yield self._map_columns(raw, aliases)
+
+                if progress:
+                    fraction = min(source.tell() / total_bytes, 1.0) if total_bytes else None
+                    progress(result['rows_read'], fraction)
+        finally:
+            if close:
+                source.close()
+
+    def _map_columns(self, chunk, aliases):
+        """Rename source columns to schema columns and drop everything else"""
+        normalized = {col: col.strip().lower().replace(' ', '_') for col in chunk.columns}
+        rename = {}
+        for target, names in aliases.items():
+            for col, norm in normalized.items():
+                if norm in names and target not in rename.values():
+                    rename[col] = target
+                    break
+        return chunk[list(rename)].rename(columns=rename)
+
+    def _validate(self, chunk, key_col, numeric_cols, result):
+        """Coerce numeric columns and drop rows with a missing key or bad numbers"""
+        valid = pd.Series(True, index=chunk.index)
+
+        if key_col:
+            if key_col not in chunk.columns:
+                raise ValueError(f"Import file has no column matching '{key_col}'")
+            chunk[key_col] = chunk[key_col].str.strip()
+            valid &= chunk[key_col].notna() & (chunk[key_col] != '')
+
+        for col in numeric_cols:
+            if col in chunk.columns:
+                values = pd.to_numeric(chunk[col].str.replace(',', ''), errors='coerce')
+                valid &= values.isna() == chunk[col].isna()
+                valid &= ~(values < 0)
+                chunk[col] = values
+
+        result['rejected'] += int((~valid).sum())
+        return chunk[valid].copy()
+
+    def _fill_defaults(self, chunk, new, numeric_cols):
+        """Give inserted rows zero counters where the file had no value"""
+        for col in numeric_cols:
+            if col not in chunk.columns:
+                chunk[col] = None
+            chunk.loc[new, col] = chunk.loc[new, col].fillna(0)
+
+    def _new_ids(self, prefix, count, taken):
+        """Full-length random ids, regenerating any that collide with `taken` or each other"""
+        ids = set()
+        while len(ids) < count:
+            new_id = f"{prefix}{uuid.uuid4().hex}"
+            if new_id not in taken:
+                ids.add(new_id)
+        return list(ids)
+
+    def _build_index(self, df, key_col, value_col):
+        """Hash index from a key column to the primary id"""
+        if key_col not in df.columns or df.empty:
+            return {}
+        keys = df[[key_col, value_col]].dropna(subset=[key_col])
+        return dict(zip(keys[key_col].astype(str), keys[value_col]))
+
+    def _source_size(self, source):
+        try:
+            return os.fstat(source.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            size = getattr(source, 'size', None)
+            return size
+
+    def _new_result(self):
+        return {'rows_read': 0, 'inserted': 0, 'updated': 0, 'rejected': 0}
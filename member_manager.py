@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from utils import generate_id, calculate_compliance_score, format_number
+from utils import format_number
+from services import MemberService
+from activity import WINDOW_DAYS
 
 class MemberManager:
     def __init__(self, data_manager, spotify_auth):
         self.data_manager = data_manager
         self.spotify_auth = spotify_auth
+        self.service = MemberService(data_manager, spotify_auth)
     
     def render_member_form(self):
         """Render form for adding new member"""
@@ -24,22 +27,51 @@ class MemberManager:
             submitted = st.form_submit_button("Add Member")
             
             if submitted:
-                if not name:
-                    st.error("Please enter a member name")
-                    return
-                
-                member_data = {
-                    'member_id': generate_id('member_'),
-                    'name': name,
-                    'spotify_id': spotify_id,
-                    'streams_given': streams_given,
-                    'posts_shared': posts_shared,
-                    'playlists_submitted': 0,
-                    'compliance_score': 100  # Initial score
-                }
-                
-                self.data_manager.add_member(member_data)
-                st.success("Member added successfully!")
+                try:
+                    self.service.add_member(name, spotify_id, streams_given, posts_shared)
+                    st.success("Member added successfully!")
+                except ValueError as e:
+                    st.error(str(e))
+    
+    def render_import_form(self):
+        """Render bulk CSV import for members"""
+        uploaded = st.file_uploader("Member activity dump (CSV)", type=["csv"], key="import-members-csv")
+        
+        if uploaded is not None and st.button("Import Members"):
+            progress_bar = st.progress(0.0, text="Importing...")
+            
+            def report_progress(rows_read, fraction):
+                progress_bar.progress(fraction or 0.0, text=f"{rows_read:,} rows read")
+            
+            try:
+                result = self.service.import_csv(uploaded, progress=report_progress)
+                st.success(
+                    f"Imported {result['inserted']} new and updated {result['updated']} members "
+                    f"({result['rejected']} invalid rows skipped)"
+                )
+            except ValueError as e:
+                st.error(f"Error importing members: {str(e)}")
+    
+    def render_profile_section(self):
+        """Render bulk validation of member Spotify profiles"""
+        force = st.checkbox("Re-fetch profiles checked in the last 7 days")
+        
+        if st.button("Verify Spotify Profiles"):
+            progress_bar = st.progress(0.0, text="Fetching profiles...")
+            
+            def report_progress(done, total):
+                progress_bar.progress(done / total, text=f"{done:,} of {total:,} profiles fetched")
+            
+            try:
+                result = self.service.resolve_profiles(force=force, progress=report_progress)
+                st.success(
+                    f"Checked {result['members']} members ({result['fetched']} profiles fetched): "
+                    f"{result['valid']} valid, {result['not_found']} not found, {result['invalid']} malformed IDs"
+                )
+                if result['errors']:
+                    st.warning(f"{result['errors']} profiles couldn't be fetched and will be retried next time")
+            except Exception as e:
+                st.error(f"Error verifying profiles: {str(e)}")
     
     def render_member_list(self):
         """Render list of members with stats"""
@@ -56,7 +88,8 @@ class MemberManager:
             sort_by = st.selectbox(
                 "Sort by",
                 ["name", "streams_given", "posts_shared", "compliance_score"],
-                index=0
+                index=0,
+                key="member_sort"
             )
         
         with col2:
@@ -69,84 +102,103 @@ class MemberManager:
         members = members.sort_values(by=sort_by, ascending=False)
         
         # Display members in an expandable format
-        for _, member in members.iterrows():
-            with st.expander(f"{member['name']}"):
-                col1, col2, col3, col4 = st.columns(4)
+        # Each row is a fragment, so submitting its form only reruns that row
+        for member_id in members['member_id']:
+            self._render_member_row(member_id)
+    
+    @st.fragment
+    def _render_member_row(self, member_id):
+        """Render a single member with its update form"""
+        members = self.data_manager.get_member_stats(member_id)
+        if members.empty:
+            return
+        member = members.iloc[0]
+        
+        with st.expander(f"{member['name']}"):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Streams Given", format_number(member['streams_given']))
+            
+            with col2:
+                st.metric("Posts Shared", format_number(member['posts_shared']))
+            
+            with col3:
+                st.metric("Playlists Submitted", format_number(member['playlists_submitted']))
+            
+            with col4:
+                st.metric("Compliance Score", f"{member['compliance_score']:.1f}%")
+            
+            if pd.notna(member.get('spotify_status')):
+                if member['spotify_status'] == 'valid':
+                    st.write("**Spotify:**", f"{member['spotify_display_name'] or member['spotify_id']} "
+                             f"({format_number(int(member['spotify_followers']))} followers, "
+                             f"{int(member['spotify_playlists'])} public playlists)")
+                else:
+                    st.write("**Spotify:**", f"{member['spotify_id']} ({member['spotify_status'].replace('_', ' ')})")
+            
+            # Recent activity from the event log's sliding windows
+            recent = pd.DataFrame([self.data_manager.activity.counts(member_id, days) for days in WINDOW_DAYS],
+                                  index=[f"Last {days} days" for days in WINDOW_DAYS])
+            st.dataframe(recent.rename(columns=lambda c: c.replace('_', ' ').title()), use_container_width=True)
+            
+            with st.form(f"log_activity_{member['member_id']}"):
+                col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    st.metric("Streams Given", format_number(member['streams_given']))
+                    streams = st.number_input("Streams", min_value=0, key=f"log_streams_{member_id}")
                 
                 with col2:
-                    st.metric("Posts Shared", format_number(member['posts_shared']))
+                    posts = st.number_input("Posts", min_value=0, key=f"log_posts_{member_id}")
                 
                 with col3:
-                    st.metric("Playlists Submitted", format_number(member['playlists_submitted']))
+                    playlists = st.number_input("Playlists", min_value=0, key=f"log_playlists_{member_id}")
                 
-                with col4:
-                    st.metric("Compliance Score", f"{member['compliance_score']:.1f}%")
+                if st.form_submit_button("Log Activity"):
+                    maxima = self.data_manager.activity.maxima()
+                    self.service.log_activity(member_id, streams, posts, playlists)
+                    st.success("Activity logged!")
+                    self._rerun_after_edit(maxima)
+            
+            # Update form
+            with st.form(f"update_member_{member['member_id']}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    new_streams = st.number_input(
+                        "Update Streams Given",
+                        min_value=0,
+                        value=int(member['streams_given'])
+                    )
                 
-                # Update form
-                with st.form(f"update_member_{member['member_id']}"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        new_streams = st.number_input(
-                            "Update Streams Given",
-                            min_value=0,
-                            value=int(member['streams_given'])
-                        )
-                    
-                    with col2:
-                        new_posts = st.number_input(
-                            "Update Posts Shared",
-                            min_value=0,
-                            value=int(member['posts_shared'])
-                        )
-                    
-                    with col3:
-                        new_playlists = st.number_input(
-                            "Update Playlists Submitted",
-                            min_value=0,
-                            value=int(member['playlists_submitted'])
-                        )
-                    
-                    if st.form_submit_button("Update Stats"):
-                        # Calculate new compliance score
-                        temp_df = members.copy()
-                        temp_df.loc[temp_df['member_id'] == member['member_id'], 'streams_given'] = new_streams
-                        temp_df.loc[temp_df['member_id'] == member['member_id'], 'posts_shared'] = new_posts
-                        temp_df.loc[temp_df['member_id'] == member['member_id'], 'playlists_submitted'] = new_playlists
-                        
-                        new_score = calculate_compliance_score(temp_df.loc[temp_df['member_id'] == member['member_id']])
-                        
-                        update_data = {
-                            'streams_given': new_streams,
-                            'posts_shared': new_posts,
-                            'playlists_submitted': new_playlists,
-                            'compliance_score': new_score
-                        }
-                        
-                        self.data_manager.update_member(member['member_id'], update_data)
-                        st.success("Member stats updated successfully!")
-                        st.rerun()
+                with col2:
+                    new_posts = st.number_input(
+                        "Update Posts Shared",
+                        min_value=0,
+                        value=int(member['posts_shared'])
+                    )
+                
+                with col3:
+                    new_playlists = st.number_input(
+                        "Update Playlists Submitted",
+                        min_value=0,
+                        value=int(member['playlists_submitted'])
+                    )
+                
+                if st.form_submit_button("Update Stats"):
+                    # Stores the counts together with the recalculated compliance score
+                    maxima = self.data_manager.activity.maxima()
+                    self.service.update_activity(member['member_id'], new_streams, new_posts, new_playlists)
+                    st.success("Member stats updated successfully!")
+                    self._rerun_after_edit(maxima)
+    
+    def _rerun_after_edit(self, maxima):
+        """Rerun just the edited row, or the whole page when the list order or other members' scores changed"""
+        # A new network maximum rescores every member, so the other rows are stale too
+        if st.session_state.get('member_sort') == "name" and self.data_manager.activity.maxima() == maxima:
+            st.rerun(scope="fragment")
+        st.rerun()
     
     def get_member_performance_summary(self):
         """Get summary of member performance"""
-        members = self.data_manager.get_member_stats()
-        
-        if members.empty:
-            return {
-                'total_members': 0,
-                'total_streams_given': 0,
-                'total_posts_shared': 0,
-                'total_playlists_submitted': 0,
-                'avg_compliance_score': 0
-            }
-        
-        return {
-            'total_members': len(members),
-            'total_streams_given': members['streams_given'].sum(),
-            'total_posts_shared': members['posts_shared'].sum(),
-            'total_playlists_submitted': members['playlists_submitted'].sum(),
-            'avg_compliance_score': members['compliance_score'].mean()
-        }
\ No newline at end of file
+        return self.service.get_performance_summary()
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import extract_spotify_user_ids
+
+# Fetched profiles by Spotify user ID, shared by every member with that ID
+PROFILE_CACHE_FILE = 'spotify_profiles.json'
+# Profiles fetched more recently than this are not fetched again
+PROFILE_TTL_DAYS = 7
+# Concurrent API requests; spotipy retries 429 responses itself
+MAX_CONCURRENT_REQUESTS = 8
+
+# Member columns written back by a resolve
+PROFILE_COLUMNS = ['spotify_display_name', 'spotify_followers', 'spotify_playlists', 'spotify_status']
+
+class ProfileResolver:
+    """Validates member Spotify IDs and enriches them with public profile data in bulk"""
+
+    def __init__(self, data_manager, spotify_auth, workers=MAX_CONCURRENT_REQUESTS, ttl_days=PROFILE_TTL_DAYS):
+        self.data_manager = data_manager
+        self.spotify_auth = spotify_auth
+        self.workers = workers
+        self.ttl_days = ttl_days
+        self.path = data_manager.data_dir / PROFILE_CACHE_FILE
+
+        # user ID -> {'status', 'display_name', 'followers', 'playlists', 'fetched_at'}
+        self.profiles = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.profiles = json.load(f)
+        # One API client per worker thread
+        self._local = threading.local()
+
+    def resolve(self, force=False, progress=None):
+        """Fetch missing or expired profiles concurrently, then update every member's profile columns at once"""
+        members = self.data_manager.members_df
+        members = members[members['spotify_id'].notna() & (members['spotify_id'].astype(str).str.strip() != '')]
+        user_ids = extract_spotify_user_ids(members['spotify_id'])
+
+        # Each distinct ID is fetched once, however many members share it
+        cutoff = time.time() - self.ttl_days * 86400
+        stale = [user_id for user_id in dict.fromkeys(user_ids.dropna())
+                 if force or self.profiles.get(user_id, {}).get('fetched_at', 0) < cutoff]
+        if stale:
+            try:
+                self._fetch_all(stale, progress)
+            finally:
+                # Profiles fetched before a failure aren't fetched again
+                self._save()
+
+        invalid = {'status': 'invalid', 'display_name': '', 'followers': 0, 'playlists': 0}
+        resolved = [self.profiles.get(user_id, invalid) if pd.notna(user_id) else invalid for user_id in user_ids]
+        updates = pd.DataFrame({
+            'member_id': members['member_id'].to_numpy(),
+            'spotify_display_name': [p['display_name'] for p in resolved],
+            'spotify_followers': [p['followers'] for p in resolved],
+            'spotify_playlists': [p['playlists'] for p in resolved],
+            'spotify_status': [p['status'] for p in resolved]
+        })
+
+        # Only members whose profile columns changed are written, in one batch update
+        current = members.reindex(columns=PROFILE_COLUMNS).reset_index(drop=True)
+        changed = pd.Series(False, index=updates.index)
+        for col in PROFILE_COLUMNS:
+            if col in ('spotify_followers', 'spotify_playlists'):
+                changed |= pd.to_numeric(current[col], errors='coerce') != updates[col]
+            else:
+                changed |= current[col].fillna('').astype(str) != updates[col]
+        self.data_manager.update_members(updates[changed])
+
+        statuses = pd.Series([p['status'] for p in resolved], dtype=object)
+        return {
+            'members': len(members),
+            'fetched': len(stale),
+            'updated': int(changed.sum()),
+            'valid': int((statuses == 'valid').sum()),
+            'not_found': int((statuses == 'not_found').sum()),
+            'invalid': int((statuses == 'invalid').sum()),
+            'errors': int((statuses == 'error').sum())
+        }
+
+    def _fetch_all(self, user_ids, progress=None):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._fetch, user_id): user_id for user_id in user_ids}
+            for done, future in enumerate(as_completed(futures), 1):
+                self.profiles[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(user_ids))
+
+    def _fetch(self, user_id):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.spotify_auth.get_spotify_client()
+        try:
+            profile = self.spotify_auth.get_public_profile(user_id, client)
+            return {'status': 'valid', **profile, 'fetched_at': time.time()}
+        except Exception as e:
+            # Unknown users are cached like found ones; other failures are retried on the next resolve
+            missing = getattr(e, 'http_status', None) in (400, 404)
+            return {'status': 'not_found' if missing else 'error', 'display_name': '', 'followers': 0,
+                    'playlists': 0, 'fetched_at': time.time() if missing else 0}
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.profiles, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# Derived track columns stored next to the raw counters and refreshed on every write
+TRACK_METRIC_COLUMNS = ['save_rate', 'adds_per_1k', 'stream_velocity']
+
+def safe_ratio(numerator, denominator, scale=1):
+    """numerator / denominator * scale; 0 where the denominator is missing, zero or negative"""
+    numerator = np.asarray(pd.to_numeric(numerator, errors='coerce'), dtype=float)
+    denominator = np.asarray(pd.to_numeric(denominator, errors='coerce'), dtype=float)
+    valid = (denominator > 0) & ~np.isnan(numerator)
+    result = np.divide(numerator * scale, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                       where=valid)
+    return float(result) if result.ndim == 0 else result
+
+
+def track_metrics(tracks, now=None):
+    """Save rate (%), playlist adds per 1k streams and average streams per day since release"""
+    now = pd.Timestamp(now or datetime.now())
+    streams = tracks['streams']
+    days_out = (now - pd.to_datetime(tracks['release_date'], errors='coerce')).dt.days
+    # Release day counts as one day; unreleased or undated tracks have no velocity yet
+    days_out = days_out.where(days_out >= 0).clip(lower=1)
+
+    return pd.DataFrame({
+        'save_rate': safe_ratio(tracks['saves'], streams, 100),
+        'adds_per_1k': safe_ratio(tracks['playlist_adds'], streams, 1000),
+        'stream_velocity': safe_ratio(streams, days_out)
+    }, index=tracks.index)
@@ -0,0 +1,188 @@
+import heapq
+import json
+import os
+import pandas as pd
+from datetime import date, timedelta
+
+SCHEDULE_FILE = 'outreach.json'
+
+# Days after the last contact before a curator is due again; None means no follow-up.
+# Curators never contacted are due from the day they were added.
+FOLLOW_UP_DAYS = {
+    'Not Submitted': 30,
+    'Submitted': 7,
+    'Accepted': 60,
+    'Rejected': None,
+    'No Response': 21
+}
+MAX_CONTACTS_PER_DAY = 25
+
+class OutreachScheduler:
+    """Curators ordered by next follow-up date in a heap kept current from curator writes"""
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.path = data_manager.data_dir / SCHEDULE_FILE
+
+        state = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        today = date.today().isoformat()
+        self.intervals = {**FOLLOW_UP_DAYS, **state.get('intervals', {})}
+        self.max_per_day = state.get('max_per_day', MAX_CONTACTS_PER_DAY)
+        # curator_id -> ISO date the curator is snoozed until; expired snoozes are dropped
+        self.snoozes = {k: v for k, v in state.get('snoozes', {}).items() if v > today}
+        # Contacts logged per day, for the daily throttle; only today's count is kept
+        self.contacts = {today: state.get('contacts', {}).get(today, 0)}
+
+        # curator_id -> (status, last_contacted, created_at), the fields due dates depend on
+        self._curators = {}
+        # curator_id -> due date, and a heap of (due date, curator_id). Heap entries whose
+        # date no longer matches _due are stale and skipped when they reach the top.
+        self._due = {}
+        self._heap = []
+        # (day, first max_per_day due curators), recomputed only when a change can affect it
+        self._today = None
+
+        self._rebuild()
+        data_manager.add_listener(self._on_change)
+
+    def due_today(self):
+        """[(curator_id, due date)] due today or overdue, earliest first, within today's contact budget"""
+        today = date.today().isoformat()
+        if self._today is None or self._today[0] != today:
+            self._today = (today, self._peek(today, self.max_per_day))
+        return self._today[1][:self.remaining_today()]
+
+    def remaining_today(self):
+        return max(self.max_per_day - self.contacts.get(date.today().isoformat(), 0), 0)
+
+    def next_due(self, curator_id):
+        return self._due.get(curator_id)
+
+    def snooze(self, curator_id, days):
+        """Push a curator's next follow-up at least `days` days from today"""
+        self.snoozes[curator_id] = (date.today() + timedelta(days=days)).isoformat()
+        self._schedule(curator_id)
+        self._save()
+
+    def configure(self, max_per_day=None, intervals=None):
+        """Change the daily contact limit or per-status follow-up intervals"""
+        if max_per_day is not None:
+            self.max_per_day = int(max_per_day)
+        if intervals:
+            self.intervals.update(intervals)
+            self._rebuild()
+        self._today = None
+        self._save()
+
+    def _rebuild(self):
+        """Schedule every curator from the table in one pass and heapify, O(n)"""
+        df = self.data_manager.curators_df
+        self._curators = dict(zip(df['curator_id'], zip(df['submission_status'], df['last_contacted'],
+                                                         df['created_at'])))
+        self._due = {}
+        for curator_id in self._curators:
+            due = self._due_date(curator_id)
+            if due is not None:
+                self._due[curator_id] = due
+        self._heap = [(due, curator_id) for curator_id, due in self._due.items()]
+        heapq.heapify(self._heap)
+        self._today = None
+
+    def _on_change(self, entry):
+        if entry['table'] != 'curators':
+            return
+        rows = entry['rows'].to_dict('records') if isinstance(entry['rows'], pd.DataFrame) else entry['rows']
+        today = date.today().isoformat()
+
+        for row in rows:
+            curator_id = row['curator_id']
+            if entry['op'] == 'delete':
+                self._curators.pop(curator_id, None)
+                self._due.pop(curator_id, None)
+                self._today = None
+                continue
+
+            # Updates carry only the changed fields; missing values keep the stored ones
+            status, last_contacted, created_at = self._curators.get(curator_id, (None, None, None))
+            if _present(row.get('last_contacted')) and _day(row['last_contacted']) == today \
+                    and _day(last_contacted) != today:
+                self.contacts[today] = self.contacts.get(today, 0) + 1
+            self._curators[curator_id] = (
+                row['submission_status'] if _present(row.get('submission_status')) else status,
+                row['last_contacted'] if _present(row.get('last_contacted')) else last_contacted,
+                row['created_at'] if _present(row.get('created_at')) else created_at
+            )
+            self._schedule(curator_id)
+
+        if len(self._heap) > 2 * len(self._due) + 64:
+            # Drop stale entries once they outnumber live ones
+            self._heap = [(due, curator_id) for curator_id, due in self._due.items()]
+            heapq.heapify(self._heap)
+        self._save()
+
+    def _schedule(self, curator_id):
+        """Record a curator's new due date with one heap push, O(log n)"""
+        previous = self._due.pop(curator_id, None)
+        due = self._due_date(curator_id)
+        if due is not None:
+            self._due[curator_id] = due
+            heapq.heappush(self._heap, (due, curator_id))
+
+        # Today's list only changes if the curator was in it or is now due
+        today = date.today().isoformat()
+        if self._today is not None and ((previous is not None and previous <= today) or
+                                        (due is not None and due <= today)):
+            self._today = None
+
+    def _due_date(self, curator_id):
+        status, last_contacted, created_at = self._curators[curator_id]
+        days = self.intervals.get(status)
+        if days is None:
+            return None
+        if _present(last_contacted) and _day(last_contacted):
+            due = (date.fromisoformat(_day(last_contacted)) + timedelta(days=days)).isoformat()
+        else:
+            due = _day(created_at) or date.today().isoformat()
+        snooze = self.snoozes.get(curator_id)
+        return max(due, snooze) if snooze else due
+
+    def _peek(self, today, limit):
+        """Up to `limit` live heap entries due by today; they are popped and pushed back"""
+        found = []
+        while self._heap and len(found) < limit and self._heap[0][0] <= today:
+            due, curator_id = heapq.heappop(self._heap)
+            if self._due.get(curator_id) == due and (due, curator_id) not in found:
+                found.append((due, curator_id))
+        for item in found:
+            heapq.heappush(self._heap, item)
+        return [(curator_id, due) for due, curator_id in found]
+
+    def _save(self):
+        today = date.today().isoformat()
+        state = {
+            'intervals': self.intervals,
+            'max_per_day': self.max_per_day,
+            'snoozes': self.snoozes,
+            'contacts': {today: self.contacts.get(today, 0)}
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def _present(value):
+    return value is not None and not (isinstance(value, float) and pd.isna(value))
+
+
+def _day(value):
+    """ISO date (YYYY-MM-DD) of a stored date or timestamp, or None"""
+    if not _present(value):
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return None
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import uuid
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from utils import to_arrow
+
+# Tables opened by this worker process: path -> memory-mapped Arrow table
+_shared_tables = {}
+
+class ParallelRunner:
+    """Run a function over row shards of a table in worker processes"""
+
+    def __init__(self, max_workers=None, scratch_dir=None, shard_rows=25_000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.scratch_dir = Path(scratch_dir) if scratch_dir else _default_scratch_dir()
+        # Shards depend on row count only, so output is identical for any number of workers
+        self.shard_rows = shard_rows
+        self._pool = None
+
+    def __enter__(self):
+        if self.max_workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+
+    def map_shards(self, df, task, key=None, shards=None, **params):
+        """Return [task(shard, **params) for each shard], always in shard order"""
+        # With a key, rows are sorted by it and equal keys stay in one shard, so
+        # key='track_id' hands every worker a contiguous track ID range.
+        # task must be a module-level function so workers can import it.
+        if key:
+            df = df.sort_values(key, kind='stable', ignore_index=True)
+        else:
+            df = df.reset_index(drop=True)
+        shards = shards or -(-len(df) // self.shard_rows)
+        bounds = shard_bounds(len(df), shards, df[key].to_numpy() if key else None)
+        ranges = list(zip(bounds[:-1], bounds[1:]))
+
+        if self.max_workers == 1 or len(ranges) <= 1:
+            # The same Arrow IPC round-trip as the shared file, in memory, so a shard's
+            # dtypes (and the output) don't depend on the number of workers
+            import pyarrow as pa
+            sink = pa.BufferOutputStream()
+            _write_ipc(df, sink)
+            table = pa.ipc.open_file(sink.getvalue()).read_all()
+            return [task(_shard(table, start, stop), **params) for start, stop in ranges]
+
+        path = self._share(df)
+        pool = self._pool or ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [pool.submit(_run_shard, task, str(path), start, stop, params)
+                       for start, stop in ranges]
+            return [future.result() for future in futures]
+        finally:
+            if pool is not self._pool:
+                pool.shutdown()
+            path.unlink(missing_ok=True)
+
+    def _share(self, df):
+        """Write df once as an uncompressed Arrow IPC file that every worker memory-maps"""
+        import pyarrow as pa
+        self.scratch_dir.mkdir(parents=True, exist_ok=True)
+        path = self.scratch_dir / f"streamr-shard-{uuid.uuid4().hex[:12]}.arrow"
+        with pa.OSFile(str(path), 'wb') as sink:
+            _write_ipc(df, sink)
+        return path
+
+
+def shard_bounds(n_rows, shards, keys=None):
+    """Row offsets splitting n_rows into up to `shards` contiguous ranges"""
+    shards = max(1, min(shards, n_rows))
+    bounds = np.linspace(0, n_rows, shards + 1).astype(np.int64)
+    if keys is not None and n_rows:
+        # Move each boundary back to the first row of its key
+        inner = np.searchsorted(keys, keys[bounds[1:-1]], side='left')
+        bounds = np.concatenate([[0], inner, [n_rows]])
+    return np.unique(bounds).tolist()
+
+
+def _run_shard(task, path, start, stop, params):
+    table = _shared_tables.get(path)
+    if table is None:
+        import pyarrow as pa
+        # Zero-copy read: columns are views into the page cache, shared by all workers
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        _shared_tables.clear()
+        _shared_tables[path] = table
+    return task(_shard(table, start, stop), **params)
+
+
+def _shard(table, start, stop):
+    return table.slice(start, stop - start).to_pandas()
+
+
+def _write_ipc(df, sink):
+    """Write df to sink in the Arrow IPC file format"""
+    import pyarrow as pa
+    table = to_arrow(df)
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _default_scratch_dir():
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from data_manager import TABLE_KEYS
+
+DEFAULT_ROW_LIMIT = 1000
+CACHE_SIZE = 32
+
+class QueryEngine:
+    """Read-only SQL over the in-memory tables, executed by an embedded DuckDB"""
+
+    def __init__(self, data_manager, threads=None):
+        import duckdb
+        self.data_manager = data_manager
+        self._duckdb = duckdb
+        self._con = duckdb.connect(database=':memory:')
+        if threads:
+            self._con.execute(f"SET threads TO {int(threads)}")
+        # Queries only see the registered tables: no file, URL or extension access (read_text('.env')
+        # and the like), and the setting can't be switched back from SQL
+        self._con.execute("SET enable_external_access = false")
+        self._con.execute("SET lock_configuration = true")
+        # Registered DataFrame per table name; DuckDB scans it in place, without a copy
+        self._registered = {}
+        # (sql, limit) -> (data version, result), least recently used first
+        self._cache = OrderedDict()
+
+    def tables(self):
+        """Table name -> list of (column, SQL type)"""
+        with self.data_manager._lock:
+            self._register()
+            return {table: [(row[0], row[1]) for row in self._con.execute(f'DESCRIBE "{table}"').fetchall()]
+                    for table in TABLE_KEYS}
+
+    def query(self, sql, limit=DEFAULT_ROW_LIMIT):
+        """Run one SELECT statement; returns dict(data, truncated, seconds, cached)
+
+        The data lock is held while the query runs, so edits and saves wait for a slow query.
+        """
+        statements = self._duckdb.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError("Enter exactly one SQL statement")
+        if statements[0].type != self._duckdb.StatementType.SELECT:
+            raise ValueError("Only SELECT queries are allowed")
+        sql = sql.strip().rstrip(';')
+
+        key = (sql, limit)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == self.data_manager.version:
+            self._cache.move_to_end(key)
+            return {**cached[1], 'cached': True}
+
+        # Held so writes can't change a table mid-scan: updates write into the registered frames in place,
+        # so scanning without the lock would need a copy of every table per query
+        with self.data_manager._lock:
+            version = self.data_manager.version
+            self._register()
+            start = time.perf_counter()
+            # Only limit + 1 rows are ever materialized, however large the scan or aggregation;
+            # the newline ends a trailing -- comment before the closing parenthesis
+            cursor = self._con.execute(f"SELECT * FROM ({sql}\n) AS q LIMIT {int(limit) + 1}")
+            data = cursor.fetchdf()
+            seconds = time.perf_counter() - start
+
+        result = {'data': data.iloc[:limit], 'truncated': len(data) > limit, 'seconds': seconds}
+        self._cache[key] = (version, result)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return {**result, 'cached': False}
+
+    def _register(self):
+        """Point each table name at the current DataFrame; only replaced frames are re-registered"""
+        for table in TABLE_KEYS:
+            df = getattr(self.data_manager, f'{table}_df')
+            if self._registered.get(table) is not df:
+                self._con.register(table, df)
+                self._registered[table] = df
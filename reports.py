@@ -0,0 +1,123 @@
+import gzip
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from utils import calculate_compliance_score
+from activity import ACTIVITY_COLUMNS, COMPLIANCE_WINDOW_DAYS
+
+# Nightly report jobs built on ParallelRunner. Shard tasks are module-level
+# functions so worker processes can import them, and every merge concatenates
+# shard results in shard order so the output doesn't depend on worker count.
+
+def track_summary(runner, data_manager):
+    """Per-track stats history summary, sharded by track ID range"""
+    history = data_manager.history_df[['track_id', 'date', 'streams', 'saves']]
+    if history.empty:
+        return pd.DataFrame(columns=['track_id', 'snapshots', 'first_date', 'last_date',
+                                     'streams', 'saves', 'streams_7d', 'streams_28d'])
+    parts = runner.map_shards(history, _summarize_history, key='track_id')
+    return pd.concat(parts, ignore_index=True)
+
+
+def compliance_scores(runner, members):
+    """Compliance score per member from windowed activity counts, normalized by network-wide maxima (map, reduce, map)"""
+    if members.empty:
+        return pd.DataFrame(columns=['member_id', 'compliance_score'])
+    members = members[['member_id'] + ACTIVITY_COLUMNS]
+    maxima = pd.DataFrame(runner.map_shards(members, _activity_maxima)).max().to_dict()
+    parts = runner.map_shards(members, _score_members, maxima=maxima)
+    return pd.concat(parts, ignore_index=True)
+
+
+def export_table(runner, data_manager, table, path, fmt='csv.gz'):
+    """Write a full table export with each shard encoded in a worker"""
+    df = getattr(data_manager, f'{table}_df')
+    if fmt == 'csv.gz':
+        parts = runner.map_shards(df, _encode_csv_gzip)
+    elif fmt == 'jsonl':
+        parts = runner.map_shards(df, _encode_jsonl)
+    else:
+        raise ValueError(f"Unsupported report format '{fmt}'")
+
+    tmp_path = Path(path).with_name(Path(path).name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        if fmt == 'csv.gz':
+            # Gzip members concatenate into one valid file: the header, then each shard's rows
+            f.write(gzip.compress(df.iloc[0:0].to_csv(index=False).encode('utf-8'), mtime=0))
+        for part in parts:
+            f.write(part)
+    tmp_path.replace(path)
+    return Path(path)
+
+
+def run_nightly(runner, data_manager, output_dir):
+    """Write the nightly report set for one workspace and return the file paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    summary_path = output_dir / 'track_summary.csv'
+    track_summary(runner, data_manager).to_csv(summary_path, index=False)
+    paths.append(summary_path)
+
+    compliance_path = output_dir / 'compliance.csv'
+    activity = data_manager.activity.window(COMPLIANCE_WINDOW_DAYS, data_manager.members_df['member_id'])
+    compliance_scores(runner, activity).to_csv(compliance_path, index=False)
+    paths.append(compliance_path)
+
+    for table in ('tracks', 'members', 'curators'):
+        paths.append(export_table(runner, data_manager, table, output_dir / f'{table}.csv.gz'))
+    return paths
+
+
+# Shard tasks
+
+def _summarize_history(history):
+    history = history.assign(
+        date=pd.to_datetime(history['date'], errors='coerce'),
+        streams=pd.to_numeric(history['streams'], errors='coerce'),
+        saves=pd.to_numeric(history['saves'], errors='coerce')
+    ).dropna(subset=['date']).sort_values(['track_id', 'date'], kind='stable')
+
+    grouped = history.groupby('track_id', sort=True)
+    summary = pd.DataFrame({
+        'snapshots': grouped.size(),
+        'first_date': grouped['date'].first(),
+        'last_date': grouped['date'].last(),
+        'streams': grouped['streams'].last(),
+        'saves': grouped['saves'].last()
+    })
+
+    # Streams gained over the 7 and 28 days before each track's latest snapshot
+    points = history[['track_id', 'date', 'streams']].sort_values('date', kind='stable')
+    for days in (7, 28):
+        targets = pd.DataFrame({
+            'track_id': summary.index,
+            'date': summary['last_date'].to_numpy() - np.timedelta64(days, 'D')
+        }).sort_values('date', kind='stable')
+        earlier = pd.merge_asof(targets, points, on='date', by='track_id', direction='backward')
+        summary[f'streams_{days}d'] = summary['streams'] - earlier.set_index('track_id')['streams']
+
+    return summary.reset_index()
+
+
+def _activity_maxima(members):
+    activity = members[ACTIVITY_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
+    return activity.max().to_dict()
+
+
+def _score_members(members, maxima):
+    activity = members[ACTIVITY_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
+    return pd.DataFrame({
+        'member_id': members['member_id'].to_numpy(),
+        'compliance_score': calculate_compliance_score(activity, maxima).fillna(0).to_numpy()
+    })
+
+
+def _encode_csv_gzip(df):
+    return gzip.compress(df.to_csv(index=False, header=False).encode('utf-8'), mtime=0)
+
+
+def _encode_jsonl(df):
+    text = df.to_json(orient='records', lines=True, date_format='iso')
+    return (text if text.endswith('\n') or not text else text + '\n').encode('utf-8')
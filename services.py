@@ -0,0 +1,293 @@
+import pandas as pd
+from datetime import datetime
+from utils import (generate_id, validate_email, validate_spotify_url, extract_spotify_id,
+                   extract_spotify_user_id, calculate_compliance_score)
+from ingest_manager import IngestManager
+from audio_features import AudioFeatureStore
+from curator_matching import CuratorMatcher
+from curator_dedupe import find_duplicates, merge_duplicates
+from metrics import safe_ratio
+from activity import ACTIVITY_COLUMNS, COMPLIANCE_WINDOW_DAYS
+from member_profiles import ProfileResolver, MAX_CONCURRENT_REQUESTS
+
+# Headless operations behind the Streamlit managers and the command line.
+# Nothing here may import streamlit or plotly.
+
+CURATOR_STATUSES = ["Not Submitted", "Submitted", "Accepted", "Rejected", "No Response"]
+
+class TrackService:
+    def __init__(self, data_manager, spotify_auth=None):
+        self.data_manager = data_manager
+        self.spotify_auth = spotify_auth
+        self.audio_features = AudioFeatureStore(data_manager.data_dir)
+
+    def add_from_spotify(self, track_url, artist_name, release_date, initial_streams=0):
+        """Look a track up on Spotify and add it; raises ValueError for a bad URL"""
+        if not validate_spotify_url(track_url):
+            raise ValueError("Please enter a valid Spotify track URL")
+
+        spotify_id = extract_spotify_id(track_url)
+        sp_client = self.spotify_auth.get_spotify_client()
+        track_info = self.spotify_auth.get_track_info(spotify_id, sp_client)
+
+        track_data = {
+            'track_id': generate_id('track_'),
+            'spotify_id': spotify_id,
+            'name': track_info['name'],
+            'artist': artist_name or track_info['artists'][0]['name'],
+            'release_date': release_date.strftime('%Y-%m-%d'),
+            'streams': initial_streams,
+            'saves': 0,
+            'playlist_adds': 0
+        }
+        self.data_manager.add_track(track_data)
+        return track_data
+
+    def update_stats(self, track_id, streams, saves, playlist_adds):
+        self.data_manager.update_track(track_id, {
+            'streams': streams,
+            'saves': saves,
+            'playlist_adds': playlist_adds
+        })
+
+    def import_csv(self, source, progress=None):
+        return IngestManager(self.data_manager).ingest_tracks(source, progress=progress)
+
+    def snapshot_stats(self):
+        """Record every track's current counters as today's history point and bring the derived metrics up to date"""
+        self.data_manager.refresh_track_metrics(save=False)
+        tracks = self.data_manager.tracks_df
+        self.data_manager.record_track_history(tracks)
+        return len(tracks)
+
+    def refresh_audio_features(self, sp_client=None):
+        """Fetch audio features for tracks that don't have them yet"""
+        self.audio_features.refresh()
+        spotify_ids = self.data_manager.tracks_df['spotify_id'].dropna()
+        return self.audio_features.fetch_missing(self.spotify_auth, spotify_ids, sp_client)
+
+    def get_performance_summary(self):
+        tracks = self.data_manager.get_track_stats()
+
+        if tracks.empty:
+            return {
+                'total_tracks': 0,
+                'total_streams': 0,
+                'total_saves': 0,
+                'total_playlists': 0,
+                'avg_save_rate': 0
+            }
+
+        total_streams = tracks['streams'].sum()
+        total_saves = tracks['saves'].sum()
+
+        return {
+            'total_tracks': len(tracks),
+            'total_streams': total_streams,
+            'total_saves': total_saves,
+            'total_playlists': tracks['playlist_adds'].sum(),
+            'avg_save_rate': safe_ratio(total_saves, total_streams, 100)
+        }
+
+
+class MemberService:
+    def __init__(self, data_manager, spotify_auth=None):
+        self.data_manager = data_manager
+        self.spotify_auth = spotify_auth
+
+    def add_member(self, name, spotify_id=None, streams_given=0, posts_shared=0):
+        """Add a member; raises ValueError without a name or with a malformed Spotify ID"""
+        if not name:
+            raise ValueError("Please enter a member name")
+
+        if spotify_id:
+            # Profile URLs and spotify:user: URIs are stored as the bare ID
+            spotify_id = extract_spotify_user_id(spotify_id)
+            if not spotify_id:
+                raise ValueError("Please enter a valid Spotify profile ID or URL")
+
+        member_data = {
+            'member_id': generate_id('member_'),
+            'name': name,
+            'spotify_id': spotify_id,
+            'streams_given': streams_given,
+            'posts_shared': posts_shared,
+            'playlists_submitted': 0,
+            'compliance_score': 100  # Initial score
+        }
+        self.data_manager.add_member(member_data)
+        return member_data
+
+    def update_activity(self, member_id, streams_given, posts_shared, playlists_submitted):
+        """Store new lifetime totals; increases are logged as an activity event and the member is rescored"""
+        totals = dict(zip(ACTIVITY_COLUMNS, [streams_given, posts_shared, playlists_submitted]))
+        previous = self._totals(member_id)
+        maxima = self.data_manager.activity.maxima(COMPLIANCE_WINDOW_DAYS)
+        added = {col: max(int(totals[col]) - previous[col], 0) for col in ACTIVITY_COLUMNS}
+        if any(added.values()):
+            self.data_manager.activity.record(member_id, **added)
+
+        self._store_activity(member_id, totals, maxima)
+
+    def log_activity(self, member_id, streams_given=0, posts_shared=0, playlists_submitted=0):
+        """Record an activity event, add it to the member's lifetime totals and rescore the member"""
+        previous = self._totals(member_id)
+        maxima = self.data_manager.activity.maxima(COMPLIANCE_WINDOW_DAYS)
+        event = self.data_manager.activity.record(member_id, streams_given, posts_shared, playlists_submitted)
+
+        self._store_activity(member_id, {col: previous[col] + event[col] for col in ACTIVITY_COLUMNS}, maxima)
+        return event
+
+    def _store_activity(self, member_id, totals, maxima):
+        """Save a member's totals and score; if the event moved the network maxima every member is rescored"""
+        if self.data_manager.activity.maxima(COMPLIANCE_WINDOW_DAYS) == maxima:
+            self.data_manager.update_member(member_id, {**totals, 'compliance_score': self._score(member_id)})
+            return
+        # Everyone is scored against the maxima, so all scores move together in one batch (and one undo)
+        updates = self._compliance_updates().astype(object)
+        for col in ACTIVITY_COLUMNS:
+            updates[col] = updates['member_id'].map({member_id: totals[col]})
+        self.data_manager.update_members(updates)
+
+    def _totals(self, member_id):
+        member = self.data_manager.get_member_stats(member_id)
+        if member.empty:
+            raise ValueError(f"Unknown member: {member_id}")
+        values = pd.to_numeric(member.iloc[0][ACTIVITY_COLUMNS], errors='coerce').fillna(0)
+        return {col: int(values[col]) for col in ACTIVITY_COLUMNS}
+
+    def _score(self, member_id):
+        """Compliance from the member's recent activity, against the network's most active members"""
+        activity = self.data_manager.activity
+        counts = pd.DataFrame([activity.counts(member_id, COMPLIANCE_WINDOW_DAYS)])
+        maxima = activity.maxima(COMPLIANCE_WINDOW_DAYS)
+        return float(calculate_compliance_score(counts, maxima).fillna(0).iloc[0])
+
+    def import_csv(self, source, progress=None):
+        return IngestManager(self.data_manager).ingest_members(source, progress=progress)
+
+    def resolve_profiles(self, force=False, progress=None, workers=MAX_CONCURRENT_REQUESTS):
+        """Validate every member's Spotify ID and store their public profile data"""
+        return ProfileResolver(self.data_manager, self.spotify_auth, workers=workers).resolve(force, progress)
+
+    def recompute_compliance(self, runner=None):
+        """Score every member's recent activity against the whole network in one batch update"""
+        if self.data_manager.members_df.empty:
+            return 0
+        updates = self._compliance_updates(runner)
+        self.data_manager.update_members(updates)
+        return len(updates)
+
+    def _compliance_updates(self, runner=None):
+        """member_id plus compliance_score for every member"""
+        members = self.data_manager.members_df
+        # Read from the sliding-window counters, so no raw events are scanned
+        activity = self.data_manager.activity.window(COMPLIANCE_WINDOW_DAYS, members['member_id'])
+
+        if runner:
+            # Sharded across worker processes
+            from reports import compliance_scores
+            return compliance_scores(runner, activity)
+
+        return pd.DataFrame({
+            'member_id': activity['member_id'],
+            'compliance_score': calculate_compliance_score(activity[ACTIVITY_COLUMNS]).fillna(0)
+        })
+
+    def get_performance_summary(self):
+        members = self.data_manager.get_member_stats()
+
+        if members.empty:
+            return {
+                'total_members': 0,
+                'total_streams_given': 0,
+                'total_posts_shared': 0,
+                'total_playlists_submitted': 0,
+                'avg_compliance_score': 0
+            }
+
+        return {
+            'total_members': len(members),
+            'total_streams_given': members['streams_given'].sum(),
+            'total_posts_shared': members['posts_shared'].sum(),
+            'total_playlists_submitted': members['playlists_submitted'].sum(),
+            'avg_compliance_score': members['compliance_score'].mean()
+        }
+
+
+class CuratorService:
+    def __init__(self, data_manager, spotify_auth=None):
+        self.data_manager = data_manager
+        self.spotify_auth = spotify_auth
+        self.matcher = CuratorMatcher(data_manager)
+
+    def add_curator(self, name, email=None, playlist_url=None, followers=0, notes=''):
+        """Validate and add a curator; raises ValueError for bad input or a duplicate"""
+        if not name:
+            raise ValueError("Please enter a curator name")
+
+        if email and not validate_email(email):
+            raise ValueError("Please enter a valid email address")
+
+        if playlist_url and not validate_spotify_url(playlist_url):
+            raise ValueError("Please enter a valid Spotify playlist URL")
+
+        duplicate_id = self.data_manager.find_duplicate_curator(email, playlist_url)
+        if duplicate_id:
+            existing = self.data_manager.get_curator_stats(duplicate_id).iloc[0]
+            raise ValueError(f"A curator with this playlist or email already exists: {existing['name']}")
+
+        curator_data = {
+            'curator_id': generate_id('curator_'),
+            'name': name,
+            'email': email,
+            'playlist_url': playlist_url,
+            'followers': followers,
+            'submission_status': 'Not Submitted',
+            'last_contacted': None,
+            'notes': notes
+        }
+        self.data_manager.add_curator(curator_data)
+        return curator_data
+
+    def update_curator(self, curator_id, status, followers, notes, mark_contacted=False):
+        update_data = {
+            'submission_status': status,
+            'followers': followers,
+            'notes': notes
+        }
+
+        if mark_contacted:
+            update_data['last_contacted'] = datetime.now().strftime('%Y-%m-%d')
+
+        self.data_manager.update_curator(curator_id, update_data)
+
+    def find_duplicates(self, threshold=0.8):
+        return find_duplicates(self.data_manager.get_curator_stats(), threshold=threshold)
+
+    def merge_duplicates(self, duplicates, confirmed=()):
+        return merge_duplicates(self.data_manager, duplicates, confirmed)
+
+    def build_profiles(self, sp_client=None):
+        return self.matcher.build_profiles(self.spotify_auth, sp_client)
+
+    def rank(self, track_ids=None, k=20):
+        return self.matcher.rank(track_ids, k=k)
+
+    def get_summary(self):
+        curators = self.data_manager.get_curator_stats()
+
+        if curators.empty:
+            return {
+                'total_curators': 0,
+                'total_followers': 0,
+                'submission_stats': {status: 0 for status in CURATOR_STATUSES}
+            }
+
+        submission_stats = curators['submission_status'].value_counts().to_dict()
+
+        return {
+            'total_curators': len(curators),
+            'total_followers': curators['followers'].sum(),
+            'submission_stats': submission_stats
+        }
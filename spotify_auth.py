@@ -45,6 +45,18 @@ class SpotifyAuthManager:
             sp_client = self.get_spotify_client()
         return sp_client.current_user_playlists()
     
+    def get_public_profile(self, user_id, sp_client=None):
+        """Display name, follower count and public playlist count for a user"""
+        if not sp_client:
+            sp_client = self.get_spotify_client()
+        user = sp_client.user(user_id)
+        playlists = sp_client.user_playlists(user_id, limit=1)
+        return {
+            'display_name': user.get('display_name') or '',
+            'followers': (user.get('followers') or {}).get('total') or 0,
+            'playlists': playlists.get('total') or 0
+        }
+    
     def get_track_info(self, track_id, sp_client=None):
         if not sp_client:
             sp_client = self.get_spotify_client()
@@ -53,4 +65,24 @@ class SpotifyAuthManager:
     def get_track_audio_features(self, track_id, sp_client=None):
         if not sp_client:
             sp_client = self.get_spotify_client()
-        return sp_client.audio_features([track_id])[0]
\ No newline at end of file
+        return sp_client.audio_features([track_id])[0]
+    
+    def get_tracks_audio_features(self, track_ids, sp_client=None):
+        """Fetch audio features for many tracks, 100 ids per request"""
+        if not sp_client:
+            sp_client = self.get_spotify_client()
+        features = []
+        for start in range(0, len(track_ids), 100):
+            features.extend(sp_client.audio_features(track_ids[start:start + 100]))
+        return features
+    
+    def get_playlist_track_ids(self, playlist_id, sp_client=None):
+        """Return the ids of every track in a playlist, following pagination"""
+        if not sp_client:
+            sp_client = self.get_spotify_client()
+        track_ids = []
+        page = sp_client.playlist_items(playlist_id, fields='items(track(id)),next', additional_types=['track'])
+        while page:
+            track_ids.extend(item['track']['id'] for item in page['items'] if item.get('track') and item['track'].get('id'))
+            page = sp_client.next(page) if page.get('next') else None
+        return track_ids
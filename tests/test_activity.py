@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from datetime import date, datetime, timedelta
+import activity
+from activity import ActivityLog
+
+
+def days_ago(days):
+    return datetime.combine(date.today() - timedelta(days=days), datetime.min.time()).replace(hour=12)
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = ActivityLog(tmp_path)
+    log.record('m1', streams_given=1, at=days_ago(5))
+    log.record('m1', streams_given=10, at=days_ago(20))
+    log.record('m1', streams_given=100, at=days_ago(60))
+    log.record('m1', streams_given=1000, at=days_ago(120))
+    log.record_many(pd.DataFrame({'member_id': ['m2'], 'posts_shared': [3]}), at=days_ago(1))
+    return log
+
+
+def test_counts_cover_each_window(log):
+    assert log.counts('m1', days=7)['streams_given'] == 1
+    assert log.counts('m1', days=30)['streams_given'] == 11
+    assert log.counts('m1', days=90)['streams_given'] == 111
+    assert log.maxima(days=30) == {'streams_given': 11, 'posts_shared': 3, 'playlists_submitted': 0}
+    assert log.window(days=7, member_ids=['m2', 'm3'])['posts_shared'].tolist() == [3, 0]
+
+
+def test_negative_counts_are_rejected(log):
+    with pytest.raises(ValueError):
+        log.record('m1', streams_given=-1)
+
+
+def test_events_expire_as_days_pass(log, monkeypatch):
+    class Later(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=3)
+    monkeypatch.setattr(activity, 'date', Later)
+
+    assert log.counts('m1', days=7)['streams_given'] == 0
+    assert log.counts('m1', days=30)['streams_given'] == 11
+    assert log.window(days=7)['posts_shared'].tolist() == [0, 3]
+
+
+def test_windows_are_rebuilt_from_the_log_files(log, tmp_path):
+    reopened = ActivityLog(tmp_path)
+    for days in (7, 30, 90):
+        assert reopened.window(days=days).equals(log.window(days=days))
@@ -0,0 +1,23 @@
+from api import StoreApi
+from workspace_manager import WorkspaceManager
+
+
+def add_track(workspaces, track_id):
+    workspaces.open('default').add_track({'track_id': track_id, 'name': track_id, 'streams': 10, 'saves': 1,
+                                          'playlist_adds': 0, 'release_date': '2026-01-01'})
+
+
+def test_workspace_list_etag_follows_the_files(tmp_path):
+    workspaces = WorkspaceManager(tmp_path)
+    add_track(workspaces, 't1')
+    api = StoreApi(workspaces)
+
+    status, headers, _ = api.handle('/workspaces')
+    etag = dict(headers)['ETag']
+    assert status == 200
+    # A restarted server derives the same ETag from the unchanged files
+    assert StoreApi(WorkspaceManager(tmp_path)).handle('/workspaces', etag)[0] == 304
+
+    add_track(workspaces, 't2')
+    status, headers, _ = api.handle('/workspaces', etag)
+    assert status == 200 and dict(headers)['ETag'] != etag
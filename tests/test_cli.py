@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+def loaded_modules(code):
+    """Heavy modules imported by running code in a fresh interpreter"""
+    script = (f"import sys; sys.path.insert(0, {str(REPO_DIR)!r}); import cli; {code}; "
+              "print(','.join(m for m in ('pandas', 'duckdb', 'parallel', 'concurrent.futures.process') "
+              "if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return set(filter(None, result.stdout.strip().rpartition('\n')[2].split(',')))
+
+
+def test_parsing_arguments_imports_nothing_heavy():
+    assert loaded_modules("cli.build_parser().parse_args(['undo'])") == set()
+
+
+def test_jobs_import_only_what_they_use(tmp_path):
+    assert loaded_modules(f"cli.main(['--data-dir', {str(tmp_path)!r}, 'recompute', 'compliance'])") == {'pandas'}
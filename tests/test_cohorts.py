@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from cohorts import CohortEngine
+from data_manager import DataManager
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    data_manager = DataManager(tmp_path)
+    # Both released in the week starting Monday 2026-01-05; added in bulk, which takes no snapshot of today
+    data_manager.add_tracks(pd.DataFrame({'track_id': ['t1', 't2'], 'name': ['One', 'Two'],
+                                          'release_date': ['2026-01-05', '2026-01-07'], 'streams': 0}))
+    return data_manager
+
+
+def snapshots(track_id, dates, streams):
+    return pd.DataFrame({'track_id': track_id, 'date': dates, 'streams': streams, 'saves': 0, 'playlist_adds': 0})
+
+
+def test_milestones_are_interpolated_and_averaged_per_week(data_manager):
+    data_manager.record_track_history(snapshots('t1', ['2026-01-05', '2026-01-19'], [0, 1400]))
+    data_manager.record_track_history(snapshots('t2', ['2026-01-07', '2026-01-14'], [0, 300]))
+    engine = CohortEngine(data_manager)
+
+    tracks = engine.get_track_milestones()
+    assert tracks.loc['t1', 'day_7'] == pytest.approx(700)
+    assert tracks.loc['t2', 'day_7'] == pytest.approx(300)
+    # Not reached yet
+    assert tracks[['day_28', 'day_90']].isna().all().all()
+
+    cohorts = engine.get_cohorts()
+    assert list(cohorts.index) == [pd.Timestamp('2026-01-05')]
+    assert cohorts.loc['2026-01-05', 'tracks'] == 2
+    assert cohorts.loc['2026-01-05', 'day_7'] == pytest.approx(500)
+
+
+def test_new_history_and_undo_update_the_cohorts(data_manager):
+    data_manager.record_track_history(snapshots('t1', ['2026-01-05', '2026-01-19'], [0, 1400]))
+    engine = CohortEngine(data_manager)
+    assert pd.isna(engine.get_cohorts().loc['2026-01-05', 'day_28'])
+
+    data_manager.record_track_history(snapshots('t1', ['2026-02-02'], [2800]))
+    assert engine.get_cohorts().loc['2026-01-05', 'day_28'] == pytest.approx(2800)
+
+    data_manager.undo()
+    assert pd.isna(engine.get_cohorts().loc['2026-01-05', 'day_28'])
+
+
+def test_moving_a_release_date_moves_the_track_between_weeks(data_manager):
+    engine = CohortEngine(data_manager)
+    assert engine.get_cohorts()['tracks'].to_dict() == {pd.Timestamp('2026-01-05'): 2}
+
+    data_manager.update_track('t2', {'release_date': '2026-01-14'})
+    assert engine.get_cohorts()['tracks'].to_dict() == {pd.Timestamp('2026-01-05'): 1,
+                                                       pd.Timestamp('2026-01-12'): 1}
@@ -0,0 +1,36 @@
+import bench
+from curator_dedupe import find_duplicates, merge_duplicates
+from data_manager import DataManager
+
+
+def add_curator(data_manager, curator_id, name, email='', playlist_url='', followers=0):
+    data_manager.add_curator({'curator_id': curator_id, 'name': name, 'email': email,
+                              'playlist_url': playlist_url, 'followers': followers})
+
+
+def test_name_only_matches_are_not_merged_without_confirmation(tmp_path):
+    data_manager = DataManager(tmp_path)
+    add_curator(data_manager, 'c1', 'Chill Vibes', 'a@example.com', followers=10)
+    add_curator(data_manager, 'c2', 'Chill Vibes', 'b@example.com', followers=5)
+    add_curator(data_manager, 'c3', 'Lofi Beats', 'c@example.com', followers=100)
+    add_curator(data_manager, 'c4', 'Lofi Beats Official', 'C@example.com ',
+                'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M', followers=50)
+
+    duplicates = find_duplicates(data_manager.get_curator_stats())
+    assert set(duplicates['match']) == {'key', 'name'}
+
+    # Only the shared email merges; its survivor takes the playlist it was missing
+    assert merge_duplicates(data_manager, duplicates) == 1
+    assert set(data_manager.curators_df['curator_id']) == {'c1', 'c2', 'c3'}
+    assert data_manager.get_curator_stats('c3').iloc[0]['playlist_url'].endswith('37i9dQZF1DXcBWIGoYBM5M')
+
+    name_cluster = duplicates.loc[duplicates['match'] == 'name', 'cluster'].iloc[0]
+    duplicates = find_duplicates(data_manager.get_curator_stats())
+    assert merge_duplicates(data_manager, duplicates, confirmed=[name_cluster]) == 1
+    assert set(data_manager.curators_df['curator_id']) == {'c1', 'c3'}
+
+
+def test_similar_names_alone_never_auto_merge():
+    duplicates = find_duplicates(bench.make_curators(2000))
+    assert not duplicates.empty
+    assert (duplicates['match'] == 'name').all()
@@ -0,0 +1,25 @@
+from audio_features import AudioFeatureStore, FEATURE_COLUMNS
+from curator_matching import CuratorMatcher
+from data_manager import DataManager
+
+
+class FakeSpotify:
+    def get_spotify_client(self):
+        return None
+
+    def get_playlist_track_ids(self, playlist_id, sp_client=None):
+        return ['playlist_track_1', 'playlist_track_2']
+
+    def get_tracks_audio_features(self, track_ids, sp_client=None):
+        return [{'id': track_id, **{col: 0.5 for col in FEATURE_COLUMNS}} for track_id in track_ids]
+
+
+def test_playlist_tracks_stay_out_of_the_catalog_features(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.add_curator({'curator_id': 'c1', 'name': 'Chill Vibes',
+                              'playlist_url': 'https://open.spotify.com/playlist/37i9dQZF1DXcBWIGoYBM5M'})
+
+    assert CuratorMatcher(data_manager).build_profiles(FakeSpotify()) == 1
+    assert len(AudioFeatureStore(tmp_path)) == 0
+    assert len(AudioFeatureStore(tmp_path, 'playlist_track_features.npz')) == 2
+    assert 'c1' in AudioFeatureStore(tmp_path, 'curator_profiles.npz')
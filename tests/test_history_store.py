@@ -0,0 +1,40 @@
+import pandas as pd
+from data_manager import DataManager
+
+
+def snapshots(dates, streams):
+    return pd.DataFrame({'track_id': 't1', 'date': dates, 'streams': streams, 'saves': 0, 'playlist_adds': 0})
+
+
+def test_a_save_rewrites_only_the_months_it_touched(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.record_track_history(snapshots(['2026-01-31', '2026-02-01'], [10, 20]))
+    january = tmp_path / 'history' / '2026-01.csv'
+    stamp = january.stat().st_mtime_ns
+
+    data_manager.record_track_history(snapshots(['2026-02-02'], [30]))
+    assert january.stat().st_mtime_ns == stamp
+    assert len(pd.read_csv(tmp_path / 'history' / '2026-02.csv')) == 2
+    assert len(DataManager(tmp_path).history_df) == 3
+
+
+def test_undo_removes_a_month_left_empty(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.record_track_history(snapshots(['2026-01-31'], [10]))
+    data_manager.record_track_history(snapshots(['2026-03-01'], [20]))
+    data_manager.undo()
+
+    assert not (tmp_path / 'history' / '2026-03.csv').exists()
+    assert list(DataManager(tmp_path).history_df['date']) == ['2026-01-31']
+
+
+def test_single_file_history_is_split_on_the_next_write(tmp_path):
+    legacy = snapshots(['2026-01-31', '2026-02-01'], [10, 20])
+    legacy['snapshot_id'] = 't1:' + legacy['date']
+    legacy.to_csv(tmp_path / 'history.csv', index=False)
+
+    data_manager = DataManager(tmp_path)
+    data_manager.record_track_history(snapshots(['2026-02-02'], [30]))
+
+    assert not (tmp_path / 'history.csv').exists()
+    assert sorted(p.name for p in (tmp_path / 'history').glob('*.csv')) == ['2026-01.csv', '2026-02.csv']
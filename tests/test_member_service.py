@@ -0,0 +1,56 @@
+import pytest
+from data_manager import DataManager
+from activity import ActivityLog
+from services import MemberService
+
+
+@pytest.fixture
+def service(tmp_path):
+    data_manager = DataManager(tmp_path)
+    service = MemberService(data_manager)
+    for member_id in ('member_1', 'member_2'):
+        data_manager.add_member({'member_id': member_id, 'name': member_id, 'streams_given': 0,
+                                 'posts_shared': 0, 'playlists_submitted': 0, 'compliance_score': 100})
+    return service
+
+
+def score(service, member_id):
+    return float(service.data_manager.get_member_stats(member_id).iloc[0]['compliance_score'])
+
+
+def test_single_member_update_is_scored_against_the_network(service):
+    service.update_activity('member_1', 100, 10, 10)
+    service.update_activity('member_2', 25, 5, 0)
+
+    # member_2 is normalized against member_1's activity, not against its own row
+    assert score(service, 'member_1') == pytest.approx(100)
+    assert score(service, 'member_2') == pytest.approx((0.25 * 0.4 + 0.5 * 0.3) * 100)
+
+
+def test_row_update_matches_bulk_recompute(service):
+    service.update_activity('member_1', 100, 10, 10)
+    service.log_activity('member_2', 50, 2, 1)
+    row_score = score(service, 'member_2')
+
+    service.recompute_compliance()
+    assert score(service, 'member_2') == pytest.approx(row_score)
+
+
+def test_new_network_maximum_rescores_every_member(service):
+    service.log_activity('member_1', 50, 5, 5)
+    service.log_activity('member_2', 100, 5, 5)
+
+    # member_1 was at the top until member_2 doubled its streams
+    assert score(service, 'member_1') == pytest.approx((0.5 * 0.4 + 0.3 + 0.3) * 100)
+    assert score(service, 'member_2') == pytest.approx(100)
+
+
+def test_undo_takes_back_logged_activity(service):
+    service.log_activity('member_1', 10, 1, 1)
+    service.update_activity('member_1', 30, 1, 1)
+    service.data_manager.undo()
+
+    expected = {'streams_given': 10, 'posts_shared': 1, 'playlists_submitted': 1}
+    assert service.data_manager.activity.counts('member_1') == expected
+    # The retraction is in the event files too, so a reload agrees
+    assert ActivityLog(service.data_manager.data_dir).counts('member_1') == expected
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+from datetime import datetime, timedelta
+from data_manager import DataManager
+from services import TrackService
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    data_manager = DataManager(tmp_path)
+    released = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
+    data_manager.add_track({'track_id': 't1', 'name': 'Song', 'release_date': released,
+                            'streams': 100, 'saves': 5, 'playlist_adds': 2})
+    return data_manager
+
+
+def track(data_manager):
+    return data_manager.get_track_stats('t1').iloc[0]
+
+
+def test_metric_columns_follow_writes(data_manager):
+    assert track(data_manager)['save_rate'] == pytest.approx(5)
+    assert track(data_manager)['adds_per_1k'] == pytest.approx(20)
+    assert track(data_manager)['stream_velocity'] == pytest.approx(10)
+
+    data_manager.update_tracks(pd.DataFrame({'track_id': ['t1'], 'streams': [200]}))
+    assert track(data_manager)['save_rate'] == pytest.approx(2.5)
+    assert track(data_manager)['stream_velocity'] == pytest.approx(20)
+
+
+def test_stale_stream_velocity_is_refreshed(data_manager, tmp_path):
+    # As if the stored value had been computed days ago
+    stored = pd.read_csv(tmp_path / 'tracks.csv')
+    stored['stream_velocity'] = 50.0
+    stored.to_csv(tmp_path / 'tracks.csv', index=False)
+    data_manager.tracks_df['stream_velocity'] = 50.0
+
+    assert track(DataManager(tmp_path))['stream_velocity'] == pytest.approx(10)
+
+    TrackService(data_manager).snapshot_stats()
+    assert pd.read_csv(tmp_path / 'tracks.csv')['stream_velocity'].iloc[0] == pytest.approx(10)
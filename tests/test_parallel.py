@@ -0,0 +1,28 @@
+import pandas as pd
+from parallel import ParallelRunner
+from reports import compliance_scores, _encode_jsonl
+
+
+def members(rows=200):
+    return pd.DataFrame({
+        'member_id': [f'member_{i}' for i in range(rows)],
+        # Mixed ints and text, as read from hand-edited files
+        'note': [i if i % 3 else f'n{i}' for i in range(rows)],
+        'streams_given': range(rows),
+        'posts_shared': [i % 7 for i in range(rows)],
+        'playlists_submitted': [i % 5 for i in range(rows)]
+    })
+
+
+def run(workers, task, df):
+    with ParallelRunner(max_workers=workers, shard_rows=50) as runner:
+        return task(runner, df)
+
+
+def test_output_does_not_depend_on_worker_count():
+    def encode(runner, df):
+        return runner.map_shards(df, _encode_jsonl)
+
+    df = members()
+    assert run(1, encode, df) == run(2, encode, df)
+    pd.testing.assert_frame_equal(run(1, compliance_scores, df), run(2, compliance_scores, df))
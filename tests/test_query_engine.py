@@ -0,0 +1,34 @@
+import pytest
+from data_manager import DataManager
+from query_engine import QueryEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.add_member({'member_id': 'member_1', 'name': 'Ada', 'streams_given': 3})
+    return QueryEngine(data_manager)
+
+
+def test_select_reads_registered_tables(engine):
+    result = engine.query("SELECT name, streams_given FROM members")
+    assert result['data'].to_dict('records') == [{'name': 'Ada', 'streams_given': 3}]
+
+
+@pytest.mark.parametrize('sql', [
+    "SELECT * FROM read_text('/etc/hostname')",
+    "SELECT * FROM read_csv('/etc/passwd')",
+])
+def test_file_access_is_rejected(engine, sql):
+    with pytest.raises(engine._duckdb.PermissionException):
+        engine.query(sql)
+
+
+def test_sandbox_cannot_be_disabled(engine):
+    with pytest.raises(ValueError):
+        engine.query("SET enable_external_access = true")
+
+
+def test_trailing_comment_is_allowed(engine):
+    result = engine.query("SELECT name FROM members -- every member")
+    assert list(result['data']['name']) == ['Ada']
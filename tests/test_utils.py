@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+from utils import extract_spotify_id, extract_spotify_ids, extract_spotify_user_id, extract_spotify_user_ids
+
+USER_REFS = [
+    ('https://open.spotify.com/user/abc', 'abc'),
+    ('open.spotify.com/user/abc', 'abc'),
+    ('http://open.spotify.com/user/abc?si=123', 'abc'),
+    ('https://open.spotify.com/intl-de/user/john.doe/', 'john.doe'),
+    ('spotify:user:abc', 'abc'),
+    ('john.doe', 'john.doe'),
+    ('open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC', None),
+    ('not a user', None),
+]
+
+SPOTIFY_REFS = [
+    ('https://open.spotify.com/track/4uLU6hMCjMI75M1A2tKUQC?si=abc', '4uLU6hMCjMI75M1A2tKUQC'),
+    ('open.spotify.com/intl-de/playlist/37i9dQZF1DXcBWIGoYBM5M', '37i9dQZF1DXcBWIGoYBM5M'),
+    ('spotify:artist:0OdUWJ0sBjDrqHygGUXeCF', '0OdUWJ0sBjDrqHygGUXeCF'),
+    ('4uLU6hMCjMI75M1A2tKUQC', '4uLU6hMCjMI75M1A2tKUQC'),
+    ('https://open.spotify.com/album/4uLU6hMCjMI75M1A2tKUQC', None),
+    ('abc123', None),
+    ('not a link', None),
+]
+
+
+@pytest.mark.parametrize('value, expected', SPOTIFY_REFS)
+def test_extract_spotify_id(value, expected):
+    assert extract_spotify_id(value) == expected
+
+
+def test_extract_spotify_ids_matches_per_value():
+    values = pd.Series([value for value, _ in SPOTIFY_REFS] + [None])
+    assert extract_spotify_ids(values).tolist() == [extract_spotify_id(value) for value in values]
+
+
+@pytest.mark.parametrize('value, expected', USER_REFS)
+def test_extract_spotify_user_id(value, expected):
+    assert extract_spotify_user_id(value) == expected
+
+
+def test_extract_spotify_user_ids_matches_per_value():
+    values = pd.Series([value for value, _ in USER_REFS] + [None])
+    expected = [expected for _, expected in USER_REFS] + [None]
+    assert extract_spotify_user_ids(values).tolist() == expected
@@ -0,0 +1,54 @@
+import time
+import pytest
+from data_manager import DataManager
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    data_manager = DataManager(tmp_path)
+    data_manager.add_curator({'curator_id': 'c1', 'name': 'Ann', 'status': 'Not Submitted'})
+    data_manager.add_curator({'curator_id': 'c2', 'name': 'Bob', 'status': 'Not Submitted'})
+    return data_manager
+
+
+def curators(df):
+    return df.set_index('curator_id')['status'].sort_index().to_dict()
+
+
+def test_as_of_rebuilds_earlier_states(data_manager):
+    first = data_manager.versions.head
+    middle = time.time()
+    data_manager.update_curator('c1', {'status': 'Submitted'})
+    data_manager.delete_curators(['c2'])
+
+    assert curators(data_manager.as_of('curators', commit=first)) == {'c1': 'Not Submitted', 'c2': 'Not Submitted'}
+    assert curators(data_manager.as_of('curators', at=middle)) == {'c1': 'Not Submitted', 'c2': 'Not Submitted'}
+    assert curators(data_manager.as_of('curators', commit=first + 1)) == {'c1': 'Submitted', 'c2': 'Not Submitted'}
+    assert curators(data_manager.as_of('curators', commit=1)) == {'c1': 'Not Submitted'}
+    assert curators(data_manager.as_of('curators', commit=0)) == {}
+    assert curators(data_manager.curators_df) == {'c1': 'Submitted'}
+
+
+def test_undo_restores_updated_deleted_and_added_rows(data_manager):
+    data_manager.update_curator('c1', {'status': 'Submitted'})
+    data_manager.delete_curators(['c2'])
+
+    assert data_manager.undo()['table'] == 'curators'
+    assert curators(data_manager.curators_df) == {'c1': 'Submitted', 'c2': 'Not Submitted'}
+    data_manager.undo()
+    assert curators(data_manager.curators_df) == {'c1': 'Not Submitted', 'c2': 'Not Submitted'}
+    data_manager.undo()
+    assert curators(data_manager.curators_df) == {'c1': 'Not Submitted'}
+    data_manager.undo()
+    assert data_manager.curators_df.empty
+    assert data_manager.undo() is None
+
+
+def test_history_is_kept_across_reopening(data_manager, tmp_path):
+    data_manager.update_curator('c1', {'status': 'Submitted'})
+
+    reopened = DataManager(tmp_path)
+    assert len(reopened.versions.commits) == 3
+    assert curators(reopened.as_of('curators', commit=2)) == {'c1': 'Not Submitted', 'c2': 'Not Submitted'}
+    reopened.undo()
+    assert curators(DataManager(tmp_path).curators_df) == {'c1': 'Not Submitted', 'c2': 'Not Submitted'}
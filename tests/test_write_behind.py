@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import pytest
+from data_manager import DataManager
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+
+def run(script, data_dir):
+    """Run a script in a fresh interpreter, as a separate app process would"""
+    code = f"import sys; sys.path.insert(0, {str(REPO_DIR)!r})\n" + textwrap.dedent(script)
+    subprocess.run([sys.executable, '-c', code, str(data_dir)], check=True, cwd=REPO_DIR)
+
+
+def member(member_id):
+    return {'member_id': member_id, 'name': member_id, 'streams_given': 1, 'posts_shared': 0,
+            'playlists_submitted': 0, 'compliance_score': 100}
+
+
+def test_journaled_mutations_survive_a_crash(tmp_path):
+    run("""
+        import os, sys
+        from data_manager import DataManager
+        data_manager = DataManager(sys.argv[1], write_behind=True, flush_interval=3600)
+        data_manager.add_member({'member_id': 'member_1', 'name': 'Ada'})
+        os._exit(0)  # exits like a killed process: no flush, no atexit handlers
+    """, tmp_path)
+
+    # The next writer replays the journal left behind
+    recovered = DataManager(tmp_path, write_behind=True)
+    recovered.close()
+    assert DataManager(tmp_path).members_df['member_id'].tolist() == ['member_1']
+
+
+def test_second_writer_on_a_directory_is_refused(tmp_path):
+    first = DataManager(tmp_path, write_behind=True, flush_interval=3600)
+    first.add_member(member('member_1'))
+    with pytest.raises(RuntimeError):
+        DataManager(tmp_path, write_behind=True)
+
+    # The refused writer left the live journal alone
+    assert (tmp_path / 'journal.jsonl').stat().st_size > 0
+    first.close()
+
+    second = DataManager(tmp_path, write_behind=True)
+    assert second.members_df['member_id'].tolist() == ['member_1']
+    second.close()
+
+
+def test_last_flush_at_exit_keeps_undo_history(tmp_path):
+    run("""
+        import sys
+        from data_manager import DataManager
+        data_manager = DataManager(sys.argv[1], write_behind=True, flush_interval=3600)
+        data_manager.add_member({'member_id': 'member_1', 'name': 'Ada'})
+        # Normal exit: the atexit handler does the final flush
+    """, tmp_path)
+
+    data_manager = DataManager(tmp_path)
+    assert data_manager.members_df['member_id'].tolist() == ['member_1']
+    commit = data_manager.undo()
+    assert commit is not None and commit['table'] == 'members'
+    assert data_manager.members_df.empty
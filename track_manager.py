@@ -1,12 +1,17 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from utils import generate_id, format_number, format_date, validate_spotify_url, extract_spotify_id
+from utils import format_number, format_date, validate_spotify_url, extract_spotify_id
+from audio_features import AudioFeatureIndex, FEATURE_COLUMNS
+from services import TrackService
 
 class TrackManager:
     def __init__(self, data_manager, spotify_auth):
         self.data_manager = data_manager
         self.spotify_auth = spotify_auth
+        self.service = TrackService(data_manager, spotify_auth)
+        self.audio_features = self.service.audio_features
+        self._feature_index = None
         
     def render_track_form(self):
         """Render form for adding new track"""
@@ -24,34 +29,35 @@ class TrackManager:
             submitted = st.form_submit_button("Add Track")
             
             if submitted:
-                if not validate_spotify_url(track_url):
-                    st.error("Please enter a valid Spotify track URL")
-                    return
-                
-                track_id = extract_spotify_id(track_url)
-                
                 try:
                     # Get track details from Spotify
-                    sp_client = self.spotify_auth.get_spotify_client()
-                    track_info = self.spotify_auth.get_track_info(track_id, sp_client)
-                    
-                    track_data = {
-                        'track_id': generate_id('track_'),
-                        'spotify_id': track_id,
-                        'name': track_info['name'],
-                        'artist': artist_name or track_info['artists'][0]['name'],
-                        'release_date': release_date.strftime('%Y-%m-%d'),
-                        'streams': initial_streams,
-                        'saves': 0,
-                        'playlist_adds': 0
-                    }
-                    
-                    self.data_manager.add_track(track_data)
+                    self.service.add_from_spotify(track_url, artist_name, release_date, initial_streams)
                     st.success("Track added successfully!")
                     
+                except ValueError as e:
+                    st.error(str(e))
                 except Exception as e:
                     st.error(f"Error adding track: {str(e)}")
     
+    def render_import_form(self):
+        """Render bulk CSV import for tracks"""
+        uploaded = st.file_uploader("Spotify for Artists export (CSV)", type=["csv"], key="import-tracks-csv")
+        
+        if uploaded is not None and st.button("Import Tracks"):
+            progress_bar = st.progress(0.0, text="Importing...")
+            
+            def report_progress(rows_read, fraction):
+                progress_bar.progress(fraction or 0.0, text=f"{rows_read:,} rows read")
+            
+            try:
+                result = self.service.import_csv(uploaded, progress=report_progress)
+                st.success(
+                    f"Imported {result['inserted']} new and updated {result['updated']} tracks "
+                    f"({result['rejected']} invalid rows skipped)"
+                )
+            except ValueError as e:
+                st.error(f"Error importing tracks: {str(e)}")
+    
     def render_track_list(self):
         """Render list of tracks with stats"""
         tracks = self.data_manager.get_track_stats()
@@ -66,8 +72,10 @@ class TrackManager:
         with col1:
             sort_by = st.selectbox(
                 "Sort by",
-                ["release_date", "streams", "saves", "playlist_adds"],
-                index=0
+                ["release_date", "streams", "saves", "playlist_adds",
+                 "save_rate", "adds_per_1k", "stream_velocity"],
+                index=0,
+                key="track_sort"
             )
         
         with col2:
@@ -80,90 +88,137 @@ class TrackManager:
         with col3:
             search = st.text_input("Search tracks", "")
         
-        # Apply filters and sorting
+        # Sort through the data manager's cached sort index, then filter
+        tracks = self.data_manager.sorted_tracks(sort_by, ascending=(sort_order == "Ascending"))
+        
         if search:
             tracks = tracks[tracks['name'].str.contains(search, case=False) |
                            tracks['artist'].str.contains(search, case=False)]
         
-        tracks = tracks.sort_values(
-            by=sort_by,
-            ascending=(sort_order == "Ascending")
-        )
-        
         # Display tracks in an expandable format
-        for _, track in tracks.iterrows():
-            with st.expander(f"{track['name']} - {track['artist']}"):
-                col1, col2, col3, col4 = st.columns(4)
+        # Each row is a fragment, so submitting its form only reruns that row
+        for track_id in tracks['track_id']:
+            self._render_track_row(track_id)
+    
+    @st.fragment
+    def _render_track_row(self, track_id):
+        """Render a single track with its update form"""
+        tracks = self.data_manager.get_track_stats(track_id)
+        if tracks.empty:
+            return
+        track = tracks.iloc[0]
+        
+        with st.expander(f"{track['name']} - {track['artist']}"):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Streams", format_number(track['streams']))
+            
+            with col2:
+                st.metric("Saves", format_number(track['saves']))
+            
+            with col3:
+                st.metric("Playlist Adds", format_number(track['playlist_adds']))
+            
+            with col4:
+                st.metric("Save Rate", f"{track['save_rate']:.1f}%")
+            
+            # Update form
+            with st.form(f"update_track_{track['track_id']}"):
+                col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    st.metric("Streams", format_number(track['streams']))
+                    new_streams = st.number_input(
+                        "Update Streams",
+                        min_value=0,
+                        value=int(track['streams'])
+                    )
                 
                 with col2:
-                    st.metric("Saves", format_number(track['saves']))
+                    new_saves = st.number_input(
+                        "Update Saves",
+                        min_value=0,
+                        value=int(track['saves'])
+                    )
                 
                 with col3:
-                    st.metric("Playlist Adds", format_number(track['playlist_adds']))
+                    new_playlist_adds = st.number_input(
+                        "Update Playlist Adds",
+                        min_value=0,
+                        value=int(track['playlist_adds'])
+                    )
                 
-                with col4:
-                    save_rate = (track['saves'] / track['streams'] * 100) if track['streams'] > 0 else 0
-                    st.metric("Save Rate", f"{save_rate:.1f}%")
-                
-                # Update form
-                with st.form(f"update_track_{track['track_id']}"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        new_streams = st.number_input(
-                            "Update Streams",
-                            min_value=0,
-                            value=int(track['streams'])
-                        )
-                    
-                    with col2:
-                        new_saves = st.number_input(
-                            "Update Saves",
-                            min_value=0,
-                            value=int(track['saves'])
-                        )
-                    
-                    with col3:
-                        new_playlist_adds = st.number_input(
-                            "Update Playlist Adds",
-                            min_value=0,
-                            value=int(track['playlist_adds'])
-                        )
-                    
-                    if st.form_submit_button("Update Stats"):
-                        update_data = {
-                            'streams': new_streams,
-                            'saves': new_saves,
-                            'playlist_adds': new_playlist_adds
-                        }
-                        
-                        self.data_manager.update_track(track['track_id'], update_data)
-                        st.success("Track stats updated successfully!")
-                        st.rerun()
+                if st.form_submit_button("Update Stats"):
+                    self.service.update_stats(track['track_id'], new_streams, new_saves, new_playlist_adds)
+                    st.success("Track stats updated successfully!")
+                    # A list sorted by a stat has to be reordered, so only then is the whole page rerun
+                    st.rerun(scope="fragment" if st.session_state.get('track_sort') == "release_date" else "app")
     
-    def get_track_performance_summary(self):
-        """Get summary of track performance"""
+    def render_similarity_section(self):
+        """Render sound-alike search over stored audio features"""
         tracks = self.data_manager.get_track_stats()
         
-        if tracks.empty:
-            return {
-                'total_tracks': 0,
-                'total_streams': 0,
-                'total_saves': 0,
-                'total_playlists': 0,
-                'avg_save_rate': 0
-            }
-        
-        total_streams = tracks['streams'].sum()
-        total_saves = tracks['saves'].sum()
-        
-        return {
-            'total_tracks': len(tracks),
-            'total_streams': total_streams,
-            'total_saves': total_saves,
-            'total_playlists': tracks['playlist_adds'].sum(),
-            'avg_save_rate': (total_saves / total_streams * 100) if total_streams > 0 else 0
-        }
\ No newline at end of file
+        if tracks.empty or 'spotify_id' not in tracks.columns:
+            st.info("Add tracks to search by sound.")
+            return
+        
+        spotify_ids = tracks['spotify_id'].dropna().tolist()
+        missing = [i for i in spotify_ids if i not in self.audio_features]
+        
+        if missing and st.button(f"Fetch Audio Features ({len(missing)} tracks)"):
+            try:
+                fetched = self.service.refresh_audio_features()
+                self._feature_index = None
+                st.success(f"Stored audio features for {fetched} tracks")
+            except Exception as e:
+                st.error(f"Error fetching audio features: {str(e)}")
+        
+        index = self._get_feature_index()
+        if index is None:
+            st.info("No audio features stored yet.")
+            return
+        
+        col1, col2 = st.columns(2)
+        names = dict(zip(tracks['spotify_id'], tracks['name']))
+        
+        with col1:
+            selected = st.selectbox(
+                "Tracks like this one",
+                [i for i in spotify_ids if i in self.audio_features],
+                format_func=lambda i: names.get(i, i)
+            )
+            if selected:
+                similar_ids, scores = index.similar_to(selected, k=5)
+                for similar_id, score in zip(similar_ids, scores):
+                    st.write(f"{names.get(similar_id, similar_id)} ({score:.2f})")
+        
+        with col2:
+            reference_url = st.text_input("Which of our tracks fit this sound? (Spotify track URL)")
+            if reference_url:
+                if not validate_spotify_url(reference_url):
+                    st.error("Please enter a valid Spotify track URL")
+                    return
+                try:
+                    features = self.spotify_auth.get_tracks_audio_features([extract_spotify_id(reference_url)])[0]
+                except Exception as e:
+                    st.error(f"Error fetching audio features: {str(e)}")
+                    return
+                if not features:
+                    st.warning("Spotify has no audio features for this track")
+                    return
+                vector = [features.get(col) or 0.0 for col in FEATURE_COLUMNS]
+                match_ids, scores = index.query(vector, k=5)
+                for match_id, score in zip(match_ids[0], scores[0]):
+                    st.write(f"{names.get(match_id, match_id)} ({score:.2f})")
+    
+    def _get_feature_index(self):
+        """Build the catalog index once per stored feature set"""
+        if len(self.audio_features) == 0:
+            return None
+        if self._feature_index is None or len(self._feature_index.ids) != len(self.audio_features):
+            self._feature_index = AudioFeatureIndex.from_store(self.audio_features)
+        return self._feature_index
+    
+    def get_track_performance_summary(self):
+        """Get summary of track performance"""
+        return self.service.get_performance_summary()
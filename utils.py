@@ -1,7 +1,26 @@
+import re
 import uuid
 from datetime import datetime
 import pandas as pd
 
+# Patterns are compiled once at import. The Series variants below run the same patterns through
+# Arrow's regex kernels, a whole column per call (named groups only, RE2 syntax).
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_SPOTIFY_URL_PATTERN = re.compile(r'^https://open\.spotify\.com/(?:track|playlist|artist)/[a-zA-Z0-9]+')
+# A profile URL (scheme optional) or spotify:user: URI, or a bare ID
+_SPOTIFY_USER_PATTERN = re.compile(
+    r'^\s*(?:(?:https?://)?(?:www\.)?open\.spotify\.com/(?:intl-[a-zA-Z-]+/)?user/|spotify:user:)?'
+    r'(?P<id>[A-Za-z0-9._-]{1,64})(?:[/?#].*)?\s*$')
+# Other Spotify URLs match the bare-ID form with their hostname as the ID; those aren't user IDs
+_SPOTIFY_HOST_PATTERN = re.compile(r'(?:^|\.)spotify\.com$')
+# An open.spotify.com URL (any scheme, locale or embed prefix, query string) or spotify:<kind>: URI, or a bare ID;
+# track, playlist and artist IDs are always 22 base62 characters
+_SPOTIFY_REF_PATTERN = re.compile(
+    r'^\s*(?:(?:https?://)?open\.spotify\.com/(?:intl-[a-zA-Z-]+/)?(?:embed/)?(?P<url_kind>[a-z]+)/'
+    r'|spotify:(?P<uri_kind>[a-z]+):)?(?P<id>[a-zA-Z0-9]{22})/?(?:[?#].*)?\s*$')
+
+SPOTIFY_KINDS = ('track', 'playlist', 'artist')
+
 def generate_id(prefix=''):
     """Generate a unique ID with optional prefix"""
     return f"{prefix}{str(uuid.uuid4())[:8]}"
@@ -14,18 +33,22 @@ def format_number(number):
         return f"{number/1_000:.1f}K"
     return str(number)
 
-def calculate_compliance_score(member_data):
-    """Calculate member compliance score based on activity"""
+def calculate_compliance_score(member_data, maxima=None):
+    """Calculate member compliance score based on activity (maxima overrides the normalizers)"""
     weights = {
         'streams_given': 0.4,
         'posts_shared': 0.3,
         'playlists_submitted': 0.3
     }
     
-    # Get maximum values for normalization
-    max_streams = max(member_data['streams_given']) if len(member_data) > 0 else 1
-    max_posts = max(member_data['posts_shared']) if len(member_data) > 0 else 1
-    max_playlists = max(member_data['playlists_submitted']) if len(member_data) > 0 else 1
+    # Get maximum values for normalization (a column of zeros normalizes to zero, not NaN)
+    max_streams = (max(member_data['streams_given']) or 1) if len(member_data) > 0 else 1
+    max_posts = (max(member_data['posts_shared']) or 1) if len(member_data) > 0 else 1
+    max_playlists = (max(member_data['playlists_submitted']) or 1) if len(member_data) > 0 else 1
+    if maxima:
+        max_streams = maxima['streams_given'] or 1
+        max_posts = maxima['posts_shared'] or 1
+        max_playlists = maxima['playlists_submitted'] or 1
     
     # Calculate normalized scores
     normalized_streams = member_data['streams_given'] / max_streams
@@ -63,25 +86,106 @@ def format_percentage(value):
 
 def validate_email(email):
     """Simple email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_PATTERN.match(email))
 
 def validate_spotify_url(url):
     """Validate Spotify URL format"""
-    import re
-    pattern = r'^https://open\.spotify\.com/(?:track|playlist|artist)/[a-zA-Z0-9]+'
-    return bool(re.match(pattern, url))
+    return bool(_SPOTIFY_URL_PATTERN.match(url))
 
 def extract_spotify_id(url):
-    """Extract Spotify ID from URL"""
-    import re
-    match = re.search(r'/(?:track|playlist|artist)/([a-zA-Z0-9]+)', url)
-    return match.group(1) if match else None
+    """Extract Spotify ID from a URL, spotify: URI or bare ID (None if invalid), as extract_spotify_ids does"""
+    return parse_spotify_ref(url)[1]
+
+def extract_spotify_user_id(value):
+    """Extract a Spotify user ID from a profile URL, spotify:user: URI or bare ID (None if malformed)"""
+    if not isinstance(value, str):
+        return None
+    match = _SPOTIFY_USER_PATTERN.match(value)
+    if not match or _SPOTIFY_HOST_PATTERN.search(match.group('id')):
+        return None
+    return match.group('id')
+
+def parse_spotify_ref(value, kinds=SPOTIFY_KINDS, allow_bare=True):
+    """(kind, spotify_id) of one URL, URI or bare ID, as parse_spotify_refs does for a column"""
+    match = _SPOTIFY_REF_PATTERN.match(value) if isinstance(value, str) else None
+    if not match:
+        return None, None
+    kind = match.group('url_kind') or match.group('uri_kind')
+    if kind in kinds or (allow_bare and kind is None):
+        return kind, match.group('id')
+    return None, None
+
+def validate_emails(values):
+    """Vectorized validate_email: boolean mask, False for missing values"""
+    return _match(values, _EMAIL_PATTERN)
+
+def parse_spotify_refs(values, kinds=SPOTIFY_KINDS, allow_bare=True):
+    """Split Spotify URLs, URIs and bare IDs into kind and spotify_id columns; both are None where invalid"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    values, strings = _as_arrow_strings(values)
+    parts = pc.extract_regex(strings, _SPOTIFY_REF_PATTERN.pattern)
+    ids = pc.struct_field(parts, 'id')
+    # Optional groups that didn't take part in a match come back as ''
+    url_kind = pc.struct_field(parts, 'url_kind')
+    kind = pc.if_else(pc.equal(url_kind, ''), pc.struct_field(parts, 'uri_kind'), url_kind)
+    bare = pc.equal(kind, '')
+
+    allowed = pc.is_in(kind, value_set=pa.array(list(kinds), type=pa.string()))
+    if allow_bare:
+        allowed = pc.or_(allowed, bare)
+    valid = pc.fill_null(allowed, False)
+    return pd.DataFrame({
+        'kind': pc.if_else(pc.and_(valid, pc.invert(bare)), kind, None).to_numpy(zero_copy_only=False),
+        'spotify_id': pc.if_else(valid, ids, None).to_numpy(zero_copy_only=False)
+    }, index=values.index)
+
+def extract_spotify_ids(values, kinds=SPOTIFY_KINDS, allow_bare=True):
+    """Vectorized extract_spotify_id that also strips query strings; None where a value isn't a valid reference"""
+    return parse_spotify_refs(values, kinds, allow_bare)['spotify_id']
+
+def extract_spotify_user_ids(values):
+    """Vectorized extract_spotify_user_id; None for malformed or missing values"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    values, strings = _as_arrow_strings(values)
+    parts = pc.extract_regex(strings, _SPOTIFY_USER_PATTERN.pattern)
+    user_ids = pc.struct_field(parts, 'id')
+    hosts = pc.fill_null(pc.match_substring_regex(user_ids, _SPOTIFY_HOST_PATTERN.pattern), False)
+    user_ids = pc.if_else(hosts, pa.scalar(None, pa.string()), user_ids)
+    return pd.Series(user_ids.to_numpy(zero_copy_only=False), index=values.index)
+
+def _match(values, pattern):
+    import pyarrow.compute as pc
+    values, strings = _as_arrow_strings(values)
+    matches = pc.fill_null(pc.match_substring_regex(strings, pattern.pattern), False)
+    return pd.Series(matches.to_numpy(zero_copy_only=False), index=values.index)
+
+def _as_arrow_strings(values):
+    """(values as a Series, the same values as an Arrow string array with missing values null)"""
+    import pyarrow as pa
+    values = values if isinstance(values, pd.Series) else pd.Series(values)
+    try:
+        return values, pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing numbers and text are converted value by value
+        return values, pa.array(values.astype('string'), type=pa.string())
 
 def format_duration_ms(ms):
     """Format milliseconds duration to MM:SS format"""
     seconds = int(ms / 1000)
     minutes = seconds // 60
     remaining_seconds = seconds % 60
-    return f"{minutes}:{remaining_seconds:02d}"
\ No newline at end of file
+    return f"{minutes}:{remaining_seconds:02d}"
+
+def to_arrow(df):
+    """Convert a DataFrame to Arrow; mixed-type object columns are stored as strings"""
+    import pyarrow as pa
+    arrays = []
+    for col in df.columns:
+        try:
+            arrays.append(pa.array(df[col], from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            values = df[col].where(df[col].isna(), df[col].astype(str))
+            arrays.append(pa.array(values, type=pa.string(), from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
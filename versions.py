@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import pandas as pd
+import pyarrow.pandas_compat  # noqa: F401
+import pyarrow.parquet as pq
+from pathlib import Path
+from datetime import datetime
+from utils import to_arrow
+
+# Arrow conversion is imported up front, pandas support included: the last write-behind flush runs
+# during interpreter shutdown, where pyarrow's lazy import of it (which pulls in concurrent.futures
+# and registers an atexit hook) fails and the pending before-images would be lost
+
+VERSIONS_DIR = 'versions'
+INDEX_FILE = 'index.jsonl'
+# Commits older than this are pruned when a workspace is opened
+RETENTION_DAYS = 30
+# Marks ids that didn't exist before a commit (undoing the commit removes them)
+ABSENT_COLUMN = '_absent'
+IMAGE_CACHE_SIZE = 16
+
+class VersionStore:
+    """Append-only log of before-images: each commit stores only the rows it changed"""
+
+    def __init__(self, data_dir, retention_days=RETENTION_DAYS):
+        self.path = Path(data_dir) / VERSIONS_DIR
+        self.path.mkdir(exist_ok=True)
+        self.index_path = self.path / INDEX_FILE
+        self.retention_days = retention_days
+        # [{'commit', 'at', 'table', 'op', 'rows'}], oldest first
+        self.commits = self._load_index()
+        self._images = {}
+        # Deferred commits not yet on disk: number -> (commit, image), written by write_pending
+        self._pending = {}
+        # Guards the image cache and pending commits; _io_lock is held while files are written
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._prune()
+
+    @property
+    def head(self):
+        """Number of the latest commit, 0 before the first"""
+        return self.commits[-1]['commit'] if self.commits else 0
+
+    def record(self, table, op, key_col, keys, before, joined=False, deferred=False):
+        """Store the pre-change rows for the ids a mutation touched; joined commits undo with the one before"""
+        keys = pd.Index(keys).unique()
+        absent = keys.difference(pd.Index(before[key_col]))
+        image = pd.concat([
+            before.assign(**{ABSENT_COLUMN: False}),
+            pd.DataFrame({key_col: absent, ABSENT_COLUMN: True})
+        ], ignore_index=True)
+
+        commit = {
+            'commit': max(self.head, self._last_number) + 1,
+            'at': time.time(),
+            'table': table,
+            'op': op,
+            'rows': len(keys),
+            'joined': joined
+        }
+        if deferred:
+            # Kept in memory until write_pending, so write-behind mutations do no file I/O here
+            with self._lock:
+                self._pending[commit['commit']] = (commit, image)
+        else:
+            with self._io_lock:
+                self._write_image(commit['commit'], image)
+                self._append_index(commit)
+            self._cache(commit['commit'], image)
+        self.commits.append(commit)
+        self._last_number = commit['commit']
+        return commit
+
+    def write_pending(self):
+        """Write deferred commits' images and index lines, oldest first (called by the write-behind flush)"""
+        with self._io_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    number = next(iter(self._pending))
+                    commit, image = self._pending[number]
+                self._write_image(number, image)
+                self._append_index(commit)
+                with self._lock:
+                    del self._pending[number]
+                self._cache(number, image)
+
+    def pop(self):
+        """Remove the latest commit and return (commit, before-image)"""
+        commit = self.commits[-1]
+        # Waits for a write of pending commits in progress, so a popped commit is never written afterwards
+        with self._io_lock:
+            image = self._image(commit['commit'])
+            with self._lock:
+                unwritten = self._pending.pop(commit['commit'], None)
+                self._images.pop(commit['commit'], None)
+            if unwritten is None:
+                self._append_index({'undo': commit['commit']})
+                (self.path / f"{commit['commit']}.parquet").unlink(missing_ok=True)
+        self.commits.pop()
+        return commit, image
+
+    def commit_at(self, at):
+        """Latest commit made at or before a datetime or epoch timestamp (0 if none)"""
+        if isinstance(at, datetime):
+            at = at.timestamp()
+        number = 0
+        for commit in self.commits:
+            if commit['at'] > at:
+                break
+            number = commit['commit']
+        return number
+
+    def changes_since(self, table, key_col, commit):
+        """Each row changed in `table` after `commit`, as it was at that commit (None if unchanged)"""
+        later = [c['commit'] for c in self.commits if c['commit'] > commit and c['table'] == table]
+        if not later:
+            return None
+        # The oldest later commit holds the row as it was at `commit`
+        images = [self._image(number) for number in later]
+        # Images of added rows hold only their ids: all-NA columns are left out so they don't decide the dtypes
+        columns = images[0].columns.append([image.columns for image in images[1:]]).unique()
+        rows = pd.concat([image.dropna(axis=1, how='all') for image in images], ignore_index=True)
+        return rows.reindex(columns=columns).drop_duplicates(key_col, keep='first')
+
+    def _image(self, number):
+        with self._lock:
+            pending = self._pending.get(number)
+            image = pending[1] if pending else self._images.get(number)
+        if image is None:
+            image = pq.read_table(self.path / f'{number}.parquet').to_pandas()
+            self._cache(number, image)
+        return image
+
+    def _cache(self, number, image):
+        with self._lock:
+            self._images[number] = image
+            while len(self._images) > IMAGE_CACHE_SIZE:
+                self._images.pop(next(iter(self._images)))
+
+    def _write_image(self, number, image):
+        tmp_path = self.path / f'{number}.parquet.tmp'
+        pq.write_table(to_arrow(image), tmp_path)
+        tmp_path.replace(self.path / f'{number}.parquet')
+
+    def _append_index(self, line):
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(line) + '\n')
+
+    def _load_index(self):
+        commits = {}
+        self._last_number = 0
+        if self.index_path.exists():
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if 'undo' in entry:
+                        commits.pop(entry['undo'], None)
+                    else:
+                        commits[entry['commit']] = entry
+                        self._last_number = max(self._last_number, entry['commit'])
+        # A commit whose image never made it to disk can't be reconstructed
+        return [c for c in sorted(commits.values(), key=lambda c: c['commit'])
+                if (self.path / f"{c['commit']}.parquet").exists()]
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_days * 86400
+        expired = [c for c in self.commits if c['at'] < cutoff]
+        if not expired:
+            return
+        for commit in expired:
+            (self.path / f"{commit['commit']}.parquet").unlink(missing_ok=True)
+        self.commits = self.commits[len(expired):]
+        tmp_path = self.index_path.with_name(INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for commit in self.commits:
+                f.write(json.dumps(commit) + '\n')
+        tmp_path.replace(self.index_path)
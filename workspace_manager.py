@@ -0,0 +1,130 @@
+import json
+import os
+import re
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from data_manager import DataManager
+from metrics import safe_ratio
+
+# The workspace stored directly in the data directory, so single-artist setups keep working
+DEFAULT_WORKSPACE = 'default'
+WORKSPACES_DIR = 'workspaces'
+WORKSPACE_FILE = 'workspace.json'
+ROLLUP_FILE = 'rollup.json'
+
+class WorkspaceManager:
+    """Per-artist data partitions under one data directory, with precomputed label roll-ups"""
+
+    def __init__(self, root_dir='data'):
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(exist_ok=True)
+        (self.root_dir / WORKSPACES_DIR).mkdir(exist_ok=True)
+        # Roll-up frame cached against the roll-up files' modification times
+        self._rollups = (None, None)
+
+    def list_workspaces(self):
+        """Workspace slugs, the default workspace first"""
+        slugs = sorted(p.name for p in (self.root_dir / WORKSPACES_DIR).iterdir()
+                       if (p / WORKSPACE_FILE).exists())
+        return [DEFAULT_WORKSPACE] + slugs
+
+    def get_name(self, workspace):
+        if workspace == DEFAULT_WORKSPACE:
+            return 'Default'
+        path = self.get_data_dir(workspace) / WORKSPACE_FILE
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('name', workspace)
+
+    def get_data_dir(self, workspace):
+        if workspace == DEFAULT_WORKSPACE:
+            return self.root_dir
+        return self.root_dir / WORKSPACES_DIR / workspace
+
+    def create_workspace(self, name):
+        """Create an empty workspace for an artist and return its slug"""
+        slug = re.sub(r'[^a-z0-9]+', '-', name.strip().lower()).strip('-')
+        if not slug:
+            raise ValueError("Workspace name must contain letters or digits")
+        if slug in self.list_workspaces():
+            raise ValueError(f"Workspace '{slug}' already exists")
+
+        data_dir = self.get_data_dir(slug)
+        data_dir.mkdir()
+        with open(data_dir / WORKSPACE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'name': name.strip(), 'created_at': datetime.now().isoformat()}, f)
+        return slug
+
+    def open(self, workspace, **kwargs):
+        """Load one workspace's tables; its roll-up is refreshed whenever changed tables are saved"""
+        if workspace not in self.list_workspaces():
+            raise ValueError(f"Unknown workspace '{workspace}'")
+        data_manager = DataManager(self.get_data_dir(workspace), **kwargs)
+        if not data_manager.read_only:
+            data_manager.add_save_listener(lambda tables: self._on_save(workspace, data_manager, tables))
+        return data_manager
+
+    def write_rollup(self, workspace, data_manager):
+        """Store the workspace's summary next to its tables"""
+        with data_manager._lock:
+            rollup = self._rollup(workspace, data_manager)
+        path = self.get_data_dir(workspace) / ROLLUP_FILE
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(rollup, f)
+        os.replace(tmp_path, path)
+
+    def load_rollups(self, read_only=False):
+        """One summary row per workspace, read from the precomputed roll-up files"""
+        workspaces = self.list_workspaces()
+        paths = [self.get_data_dir(w) / ROLLUP_FILE for w in workspaces]
+
+        # Workspaces never changed since roll-ups were introduced get one from their tables;
+        # read-only callers compute it in memory instead of writing it
+        if not read_only:
+            for workspace, path in zip(workspaces, paths):
+                if not path.exists():
+                    self.write_rollup(workspace, DataManager(self.get_data_dir(workspace), read_only=True))
+
+        stamp = tuple((str(p), p.stat().st_mtime_ns if p.exists() else None) for p in paths)
+        if self._rollups[0] != stamp:
+            rows = []
+            for workspace, path in zip(workspaces, paths):
+                if path.exists():
+                    with open(path, encoding='utf-8') as f:
+                        rows.append(json.load(f))
+                else:
+                    rows.append(self._rollup(workspace, DataManager(self.get_data_dir(workspace), read_only=True)))
+            self._rollups = (stamp, pd.DataFrame(rows))
+        return self._rollups[1]
+
+    def _rollup(self, workspace, data_manager):
+        return {'workspace': workspace, 'name': self.get_name(workspace), **summarize(data_manager)}
+
+    def _on_save(self, workspace, data_manager, tables):
+        # One summary per save or write-behind flush, not per mutation; stats history rows don't change any totals
+        if tables - {'history'}:
+            self.write_rollup(workspace, data_manager)
+
+
+def summarize(data_manager):
+    """Totals for one workspace, as stored in its roll-up"""
+    tracks = data_manager.tracks_df
+    members = data_manager.members_df
+    curators = data_manager.curators_df
+
+    streams = pd.to_numeric(tracks['streams'], errors='coerce').sum()
+    saves = pd.to_numeric(tracks['saves'], errors='coerce').sum()
+    compliance = pd.to_numeric(members['compliance_score'], errors='coerce')
+    return {
+        'tracks': int(len(tracks)),
+        'streams': float(streams),
+        'saves': float(saves),
+        'playlist_adds': float(pd.to_numeric(tracks['playlist_adds'], errors='coerce').sum()),
+        'save_rate': safe_ratio(saves, streams, 100),
+        'members': int(len(members)),
+        'avg_compliance': float(compliance.mean()) if compliance.notna().any() else 0.0,
+        'curators': int(len(curators)),
+        'accepted_curators': int((curators['submission_status'] == 'Accepted').sum()),
+        'updated_at': datetime.now().isoformat()
+    }
@@ -0,0 +1,171 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import pandas as pd
+
+JOURNAL_FILE = 'journal.jsonl'
+ROTATED_JOURNAL_FILE = 'journal.jsonl.1'
+# Held exclusively by the data directory's one writer, so nobody else replays its live journal
+LOCK_FILE = 'journal.lock'
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindWriter:
+    """Journal mutations immediately and write table files in background group commits"""
+
+    def __init__(self, data_manager, flush_interval=2.0, max_pending=100):
+        self.data_manager = data_manager
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.journal_path = data_manager.data_dir / JOURNAL_FILE
+        self.rotated_path = data_manager.data_dir / ROTATED_JOURNAL_FILE
+
+        self._pending = 0
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+
+        self._lock_file = _acquire_lock(data_manager.data_dir / LOCK_FILE)
+        self._recover()
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+        self._thread = threading.Thread(target=self._run, name='streamr-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, entry):
+        """Journal a mutation; called with the data manager's lock held"""
+        # Handing the line to the OS is enough to survive an app crash; fsync happens per group
+        if isinstance(entry['rows'], pd.DataFrame):
+            entry = {**entry, 'rows': entry['rows'].to_dict('records')}
+        self._journal.write(json.dumps(entry, default=_json_default) + '\n')
+        self._journal.flush()
+        self._pending += 1
+        if self._pending >= self.max_pending:
+            self._wake.set()
+
+    def request_flush(self):
+        """Ask the background thread to flush without waiting for it"""
+        self._wake.set()
+
+    def flush(self):
+        """Group-commit everything journaled so far into the table files"""
+        with self._flush_lock:
+            with self.data_manager._lock:
+                if self._pending == 0:
+                    return
+                tables = self.data_manager.snapshot_tables()
+                self._rotate_journal()
+                self._pending = 0
+
+            # The slow part runs without blocking new mutations
+            try:
+                self.data_manager.write_tables(tables)
+            except Exception:
+                self.data_manager.mark_dirty(tables)
+                raise
+            _fsync_dir(self.data_manager.data_dir)
+            self.rotated_path.unlink(missing_ok=True)
+            # Before-images of the flushed mutations, for undo and as_of reads
+            self.data_manager.versions.write_pending()
+
+    def close(self):
+        """Stop the background thread after a final flush"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self._journal.close()
+        self._lock_file.close()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Entries stay in the journal and are retried on the next flush or replayed on restart
+                logger.exception("Write-behind flush failed")
+
+    def _rotate_journal(self):
+        """Make the journal durable and move it aside; new mutations go to a fresh file"""
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal.close()
+
+        if self.rotated_path.exists():
+            # A previous flush failed before its tables were written; keep those entries too
+            with open(self.rotated_path, 'a', encoding='utf-8') as rotated, \
+                    open(self.journal_path, encoding='utf-8') as journal:
+                rotated.write(journal.read())
+                rotated.flush()
+                os.fsync(rotated.fileno())
+            self.journal_path.unlink()
+        else:
+            os.replace(self.journal_path, self.rotated_path)
+
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _recover(self):
+        """Replay journal entries left behind by a crash and write them into the table files"""
+        replayed = 0
+        for path in (self.rotated_path, self.journal_path):
+            if not path.exists():
+                continue
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from a crash mid-write
+                        continue
+                    self.data_manager.replay(entry)
+                    replayed += 1
+
+        if replayed:
+            self.data_manager.write_tables(self.data_manager.snapshot_tables())
+            _fsync_dir(self.data_manager.data_dir)
+        self.rotated_path.unlink(missing_ok=True)
+        self.journal_path.unlink(missing_ok=True)
+
+
+def _json_default(value):
+    """Serialize datetimes and NumPy scalars found in mutation payloads"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _acquire_lock(path):
+    """Open and exclusively lock a lock file; raises RuntimeError while another writer holds it"""
+    f = open(path, 'a+')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        raise RuntimeError(f"{path.parent} already has a write-behind writer (another process or DataManager)")
+    return f
+
+
+def _fsync_dir(path):
+    """Persist renames in a directory (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)